@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Adaptive Backpressure Controller for Sensor Clients
+
+검증 서버의 응답 지연과 오류율을 보고 클라이언트의 전송 방식을 단계적으로
+조절합니다. 고정 interval로 계속 보내면 느려진 서버 앞에 10초 timeout이
+쌓이기 때문입니다.
+
+압력 단계(level) k에서의 설정 (운영자가 정한 상한 안에서):
+    동시 요청 수  = max(min_in_flight, max_in_flight / 2^k)
+    batch 크기    = min(max_batch, 2^k)           (batch endpoint로 묶어 전송)
+    샘플링 간격   = interval x min(max_slowdown, 2^(k - k_sat))
+                    k_sat: 동시 요청 수와 batch 크기가 모두 한계에 도달하는 단계
+즉 먼저 동시 요청을 줄이고 묶어서 보내며, 그래도 부족할 때만 측정값을 덜 보냅니다.
+
+판단 (window_s마다):
+- 혼잡: window 안 응답 지연 p90 > latency_target_ms, 또는 오류율(연결 실패,
+  timeout, 5xx) > error_threshold, 또는 응답이 하나도 없는데 요청이 목표 지연
+  이상 대기 중 -> level + 1
+- 정상: recovery_windows번 연속이면 level - 1 (hysteresis)
+
+결정과 상태는 metrics.py Registry(gauge/counter/histogram)로 노출되며,
+render()로 Prometheus text format을 얻을 수 있습니다.
+"""
+
+import os
+import math
+import time
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from log_pipeline import get_logger, log_event
+from metrics import MetricsRegistry
+
+logger = get_logger("adaptive")
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class AdaptiveController:
+    """지연/오류율 기반 동시 요청 수, batch 크기, 샘플링 간격 제어"""
+
+    def __init__(self, latency_target_ms: float = 500.0, error_threshold: float = 0.1,
+                 window_s: float = 5.0, recovery_windows: int = 3,
+                 min_in_flight: int = 1, max_in_flight: int = 4,
+                 max_batch: int = 16, max_slowdown: float = 4.0):
+        """
+        Args:
+            latency_target_ms: 응답 지연 p90 목표
+            error_threshold: 혼잡으로 판단하는 오류율
+            window_s: 판단 주기 (초)
+            recovery_windows: 단계를 낮추기 전 연속 정상 window 수
+            min_in_flight / max_in_flight: 동시 요청 수 범위
+            max_batch: 최대 batch 크기 (1이면 묶지 않음)
+            max_slowdown: 샘플링 간격 최대 배수 (1이면 샘플링 유지)
+        """
+        self.latency_target_ms = latency_target_ms
+        self.error_threshold = error_threshold
+        self.window_s = window_s
+        self.recovery_windows = max(1, recovery_windows)
+        self.min_in_flight = max(1, min_in_flight)
+        self.max_in_flight = max(self.min_in_flight, max_in_flight)
+        self.max_batch = max(1, max_batch)
+        self.max_slowdown = max(1.0, max_slowdown)
+
+        steps_in_flight = math.ceil(math.log2(self.max_in_flight / self.min_in_flight))
+        steps_batch = math.ceil(math.log2(self.max_batch))
+        self._k_sat = max(steps_in_flight, steps_batch)
+        self.max_level = self._k_sat + math.ceil(math.log2(self.max_slowdown))
+
+        self.level = 0
+        self._healthy_windows = 0
+        self._window_start = time.monotonic()
+        self._latencies: List[float] = []
+        self._errors = 0
+        self.last_p90_ms = 0.0
+        self.last_error_rate = 0.0
+
+        self._cond = threading.Condition()
+        self._in_flight: Dict[int, float] = {}
+        self._next_token = 0
+
+        # 메트릭
+        self.registry = MetricsRegistry()
+        self._decisions = self.registry.counter("client_adaptive_decisions_total",
+                                                "controller level changes by direction", ["direction"])
+        self._responses = self.registry.counter("client_adaptive_responses_total",
+                                                "verifier responses seen by the controller", ["result"])
+        self._latency = self.registry.histogram("client_adaptive_latency_seconds",
+                                                "verifier request latency", buckets=LATENCY_BUCKETS)
+        self.shed = self.registry.counter("client_adaptive_shed_total",
+                                          "readings not sent because the send queue was full")
+        self.registry.gauge("client_adaptive_level", "current pressure level", lambda: self.level)
+        self.registry.gauge("client_adaptive_in_flight_limit", "max concurrent requests", lambda: self.in_flight_limit)
+        self.registry.gauge("client_adaptive_in_flight", "requests currently in flight", lambda: len(self._in_flight))
+        self.registry.gauge("client_adaptive_batch_size", "readings per request", lambda: self.batch_size)
+        self.registry.gauge("client_adaptive_interval_factor", "sampling interval multiplier",
+                            lambda: self.interval_factor)
+        self.registry.gauge("client_adaptive_latency_p90_ms", "p90 latency of the last window",
+                            lambda: self.last_p90_ms)
+        self.registry.gauge("client_adaptive_error_rate", "error rate of the last window",
+                            lambda: self.last_error_rate)
+
+    # ------------------------------------------------------------------
+    # 현재 설정
+    # ------------------------------------------------------------------
+
+    @property
+    def in_flight_limit(self) -> int:
+        return max(self.min_in_flight, self.max_in_flight >> self.level)
+
+    @property
+    def batch_size(self) -> int:
+        return min(self.max_batch, 1 << self.level)
+
+    @property
+    def interval_factor(self) -> float:
+        return min(self.max_slowdown, float(2 ** max(0, self.level - self._k_sat)))
+
+    # ------------------------------------------------------------------
+    # 동시 요청 slot
+    # ------------------------------------------------------------------
+
+    def acquire(self) -> int:
+        """동시 요청 slot 획득 (한도에 도달하면 대기) -> release()에 넘길 token"""
+        with self._cond:
+            while len(self._in_flight) >= self.in_flight_limit:
+                self._cond.wait(self.window_s)
+                self._maybe_decide()
+            self._next_token += 1
+            self._in_flight[self._next_token] = time.monotonic()
+            return self._next_token
+
+    def release(self, token: int):
+        with self._cond:
+            self._in_flight.pop(token, None)
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # 관측 / 판단
+    # ------------------------------------------------------------------
+
+    def observe(self, latency_ms: float, ok: bool):
+        """
+        HTTP 요청 하나의 결과 기록
+
+        Args:
+            latency_ms: 요청 지연
+            ok: False면 연결 실패 / timeout / 5xx (검증 실패 응답은 True)
+        """
+        self._latency.observe(latency_ms / 1000.0)
+        self._responses.labels(result="ok" if ok else "error").inc()
+        with self._cond:
+            self._latencies.append(latency_ms)
+            if not ok:
+                self._errors += 1
+            self._maybe_decide()
+
+    def tick(self):
+        """응답이 없어도 window가 끝났으면 판단 (전송 루프에서 주기적으로 호출)"""
+        with self._cond:
+            self._maybe_decide()
+
+    def _maybe_decide(self):
+        """lock 보유 상태에서 호출"""
+        now = time.monotonic()
+        if now - self._window_start < self.window_s:
+            return
+        latencies = sorted(self._latencies)
+        errors = self._errors
+        self._latencies = []
+        self._errors = 0
+        self._window_start = now
+
+        if latencies:
+            p90 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.9))]
+            error_rate = errors / len(latencies)
+            congested = p90 > self.latency_target_ms or error_rate > self.error_threshold
+        elif self._in_flight:
+            # 응답 없이 요청만 대기 중: 가장 오래된 요청이 목표 지연을 넘었으면 혼잡
+            p90 = (now - min(self._in_flight.values())) * 1000
+            error_rate = 0.0
+            congested = p90 > self.latency_target_ms
+        else:
+            return  # 판단할 정보 없음
+        self.last_p90_ms = p90
+        self.last_error_rate = error_rate
+
+        previous = self.level
+        if congested:
+            self._healthy_windows = 0
+            self.level = min(self.max_level, self.level + 1)
+        else:
+            self._healthy_windows += 1
+            if self._healthy_windows >= self.recovery_windows and self.level > 0:
+                self._healthy_windows = 0
+                self.level -= 1
+
+        if self.level != previous:
+            direction = "up" if self.level > previous else "down"
+            self._decisions.labels(direction=direction).inc()
+            log_event(logger, logging.WARNING if direction == "up" else logging.INFO, "adaptive-level",
+                      pressure=self.level, direction=direction, p90_ms=round(p90, 1),
+                      error_rate=round(error_rate, 3), in_flight_limit=self.in_flight_limit,
+                      batch_size=self.batch_size, interval_factor=self.interval_factor)
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # 노출
+    # ------------------------------------------------------------------
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        return self.registry.render()
+
+    def write_metrics(self, path: str):
+        """node_exporter textfile collector용으로 메트릭 파일을 원자적으로 갱신"""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    def get_stats(self) -> Dict:
+        return {
+            "level": self.level,
+            "max_level": self.max_level,
+            "in_flight_limit": self.in_flight_limit,
+            "batch_size": self.batch_size,
+            "interval_factor": self.interval_factor,
+            "last_p90_ms": round(self.last_p90_ms, 1),
+            "last_error_rate": round(self.last_error_rate, 3),
+            "escalations": int(self._decisions.labels(direction="up").value()),
+            "recoveries": int(self._decisions.labels(direction="down").value()),
+            "shed": int(self.shed.value())
+        }
+
+
+def add_adaptive_arguments(parser):
+    """argparse에 adaptive 전송 옵션 추가"""
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Adapt concurrency, batching and sampling rate to verifier latency and errors")
+    parser.add_argument("--adaptive-latency-ms", type=float, default=500.0,
+                        help="Target p90 verifier latency (default: 500)")
+    parser.add_argument("--adaptive-error-rate", type=float, default=0.1,
+                        help="Error rate (connection, timeout, 5xx) treated as congestion (default: 0.1)")
+    parser.add_argument("--adaptive-window-s", type=float, default=5.0,
+                        help="Seconds between controller decisions (default: 5)")
+    parser.add_argument("--adaptive-max-in-flight", type=int, default=4,
+                        help="Upper bound on concurrent requests (default: 4)")
+    parser.add_argument("--adaptive-max-batch", type=int, default=16,
+                        help="Upper bound on readings per batch request; 1 never batches (default: 16)")
+    parser.add_argument("--adaptive-max-slowdown", type=float, default=4.0,
+                        help="Upper bound on the sampling interval multiplier; 1 never skips readings (default: 4)")
+    parser.add_argument("--adaptive-metrics-file", default=None,
+                        help="Write controller metrics (Prometheus text format) to this file each window")
+
+
+def controller_from_args(args) -> Optional[AdaptiveController]:
+    """add_adaptive_arguments() 옵션으로 controller 생성 (--adaptive가 없으면 None)"""
+    if not args.adaptive:
+        return None
+    return AdaptiveController(latency_target_ms=args.adaptive_latency_ms, error_threshold=args.adaptive_error_rate,
+                              window_s=args.adaptive_window_s, max_in_flight=args.adaptive_max_in_flight,
+                              max_batch=args.adaptive_max_batch, max_slowdown=args.adaptive_max_slowdown)
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Asyncio WSGI Server (stdlib only)
+
+Flask 개발 서버(app.run, 연결당 OS 스레드 1개)를 대신하는 서빙 모드입니다.
+같은 WSGI 앱(create_app()의 라우트와 RAWValueBuffer)을 그대로 실행합니다.
+
+특징:
+- asyncio 이벤트 루프 하나가 모든 연결의 소켓 I/O를 처리
+- HTTP/1.1 keep-alive (idle timeout 적용), HTTP/1.0은 'Connection: keep-alive' 요청 시
+- Request pipelining: 한 연결에서 여러 요청을 먼저 읽어 워커에 넘기고
+  응답은 요청 순서대로 기록 (pipeline_depth로 제한)
+- 앱 호출은 고정 크기 ThreadPoolExecutor에서 실행 (bounded worker count)
+- 동시 연결 수 상한 초과 시 503 응답
+
+RAWValueBuffer가 프로세스 메모리에 있으므로 prefork(다중 프로세스) 대신
+단일 프로세스 + 이벤트 루프 구조를 사용합니다.
+"""
+
+import io
+import sys
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from http import HTTPStatus
+from typing import List, Optional, Tuple
+from urllib.parse import unquote
+
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+# (status_line, headers, body)
+WSGIResponse = Tuple[str, List[Tuple[str, str]], bytes]
+
+
+class AsyncWSGIServer:
+    """asyncio 기반 HTTP/1.1 WSGI 서버"""
+
+    def __init__(self, app, host: str = "127.0.0.1", port: int = 9000,
+                 workers: int = 8, max_connections: int = 1024,
+                 keepalive_timeout: float = 15.0, pipeline_depth: int = 16):
+        """
+        Args:
+            app: WSGI 애플리케이션 (예: create_app(buffer))
+            host: 바인드 주소
+            port: 바인드 포트
+            workers: 앱 호출 워커 스레드 수
+            max_connections: 동시 연결 상한
+            keepalive_timeout: 다음 요청을 기다리는 idle 시간 (초)
+            pipeline_depth: 한 연결에서 응답 대기 중일 수 있는 최대 요청 수
+        """
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.pipeline_depth = pipeline_depth
+
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wsgi-worker")
+        self.active_connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # ------------------------------------------------------------------
+    # WSGI 호출 (워커 스레드)
+    # ------------------------------------------------------------------
+
+    def _call_app(self, environ: dict) -> WSGIResponse:
+        """워커 스레드에서 WSGI 앱 실행"""
+        state = {}
+
+        def start_response(status, headers, exc_info=None):
+            state["status"] = status
+            state["headers"] = headers
+            return lambda data: state.setdefault("written", []).append(data)
+
+        result = self.app(environ, start_response)
+        try:
+            body = b''.join(state.get("written", [])) + b''.join(result)
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+        return state["status"], state["headers"], body
+
+    @staticmethod
+    def _error_response(status: HTTPStatus) -> WSGIResponse:
+        body = f'{{"error": "{status.phrase}"}}'.encode()
+        return f"{status.value} {status.phrase}", [("Content-Type", "application/json")], body
+
+    # ------------------------------------------------------------------
+    # HTTP 파싱
+    # ------------------------------------------------------------------
+
+    def _build_environ(self, method: str, target: str, version: str,
+                       headers: List[Tuple[str, str]], body: bytes, peer) -> dict:
+        path, _, query = target.partition('?')
+        environ = {
+            "REQUEST_METHOD": method,
+            "SCRIPT_NAME": "",
+            "PATH_INFO": unquote(path, encoding="latin-1"),
+            "QUERY_STRING": query,
+            "SERVER_NAME": self.host,
+            "SERVER_PORT": str(self.port),
+            "SERVER_PROTOCOL": version,
+            "REMOTE_ADDR": peer[0] if peer else "",
+            "CONTENT_LENGTH": str(len(body)) if body else "",
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in headers:
+            key = name.upper().replace('-', '_')
+            if key == "CONTENT_TYPE":
+                environ["CONTENT_TYPE"] = value
+            elif key != "CONTENT_LENGTH":
+                http_key = "HTTP_" + key
+                environ[http_key] = f"{environ[http_key]},{value}" if http_key in environ else value
+        return environ
+
+    async def _read_request(self, reader: asyncio.StreamReader, peer):
+        """
+        요청 하나 읽기
+
+        Returns:
+            None (EOF/idle timeout), (environ, keep_alive) 또는 (HTTPStatus, False) 파싱 오류
+        """
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=self.keepalive_timeout)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+        except asyncio.LimitOverrunError:
+            return HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, False
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, False
+
+        headers = []
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, sep, value = line.partition(":")
+            if not sep:
+                return HTTPStatus.BAD_REQUEST, False
+            headers.append((name.strip(), value.strip()))
+        header_map = {name.lower(): value for name, value in headers}
+
+        if "chunked" in header_map.get("transfer-encoding", "").lower():
+            return HTTPStatus.LENGTH_REQUIRED, False
+
+        try:
+            content_length = int(header_map.get("content-length", "0") or 0)
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, False
+        if content_length > MAX_BODY_BYTES:
+            return HTTPStatus.REQUEST_ENTITY_TOO_LARGE, False
+
+        try:
+            body = await reader.readexactly(content_length) if content_length else b""
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return None
+
+        connection = header_map.get("connection", "").lower()
+        if version == "HTTP/1.1":
+            keep_alive = connection != "close"
+        else:
+            keep_alive = connection == "keep-alive"
+
+        return self._build_environ(method, target, version, headers, body, peer), keep_alive
+
+    # ------------------------------------------------------------------
+    # 연결 처리
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _encode_response(response: WSGIResponse, keep_alive: bool) -> bytes:
+        status, headers, body = response
+        lines = [f"HTTP/1.1 {status}"]
+        has_length = False
+        for name, value in headers:
+            if name.lower() == "content-length":
+                has_length = True
+            elif name.lower() == "connection":
+                continue
+            lines.append(f"{name}: {value}")
+        if not has_length:
+            lines.append(f"Content-Length: {len(body)}")
+        lines.append(f"Date: {formatdate(usegmt=True)}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+    async def _write_responses(self, queue: asyncio.Queue, writer: asyncio.StreamWriter):
+        """요청 순서대로 응답 기록 (pipelining)"""
+        broken = False
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            pending, keep_alive = item
+            try:
+                response = await pending
+            except Exception:
+                response = self._error_response(HTTPStatus.INTERNAL_SERVER_ERROR)
+                keep_alive = False
+            if broken:
+                # 클라이언트 연결이 끊긴 뒤에도 reader가 막히지 않도록 대기열은 계속 소비
+                continue
+            try:
+                writer.write(self._encode_response(response, keep_alive))
+                await writer.drain()
+            except ConnectionError:
+                broken = True
+                continue
+            if not keep_alive:
+                return
+
+    @staticmethod
+    async def _unless_writer_done(coro, writer_task: asyncio.Task):
+        """
+        coro 실행, 단 writer가 먼저 끝나면 (500, Connection: close, 연결 끊김) 취소
+
+        writer가 끝난 뒤에는 대기열을 소비하는 쪽이 없으므로 queue.put()과
+        다음 요청 읽기가 영원히 막히지 않게 합니다.
+
+        Returns:
+            (완료 여부, coro 결과)
+        """
+        task = asyncio.ensure_future(coro)
+        await asyncio.wait((task, writer_task), return_when=asyncio.FIRST_COMPLETED)
+        if task.done():
+            return True, task.result()
+        task.cancel()
+        return False, None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info("peername")
+
+        if self.active_connections >= self.max_connections:
+            try:
+                writer.write(self._encode_response(self._error_response(HTTPStatus.SERVICE_UNAVAILABLE), False))
+                await writer.drain()
+            except ConnectionError:
+                pass
+            finally:
+                writer.close()
+            return
+
+        self.active_connections += 1
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_depth)
+        writer_task = asyncio.create_task(self._write_responses(queue, writer))
+
+        try:
+            while not writer_task.done():
+                read, parsed = await self._unless_writer_done(self._read_request(reader, peer), writer_task)
+                if not read or parsed is None:
+                    break
+                environ, keep_alive = parsed
+                if isinstance(environ, HTTPStatus):
+                    done = loop.create_future()
+                    done.set_result(self._error_response(environ))
+                    await self._unless_writer_done(queue.put((done, False)), writer_task)
+                    break
+                pending = loop.run_in_executor(self.executor, self._call_app, environ)
+                queued, _ = await self._unless_writer_done(queue.put((pending, keep_alive)), writer_task)
+                if not queued or not keep_alive:
+                    break
+        finally:
+            if not writer_task.done():
+                await self._unless_writer_done(queue.put(None), writer_task)
+            await writer_task
+            self.active_connections -= 1
+            writer.close()
+
+    # ------------------------------------------------------------------
+    # 서버 수명 주기
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """리스닝 소켓 열기"""
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port,
+            limit=MAX_HEADER_BYTES, backlog=1024, reuse_address=True
+        )
+
+    async def serve_forever(self):
+        """서버 실행 (종료될 때까지 대기)"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def run(self):
+        """블로킹 실행 진입점"""
+        try:
+            asyncio.run(self.serve_forever())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.executor.shutdown(wait=False)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Client Cold Start Benchmark (process start -> first proof)
+
+새 인터프리터 프로세스를 반복 실행해 다음을 측정합니다 (wall time 중앙값):
+1) 클라이언트 모듈 import: 지연 import(현재) vs pandas/numpy/petlib prover를
+   시작 시 모두 import하던 이전 방식
+2) 첫 증명까지: 모듈 import + SelectiveDisclosureClient 생성 + 첫 ZK 요청 생성
+3) 프로세스 내 증명당 비용: 증명마다 prover(generator)를 새로 만드는 방식 vs
+   get_prover()로 재사용하는 방식
+
+Usage:
+    python3 benchmarks/bench_cold_start.py
+    python3 benchmarks/bench_cold_start.py --runs 10 --proofs 20
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# 이전 방식: 클라이언트 import 시점에 무거운 의존성을 모두 로드
+EAGER_IMPORTS = "import numpy, pandas, crypto.bulletproof_prover_production\n"
+
+IMPORT_ONLY = "import sensor_client_selective_disclosure\n"
+
+FIRST_PROOF = """
+import sensor_client_selective_disclosure as sd
+client = sd.SelectiveDisclosureClient("http://127.0.0.1:9", "P1")
+request = client._build_zk_request(4.2, 1700000000, "BENCH0000000000000000000")
+assert request is not None
+"""
+
+
+def _run(code: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def bench_process(label: str, code: str, runs: int) -> float:
+    _run(code)  # page cache / .pyc 준비
+    median = statistics.median(_run(code) for _ in range(runs))
+    print(f"  {label:<44} {median * 1000:>9.1f}")
+    return median
+
+
+def bench_per_proof(proofs: int):
+    from crypto.bulletproof_prover_production import BulletproofProverProduction, get_prover
+
+    print(f"\n[PER PROOF] mean of {proofs} proofs in one process")
+    print(f"  {'method':<44} {'ms':>9}")
+
+    start = time.perf_counter()
+    for i in range(proofs):
+        BulletproofProverProduction().generate_range_proof(i)
+    rebuild = (time.perf_counter() - start) / proofs
+    print(f"  {'new prover per proof (generators rebuilt)':<44} {rebuild * 1000:>9.1f}")
+
+    get_prover().generate_range_proof(0)
+    start = time.perf_counter()
+    for i in range(proofs):
+        get_prover().generate_range_proof(i)
+    cached = (time.perf_counter() - start) / proofs
+    print(f"  {'get_prover() (generators reused)':<44} {cached * 1000:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Client cold start benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Process launches per measurement (default: 5)")
+    parser.add_argument("--proofs", type=int, default=10, help="Proofs for the per-proof comparison (default: 10)")
+    args = parser.parse_args()
+
+    print(f"[COLD START] median wall time of {args.runs} fresh processes")
+    print(f"  {'step':<44} {'ms':>9}")
+    interpreter = bench_process("interpreter only (python -c pass)", "pass", args.runs)
+    lazy_import = bench_process("import client (lazy)", IMPORT_ONLY, args.runs)
+    eager_import = bench_process("import client (eager numpy/pandas/petlib)", EAGER_IMPORTS + IMPORT_ONLY, args.runs)
+    lazy_proof = bench_process("first proof (lazy)", FIRST_PROOF, args.runs)
+    eager_proof = bench_process("first proof (eager imports)", EAGER_IMPORTS + FIRST_PROOF, args.runs)
+
+    print(f"\n  import overhead above interpreter: lazy {(lazy_import - interpreter) * 1000:.0f} ms, "
+          f"eager {(eager_import - interpreter) * 1000:.0f} ms")
+    print(f"  cold start to first proof saved: {(eager_proof - lazy_proof) * 1000:.0f} ms")
+
+    bench_per_proof(args.proofs)
+
+    print("\n" + json.dumps({
+        "interpreter_ms": round(interpreter * 1000, 1),
+        "import_lazy_ms": round(lazy_import * 1000, 1),
+        "import_eager_ms": round(eager_import * 1000, 1),
+        "first_proof_lazy_ms": round(lazy_proof * 1000, 1),
+        "first_proof_eager_ms": round(eager_proof * 1000, 1)
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HAI CSV Data Source Benchmark (startup + high-rate replay)
+
+1) 시작 비용: 전체 pd.read_csv vs 컬럼 스트리밍 vs .npy 캐시 생성(cold) / mmap(warm)
+2) 재생 처리량: 기존 측정값별 .iloc 접근과 data_source의 next_value() /
+   next_values(k)를 readings/sec로 비교
+
+--csv를 주지 않으면 HAI와 비슷한 모양(80개 컬럼)의 합성 CSV를 임시로 생성합니다.
+
+Usage:
+    python3 benchmarks/bench_data_source.py
+    python3 benchmarks/bench_data_source.py --csv ./HAI/HAI1.csv --sensor P1_PIT01 --readings 1000000
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from data_source import (ColumnCache, StreamingCSVSource, ArraySource,  # noqa: E402
+                         load_column_array)
+
+
+def _write_synthetic_csv(path: str, rows: int, columns: int):
+    names = ["timestamp"] + [f"P1_PIT{i:02d}" for i in range(columns)]
+    with open(path, "w") as f:
+        f.write(",".join(names) + "\n")
+        for r in range(rows):
+            f.write(f"2022-08-01 00:{r // 60 % 60:02d}:{r % 60:02d},"
+                    + ",".join(f"{random.random() * 10:.5f}" for _ in range(columns)) + "\n")
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def bench_startup(csv_path: str, sensor: str, cache_dir: str):
+    print("\n[STARTUP] time to first reading")
+    print(f"{'method':<28} {'seconds':>9}")
+
+    elapsed, _ = _timed(lambda: float(pd.read_csv(csv_path)[sensor].iloc[0]))
+    print(f"{'pd.read_csv (all columns)':<28} {elapsed:>9.3f}")
+
+    elapsed, _ = _timed(lambda: StreamingCSVSource(csv_path, sensor).next_value())
+    print(f"{'streaming (usecols)':<28} {elapsed:>9.3f}")
+
+    elapsed, _ = _timed(lambda: load_column_array(csv_path, sensor)[0])
+    print(f"{'preload column array':<28} {elapsed:>9.3f}")
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    elapsed, _ = _timed(lambda: ArraySource(ColumnCache(cache_dir).load(csv_path, sensor), sensor).next_value())
+    print(f"{'npy cache build (cold)':<28} {elapsed:>9.3f}")
+
+    elapsed, _ = _timed(lambda: ArraySource(ColumnCache(cache_dir).load(csv_path, sensor), sensor).next_value())
+    print(f"{'npy cache mmap (warm)':<28} {elapsed:>9.3f}")
+
+
+def _rate(label: str, readings: int, fn):
+    elapsed, _ = _timed(fn)
+    print(f"{label:<28} {readings / elapsed:>14,.0f} {elapsed * 1e9 / readings:>9.1f}")
+
+
+def bench_replay(csv_path: str, sensor: str, cache_dir: str, readings: int, batch_sizes):
+    print(f"\n[REPLAY] {readings:,} readings (loops at EOF)")
+    print(f"{'method':<28} {'readings/sec':>14} {'ns/read':>9}")
+
+    frame = pd.read_csv(csv_path)
+
+    def legacy_iloc():
+        index = 0
+        for _ in range(readings):
+            if index >= len(frame):
+                index = 0
+            float(frame[sensor].iloc[index])
+            index += 1
+
+    _rate("legacy .iloc per reading", readings, legacy_iloc)
+
+    def per_value(source):
+        def run():
+            next_value = source.next_value
+            for _ in range(readings):
+                next_value()
+        return run
+
+    _rate("streaming next_value()", readings, per_value(StreamingCSVSource(csv_path, sensor)))
+    mmap_values = ColumnCache(cache_dir).load(csv_path, sensor)
+    _rate("mmap next_value()", readings, per_value(ArraySource(mmap_values, sensor)))
+
+    for k in batch_sizes:
+        def batched(source, k=k):
+            def run():
+                for _ in range(readings // k):
+                    source.next_values(k)
+            return run
+        _rate(f"mmap next_values({k})", readings // k * k, batched(ArraySource(mmap_values, sensor)))
+        _rate(f"streaming next_values({k})", readings // k * k, batched(StreamingCSVSource(csv_path, sensor)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HAI CSV data source benchmark")
+    parser.add_argument("--csv", default=None, help="HAI CSV file (default: synthetic)")
+    parser.add_argument("--sensor", default="P1_PIT01", help="Sensor column (default: P1_PIT01)")
+    parser.add_argument("--rows", type=int, default=200000, help="Synthetic CSV rows (default: 200000)")
+    parser.add_argument("--columns", type=int, default=80, help="Synthetic CSV sensor columns (default: 80)")
+    parser.add_argument("--readings", type=int, default=500000, help="Readings per replay run (default: 500000)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 256, 4096],
+                        help="next_values(k) batch sizes (default: 16 256 4096)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_data_source_")
+    try:
+        csv_path = args.csv
+        if csv_path is None:
+            csv_path = os.path.join(workdir, "hai_synthetic.csv")
+            print(f"[SETUP] writing synthetic CSV: {args.rows} rows x {args.columns + 1} columns")
+            _write_synthetic_csv(csv_path, args.rows, args.columns)
+        print(f"[SETUP] {csv_path} ({os.path.getsize(csv_path) / 1e6:.1f} MB), sensor={args.sensor}")
+
+        cache_dir = os.path.join(workdir, "cache")
+        bench_startup(csv_path, args.sensor, cache_dir)
+        bench_replay(csv_path, args.sensor, cache_dir, args.readings, args.batch_sizes)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
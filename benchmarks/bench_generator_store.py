@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generator Store Startup Benchmark
+
+1) 프로세스 내: generator(H, G_vec, H_vec) 직접 계산 vs 파일 생성(cold, 계산 + 기록)
+   vs 파일 로드(warm, mmap + checksum + 포인트 파싱)
+2) 새 프로세스: prover 생성 + 첫 증명까지의 wall time을 ICS_GENERATOR_STORE=off와
+   미리 만들어 둔 store로 비교 (중앙값)
+
+Usage:
+    python3 benchmarks/bench_generator_store.py
+    python3 benchmarks/bench_generator_store.py --bits 16 32 --runs 10
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from crypto.bulletproof_prover_production import BulletproofProverProduction  # noqa: E402
+from crypto.generator_store import STORE_ENV  # noqa: E402
+
+FIRST_PROOF = """
+import sys
+from crypto.bulletproof_prover_production import BulletproofProverProduction
+bits = int(sys.argv[1])
+BulletproofProverProduction(bit_length=bits).generate_range_proof(min(4200, (1 << bits) - 1))
+"""
+
+
+def _median_ms(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def _touch(prover: BulletproofProverProduction):
+    return prover.h, prover.g_vec, prover.h_vec
+
+
+def bench_in_process(bits: int, store_dir: str, runs: int):
+    def compute():
+        _touch(BulletproofProverProduction(bit_length=bits, use_store=False))
+
+    def cold():
+        shutil.rmtree(store_dir, ignore_errors=True)
+        _touch(BulletproofProverProduction(bit_length=bits, store_dir=store_dir))
+
+    def warm():
+        _touch(BulletproofProverProduction(bit_length=bits, store_dir=store_dir))
+
+    print(f"\n[IN PROCESS] n={bits}, median of {runs}")
+    print(f"  {'method':<36} {'ms':>9}")
+    print(f"  {'compute (hash + scalar mult)':<36} {_median_ms(compute, runs):>9.2f}")
+    print(f"  {'store cold (compute + write)':<36} {_median_ms(cold, runs):>9.2f}")
+    cold()
+    print(f"  {'store warm (mmap + checksum + parse)':<36} {_median_ms(warm, runs):>9.2f}")
+
+
+def bench_process(bits: int, store_dir: str, runs: int):
+    def launch(store: str):
+        env = dict(os.environ, **{STORE_ENV: store})
+        subprocess.run([sys.executable, "-c", FIRST_PROOF, str(bits)], cwd=ROOT, env=env, check=True)
+
+    launch(store_dir)  # store와 .pyc 준비
+    off = _median_ms(lambda: launch("off"), runs)
+    warm = _median_ms(lambda: launch(store_dir), runs)
+    print(f"\n[NEW PROCESS] n={bits}, prover + first proof, median of {runs}")
+    print(f"  {'store off':<36} {off:>9.1f}")
+    print(f"  {'store warm':<36} {warm:>9.1f}")
+    print(f"  {'saved per process start':<36} {off - warm:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generator store startup benchmark")
+    parser.add_argument("--bits", type=int, nargs="+", default=[32], help="Bit lengths (default: 32)")
+    parser.add_argument("--runs", type=int, default=5, help="Repetitions per measurement (default: 5)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="generator_store_bench_")
+    try:
+        for bits in args.bits:
+            store_dir = os.path.join(workdir, f"n{bits}")
+            bench_in_process(bits, store_dir, args.runs)
+            bench_process(bits, store_dir, args.runs)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
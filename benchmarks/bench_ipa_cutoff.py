@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IPA Cutoff Benchmark (time vs bytes)
+
+IPA를 길이 k에서 멈추고 a, b 벡터를 그대로 보낼 때 (prove(ipa_cutoff=k)) k별로:
+- prove() 전체 시간과 IPA 단계 시간 (ms, 평균)
+- 로컬 검증 시간 (BulletproofVerifier.verify, ms, 평균)
+- 증명 크기: binary (RangeProof.to_binary) / JSON proof 필드 bytes
+
+k=1이 기존 형식(wire version 1)이고 k>1은 version 2입니다. 라운드 하나를 덜 할 때마다
+L/R 두 포인트(66바이트)가 빠지는 대신 스칼라가 2k개(64k바이트) 늘어납니다.
+--csv를 주면 같은 표를 CSV로 저장합니다 (차트용).
+
+Usage:
+    python3 benchmarks/bench_ipa_cutoff.py
+    python3 benchmarks/bench_ipa_cutoff.py --proofs 30 --cutoffs 1 4 32 --csv /tmp/ipa_cutoff.csv
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from crypto.bulletproof_prover_production import get_prover  # noqa: E402
+from crypto.bulletproof_verifier import BulletproofVerifier  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IPA cutoff time vs bytes benchmark")
+    parser.add_argument("--proofs", type=int, default=10, help="Proofs per cutoff (default: 10)")
+    parser.add_argument("--cutoffs", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32],
+                        help="Cutoffs k to compare (default: 1 2 4 8 16 32)")
+    parser.add_argument("--csv", default=None, help="Also write the table to this CSV file")
+    args = parser.parse_args()
+
+    prover = get_prover()
+    prover.h, prover.g_vec, prover.h_vec, prover.neg_h_vec  # generator 준비는 측정에서 제외
+    verifier = BulletproofVerifier()
+    n, order = prover.bit_length, prover.order
+    values = [random.randrange(1 << n) for _ in range(args.proofs)]
+
+    rows = []
+    for k in args.cutoffs:
+        start = time.perf_counter()
+        proofs = [prover.prove(v, ipa_cutoff=k) for v in values]
+        prove_ms = (time.perf_counter() - start) * 1000 / len(values)
+
+        start = time.perf_counter()
+        for _ in values:
+            prover._inner_product_rounds([order.random() for _ in range(n)], [order.random() for _ in range(n)],
+                                         prover.g_vec, prover.h_vec, order.random(), cutoff=k)
+        ipa_ms = (time.perf_counter() - start) * 1000 / len(values)
+
+        encoded = [p.to_json_dict() for p in proofs]
+        start = time.perf_counter()
+        for d in encoded:
+            ok, reason = verifier.verify(d["commitment"], d["proof"])
+            assert ok, f"k={k}: {reason}"
+        verify_ms = (time.perf_counter() - start) * 1000 / len(values)
+
+        rows.append({"k": k, "rounds": len(proofs[0].L), "version": proofs[0].version,
+                     "prove_ms": round(prove_ms, 1), "ipa_ms": round(ipa_ms, 1), "verify_ms": round(verify_ms, 2),
+                     "binary_bytes": len(proofs[0].to_binary()),
+                     "json_bytes": len(json.dumps(encoded[0]["proof"], separators=(',', ':')))})
+
+    print(f"[IPA] n={n}, mean of {args.proofs} proofs per cutoff")
+    print(f"  {'k':>3} {'rounds':>6} {'ver':>3} {'prove ms':>9} {'ipa ms':>7} {'verify ms':>9} "
+          f"{'binary B':>9} {'json B':>7}  time | bytes")
+    max_ms = max(r["prove_ms"] for r in rows)
+    max_bytes = max(r["binary_bytes"] for r in rows)
+    for r in rows:
+        time_bar = "#" * round(20 * r["prove_ms"] / max_ms)
+        bytes_bar = "=" * round(20 * r["binary_bytes"] / max_bytes)
+        print(f"  {r['k']:>3} {r['rounds']:>6} {r['version']:>3} {r['prove_ms']:>9.1f} {r['ipa_ms']:>7.1f} "
+              f"{r['verify_ms']:>9.2f} {r['binary_bytes']:>9} {r['json_bytes']:>7}  {time_bar:<20} | {bytes_bar}")
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"[IPA] wrote {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
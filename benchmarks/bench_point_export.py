@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Proof Point Export Benchmark
+
+증명 하나의 포인트(n=32: V, A, S, T1, T2 + L/R 5라운드 = 15개)를 덧셈 결과
+(Jacobian 좌표) 상태에서 직렬화하는 비용을 비교합니다 (증명당 평균 us):
+1) 포인트마다 export() (포인트마다 field inversion)
+2) prover 방식: 동시에 존재하는 포인트끼리 export_points (V/A/S, T1/T2, 라운드별 L/R)
+3) 증명 하나의 포인트 전체를 export_points 한 번으로
+4) 여러 증명의 포인트를 export_points 한 번으로 (--batch 증명)
+
+정규화는 포인트를 in place로 바꾸므로 반복마다 새 포인트를 만들고 직렬화 시간만 잽니다.
+
+Usage:
+    python3 benchmarks/bench_point_export.py
+    python3 benchmarks/bench_point_export.py --proofs 500 --batch 16
+"""
+
+import os
+import sys
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from petlib.ec import EcGroup  # noqa: E402
+
+from crypto.point_codec import export_points  # noqa: E402
+
+
+def _proof_points(group: EcGroup, rounds: int):
+    """덧셈으로 만든 (affine이 아닌) 포인트 3 + 2 + 2*rounds개"""
+    g = group.generator()
+    order = group.order()
+    return [order.random() * g + g for _ in range(5 + 2 * rounds)]
+
+
+def _time(group: EcGroup, proofs: int, rounds: int, export) -> float:
+    point_sets = [_proof_points(group, rounds) for _ in range(proofs)]
+    start = time.perf_counter()
+    export(point_sets)
+    return (time.perf_counter() - start) / proofs * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proof point export benchmark")
+    parser.add_argument("--proofs", type=int, default=300, help="Proofs' worth of points (default: 300)")
+    parser.add_argument("--bits", type=int, default=32, help="Bit length (IPA rounds = log2(bits))")
+    parser.add_argument("--batch", type=int, default=8, help="Proofs per cross-proof batch (default: 8)")
+    args = parser.parse_args()
+
+    group = EcGroup(714)
+    rounds = args.bits.bit_length() - 1
+
+    def per_point(point_sets):
+        for points in point_sets:
+            [pt.export() for pt in points]
+
+    def staged(point_sets):
+        for points in point_sets:
+            export_points(group, points[:3])
+            export_points(group, points[3:5])
+            for i in range(5, len(points), 2):
+                export_points(group, points[i:i + 2])
+
+    def per_proof(point_sets):
+        for points in point_sets:
+            export_points(group, points)
+
+    def cross_proof(point_sets):
+        for i in range(0, len(point_sets), args.batch):
+            export_points(group, [pt for points in point_sets[i:i + args.batch] for pt in points])
+
+    print(f"[EXPORT] {5 + 2 * rounds} points per proof, mean of {args.proofs} proofs")
+    print(f"  {'method':<44} {'us/proof':>9}")
+    baseline = None
+    for label, export in (("export() per point", per_point),
+                          ("export_points per stage (prover)", staged),
+                          ("export_points per proof", per_proof),
+                          (f"export_points per {args.batch} proofs", cross_proof)):
+        elapsed = _time(group, args.proofs, rounds, export)
+        baseline = baseline or elapsed
+        print(f"  {label:<44} {elapsed:>9.0f} {baseline / elapsed:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
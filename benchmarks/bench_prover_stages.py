@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Prover Stage Benchmark
+
+prove() 한 번을 단계별로 나눠 측정합니다 (증명당 평균 ms):
+- V: commitment (scalar mult 2번)
+- A 비트 항 (scalar mult): _vector_commit(aL, G, aR, H) - 이전 방식, scalar mult 2n번
+- A 비트 항 (덧셈만): _bit_vector_commit(value) - 비트에 따라 G_i / -H_i 덧셈 n번
+- A 전체: alpha·H + 비트 항 (prover 방식)
+- S: rho·H + _vector_commit(sL, G, sR, H)
+- T1, T2: scalar mult 4번 + export_points
+- IPA: _inner_product_rounds (log2(n) 라운드)
+- prove() 전체
+
+두 A 비트 항 방식이 같은 점을 만드는지도 확인합니다.
+
+Usage:
+    python3 benchmarks/bench_prover_stages.py
+    python3 benchmarks/bench_prover_stages.py --proofs 50
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from petlib.bn import Bn  # noqa: E402
+
+from crypto.bulletproof_prover_production import get_prover  # noqa: E402
+from crypto.point_codec import export_points  # noqa: E402
+
+
+def _time(fn, values) -> float:
+    start = time.perf_counter()
+    for v in values:
+        fn(v)
+    return (time.perf_counter() - start) * 1000 / len(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prover stage benchmark")
+    parser.add_argument("--proofs", type=int, default=20, help="Proofs per stage (default: 20)")
+    args = parser.parse_args()
+
+    prover = get_prover()
+    prover.h, prover.g_vec, prover.h_vec, prover.neg_h_vec  # generator 준비는 측정에서 제외
+    n, order = prover.bit_length, prover.order
+    values = [random.randrange(1 << n) for _ in range(args.proofs)]
+
+    def bits(v):
+        aL = prover._bit_decompose(v)
+        return aL, [(ai - Bn(1)) % order for ai in aL]
+
+    for v in values[:3]:
+        aL, aR = bits(v)
+        assert prover._vector_commit(aL, prover.g_vec, aR, prover.h_vec) == prover._bit_vector_commit(v), v
+
+    def bit_term_scalar(v):
+        aL, aR = bits(v)
+        prover._vector_commit(aL, prover.g_vec, aR, prover.h_vec)
+
+    def commitment_S(_):
+        sL = [order.random() for _ in range(n)]
+        sR = [order.random() for _ in range(n)]
+        order.random() * prover.h + prover._vector_commit(sL, prover.g_vec, sR, prover.h_vec)
+
+    def commitments_T(_):
+        T1 = order.random() * prover.g + order.random() * prover.h
+        T2 = order.random() * prover.g + order.random() * prover.h
+        export_points(prover.group, [T1, T2])
+
+    def ipa(_):
+        prover._inner_product_rounds([order.random() for _ in range(n)], [order.random() for _ in range(n)],
+                                     prover.g_vec, prover.h_vec, order.random())
+
+    stages = (
+        ("V (commit)", lambda v: prover.commit(v)),
+        ("A bit terms, scalar mult (2n)", bit_term_scalar),
+        ("A bit terms, additions only (n)", prover._bit_vector_commit),
+        ("A = alpha*H + bit terms (prover)", lambda v: order.random() * prover.h + prover._bit_vector_commit(v)),
+        ("S", commitment_S),
+        ("T1, T2", commitments_T),
+        (f"IPA ({n.bit_length() - 1} rounds)", ipa),
+        ("prove() total", lambda v: prover.prove(v)),
+    )
+
+    print(f"[PROVER] n={n}, mean of {args.proofs} proofs per stage")
+    print(f"  {'stage':<36} {'ms/proof':>9}")
+    for label, fn in stages:
+        print(f"  {label:<36} {_time(fn, values):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
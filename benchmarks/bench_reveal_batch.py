@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch Reveal Benchmark
+
+/api/v1/reveal-raw 단건 호출 N번과 /api/v1/reveal-raw/batch 1회 호출의
+지연 시간을 배치 크기별로 비교합니다. Flask test client를 사용하므로
+네트워크 없이 서버 내부 처리 비용만 측정합니다.
+
+Usage:
+    python3 benchmarks/bench_reveal_batch.py
+    python3 benchmarks/bench_reveal_batch.py --sizes 1 10 100 1000 --repeat 20
+"""
+
+import os
+import sys
+import time
+import argparse
+import contextlib
+import io
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reveal_server import RAWValueBuffer, create_app  # noqa: E402
+
+
+def _populate(buffer: RAWValueBuffer, count: int):
+    """버퍼에 테스트 항목 저장 (절반은 조회 대상, 나머지는 미존재 키로 사용)"""
+    keys = []
+    for i in range(count):
+        sensor_id = f"P1_PIT{i % 8:02d}"
+        nonce = f"{i:024X}"
+        buffer.store(sensor_id, 1700000000 + i, nonce, i * 0.001)
+        keys.append((sensor_id, nonce))
+    return keys
+
+
+def bench(sizes, repeat: int):
+    buffer = RAWValueBuffer(ttl_seconds=600)
+    app = create_app(buffer, max_batch_size=max(sizes))
+    client = app.test_client()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        keys = _populate(buffer, max(sizes))
+
+    print(f"{'batch':>7} {'single_total_ms':>16} {'batch_ms':>10} {'per_item_us':>12} {'speedup':>8}")
+    for size in sizes:
+        # 절반은 존재하는 키, 절반은 없는 키
+        items = [{"sensor_id": s, "nonce": n} for s, n in keys[:size - size // 2]]
+        items += [{"sensor_id": "MISSING", "nonce": f"{i:024X}"} for i in range(size // 2)]
+
+        single_ms = []
+        batch_ms = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for item in items:
+                    client.post('/api/v1/reveal-raw', json=item)
+                single_ms.append((time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                response = client.post('/api/v1/reveal-raw/batch', json={"items": items})
+                batch_ms.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200, response.get_json()
+
+        single = statistics.median(single_ms)
+        batch = statistics.median(batch_ms)
+        print(f"{size:>7} {single:>16.2f} {batch:>10.2f} {batch * 1000 / size:>12.1f} {single / batch:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch reveal latency benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000],
+                        help="Batch sizes to measure (default: 1 10 100 1000)")
+    parser.add_argument("--repeat", type=int, default=10, help="Repetitions per size (default: 10)")
+    args = parser.parse_args()
+
+    bench(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reveal Server Load Test (dev vs async serving mode)
+
+reveal_server.py를 서빙 모드별로 별도 프로세스로 띄우고, asyncio 클라이언트로
+keep-alive 연결 여러 개에서 store-raw / reveal-raw 요청을 반복 전송하여
+requests/sec와 지연 시간 백분위(p50/p99)를 비교합니다.
+
+Usage:
+    python3 benchmarks/bench_serving.py
+    python3 benchmarks/bench_serving.py --connections 64 --duration 10 --pipeline 4
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float = 15.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def _build_request(path: str, payload: dict) -> bytes:
+    body = json.dumps(payload).encode()
+    head = (f"POST {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n")
+    return head.encode() + body
+
+
+async def _read_response(reader: asyncio.StreamReader):
+    """응답 하나 읽기 -> (status, 서버가 연결을 닫는지 여부)"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length = 0
+    close = False
+    for line in lines[1:]:
+        lower = line.lower()
+        if lower.startswith("content-length:"):
+            length = int(line.split(":", 1)[1])
+        elif lower.startswith("connection:") and "close" in lower:
+            close = True
+    await reader.readexactly(length)
+    return status, close
+
+
+async def _connection_worker(cid: int, port: int, deadline: float, pipeline: int,
+                             latencies: list, errors: list):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    seq = 0
+    try:
+        while time.perf_counter() < deadline:
+            batch = []
+            for _ in range(pipeline):
+                nonce = f"{cid:06X}{seq:018X}"
+                if seq % 2 == 0:
+                    batch.append(_build_request("/api/v1/store-raw", {
+                        "sensor_id": f"P1_PIT{cid % 16:02d}", "event_ts": seq, "nonce": nonce, "raw_value": seq * 0.001}))
+                else:
+                    batch.append(_build_request("/api/v1/reveal-raw", {
+                        "sensor_id": f"P1_PIT{cid % 16:02d}", "nonce": f"{cid:06X}{seq - 1:018X}"}))
+                seq += 1
+            start = time.perf_counter()
+            writer.write(b"".join(batch))
+            await writer.drain()
+            for i in range(len(batch)):
+                status, close = await _read_response(reader)
+                latencies.append((time.perf_counter() - start) * 1000)
+                if status != 200:
+                    errors.append(status)
+                if close:
+                    # keep-alive 미지원 서버(Flask dev server): 재연결 후 남은 요청 재전송
+                    writer.close()
+                    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                    if i + 1 < len(batch):
+                        writer.write(b"".join(batch[i + 1:]))
+                        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError) as e:
+        errors.append(type(e).__name__)
+    finally:
+        writer.close()
+
+
+async def _drive(port: int, connections: int, duration: float, pipeline: int):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        _connection_worker(cid, port, deadline, pipeline, latencies, errors)
+        for cid in range(connections)
+    ])
+    return latencies, errors, time.perf_counter() - start
+
+
+def _percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[index]
+
+
+def run_mode(mode: str, args) -> dict:
+    port = _free_port()
+    cmd = [sys.executable, os.path.join(ROOT, "reveal_server.py"), "--port", str(port), "--server-mode", mode,
+           "--workers", str(args.workers)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=ROOT)
+    try:
+        _wait_for_port(port)
+        latencies, errors, elapsed = asyncio.run(_drive(port, args.connections, args.duration, args.pipeline))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": _percentile(latencies, 50),
+        "p99_ms": _percentile(latencies, 99),
+        "errors": len(errors)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reveal server serving-mode load test")
+    parser.add_argument("--modes", nargs="+", default=["dev", "async"], help="Serving modes to compare (default: dev async)")
+    parser.add_argument("--connections", type=int, default=32, help="Concurrent keep-alive connections (default: 32)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per mode (default: 5.0)")
+    parser.add_argument("--pipeline", type=int, default=1, help="Pipelined requests per connection (default: 1)")
+    parser.add_argument("--workers", type=int, default=8, help="Async mode worker threads (default: 8)")
+    args = parser.parse_args()
+
+    print(f"[LOAD] connections={args.connections}, duration={args.duration}s, pipeline={args.pipeline}")
+    print(f"{'mode':>6} {'requests':>9} {'req/s':>9} {'p50_ms':>8} {'p99_ms':>8} {'errors':>7}")
+    for mode in args.modes:
+        r = run_mode(mode, args)
+        print(f"{r['mode']:>6} {r['requests']:>9} {r['rps']:>9.0f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
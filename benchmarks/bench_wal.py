@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reveal Server WAL Benchmark
+
+1. Ingest: RAWValueBuffer.store() 처리량을 WAL 없음 / WAL(async ack) /
+   WAL(sync ack, group commit 후 응답) 세 가지 설정으로 비교
+2. Recovery: N개 항목이 기록된 세그먼트 로그를 mmap으로 스캔하는 시간과
+   버퍼에 적재하는 시간 측정
+
+Usage:
+    python3 benchmarks/bench_wal.py
+    python3 benchmarks/bench_wal.py --recover-entries 10000000   # 10M 항목 (수 GB 메모리 필요)
+"""
+
+import os
+import sys
+import time
+import argparse
+import contextlib
+import io
+import shutil
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reveal_server import RAWValueBuffer  # noqa: E402
+from reveal_wal import SegmentLog, encode_record, SEGMENT_SUFFIX  # noqa: E402
+
+
+def bench_ingest(label: str, buffer: RAWValueBuffer, total: int, threads: int):
+    per_thread = total // threads
+
+    def worker(tid: int):
+        for i in range(per_thread):
+            buffer.store(f"P1_PIT{tid:02d}", 1700000000 + i, f"{tid:04X}{i:020X}", i * 0.001)
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - start
+
+    stored = per_thread * threads
+    print(f"  {label:<24} {stored / elapsed:>12,.0f} stores/s  ({stored} in {elapsed:.2f}s)")
+
+
+def write_log(directory: str, entries: int, ttl: int) -> int:
+    """벤치마크용 세그먼트 로그를 직접 생성 (writer 스레드 우회)"""
+    now = time.time()
+    deadline_ms = int((now + ttl + 60) * 1000)
+    path = os.path.join(directory, f"{deadline_ms:016d}{SEGMENT_SUFFIX}")
+    expires_ts = now + ttl
+    chunk = []
+    with open(path, 'wb') as f:
+        for i in range(entries):
+            chunk.append(encode_record(f"P1_PIT{i % 64:02d}", 1700000000 + i, f"{i:024X}", i * 0.001, now, expires_ts))
+            if len(chunk) >= 100000:
+                f.write(b''.join(chunk))
+                chunk = []
+        f.write(b''.join(chunk))
+    return os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reveal server WAL ingest/recovery benchmark")
+    parser.add_argument("--ingest-entries", type=int, default=20000, help="Stores per ingest run (default: 20000)")
+    parser.add_argument("--threads", type=int, default=32, help="Concurrent storing threads (default: 32)")
+    parser.add_argument("--commit-ms", type=float, default=5.0, help="Group commit window in ms (default: 5.0)")
+    parser.add_argument("--recover-entries", type=int, default=1000000, help="Entries in recovery log (default: 1000000)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="reveal_wal_bench_")
+    try:
+        print(f"[INGEST] {args.ingest_entries} stores, {args.threads} threads, commit={args.commit_ms}ms")
+        bench_ingest("durability off", RAWValueBuffer(), args.ingest_entries, args.threads)
+
+        for label, wait in (("WAL async ack", False), ("WAL sync ack (fsync)", True)):
+            wal_dir = os.path.join(workdir, label.replace(" ", "_").replace("(", "").replace(")", ""))
+            wal = SegmentLog(wal_dir, commit_interval_ms=args.commit_ms)
+            bench_ingest(label, RAWValueBuffer(wal=wal, wal_wait=wait), args.ingest_entries, args.threads)
+            wal.close()
+            print(f"  {'':<24} commits={wal.commits}, records/commit={wal.records_written / max(wal.commits, 1):.1f}")
+
+        print(f"\n[RECOVERY] {args.recover_entries:,} entries")
+        recover_dir = os.path.join(workdir, "recover")
+        os.makedirs(recover_dir)
+        size = write_log(recover_dir, args.recover_entries, ttl=600)
+        print(f"  log size: {size / 1e6:.1f} MB")
+
+        wal = SegmentLog(recover_dir)
+        start = time.perf_counter()
+        scanned = sum(1 for _ in wal.replay())
+        print(f"  mmap scan:    {time.perf_counter() - start:>8.2f}s ({scanned:,} records)")
+
+        start = time.perf_counter()
+        buffer = RAWValueBuffer(wal=wal)
+        print(f"  buffer load:  {time.perf_counter() - start:>8.2f}s ({buffer.recovered_entries:,} entries)")
+        wal.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Windowed Aggregate Proofs for Slow-moving Sensors
+
+Pedersen commitment는 더할 수 있습니다:
+    Σ (v_i·G + gamma_i·H) = (Σv_i)·G + (Σgamma_i)·H
+탱크 수위처럼 천천히 변하는 공정 변수는 측정값마다 Bulletproof(~450ms)를 만드는
+대신 commitment V_i만 만들고(scalar mult 2번, ~2ms), K개가 모이면 합계 commitment에
+대한 range proof 하나를 보냅니다 -> 증명 비용 K분의 1.
+
+메시지 (단건 요청과 같은 endpoint/batch 스키마):
+- 측정값마다 COMMIT_ONLY
+    {"mode": "COMMIT_ONLY", "sensor", "ts", "nonce", "commitment": V_i,
+     "window": {"id", "index"}, ...}
+- window 종료 시 ZK_AGGREGATE
+    {"mode": "ZK_AGGREGATE", "sensor", "ts", "nonce", "commitment": ΣV_i, "proof", "challenges",
+     "window": {"id", "count", "nonces": [...], "commitments": [V_1..V_K]}, ...}
+  검증자는 ΣV_i == commitment를 확인한 뒤 일반 증명처럼 검증합니다.
+
+주의:
+- 합계 증명은 Σv_i ∈ [0, 2^n)만 보장하며 개별 측정값의 범위는 증명하지 않습니다.
+  개별 RAW 값은 지금과 같이 nonce별로 Reveal 서버에 저장됩니다.
+- 다음 값을 더하면 합계가 2^n을 넘는 경우 그 전에 window를 닫습니다.
+- 종료 시 남은 측정값은 부분 window로 증명합니다 (close()).
+
+Usage:
+    window = CommitWindow(prover, size=30)
+    commitment, index = window.add(scaled_value, nonce)
+    if window.full:
+        closed = window.close()     # ClosedWindow (proof 포함)
+"""
+
+import time
+from typing import List, Optional, Tuple
+
+
+class ClosedWindow:
+    """닫힌 window: 합계 증명과 측정값별 commitment/nonce"""
+
+    __slots__ = ("window_id", "commitments", "nonces", "value_sum", "proof", "prove_ms")
+
+    def __init__(self, window_id: str, commitments: List[str], nonces: List[str], value_sum: int,
+                 proof, prove_ms: float):
+        self.window_id = window_id
+        self.commitments = commitments
+        self.nonces = nonces
+        self.value_sum = value_sum
+        self.proof = proof            # RangeProof (V == Σ commitments)
+        self.prove_ms = prove_ms
+
+    @property
+    def count(self) -> int:
+        return len(self.commitments)
+
+
+class CommitWindow:
+    """측정값 commitment를 누적하고 window 종료 시 합계 range proof 하나를 생성"""
+
+    def __init__(self, prover, size: int, ipa_cutoff: int = 1):
+        """
+        Args:
+            prover: BulletproofProverProduction (commit / prove(gamma=...))
+            size: window당 측정값 수 K
+            ipa_cutoff: 합계 증명의 IPA cutoff (prove(ipa_cutoff=...))
+        """
+        if size < 1:
+            raise ValueError("window size must be >= 1")
+        self.prover = prover
+        self.size = size
+        self.ipa_cutoff = ipa_cutoff
+        self.limit = 1 << prover.bit_length
+        self.windows = 0              # 닫은 window 수
+        self.readings = 0             # commitment만 보낸 측정값 수
+        self.commit_ms = 0.0
+        self.prove_ms = 0.0
+        self._seq = 0
+        self._reset()
+
+    def _reset(self):
+        self.window_id: Optional[str] = None
+        self.commitments: List[str] = []
+        self.nonces: List[str] = []
+        self.value_sum = 0
+        self._gamma_sum = None
+
+    @property
+    def full(self) -> bool:
+        return len(self.commitments) >= self.size
+
+    @property
+    def pending(self) -> int:
+        return len(self.commitments)
+
+    def fits(self, scaled_value: int) -> bool:
+        """이 값을 더해도 합계가 2^n 미만인지 (아니면 먼저 close)"""
+        return self.value_sum + scaled_value < self.limit
+
+    def add(self, scaled_value: int, nonce: str) -> Tuple[str, int]:
+        """
+        측정값 commitment 생성 + 누적
+
+        Returns:
+            (commitment 대문자 hex, window 안 index)
+        """
+        if not 0 <= scaled_value < self.limit:
+            raise ValueError(f"Value {scaled_value} out of range [0, 2^{self.prover.bit_length})")
+        if not self.fits(scaled_value):
+            raise ValueError("window sum would overflow; close the window first")
+        if self.window_id is None:
+            self._seq += 1
+            self.window_id = f"{int(time.time())}-{self._seq}"
+
+        start = time.perf_counter()
+        commitment, gamma = self.prover.commit(scaled_value)
+        self.commit_ms += (time.perf_counter() - start) * 1000
+
+        order = self.prover.order
+        self._gamma_sum = gamma if self._gamma_sum is None else (self._gamma_sum + gamma) % order
+        self.value_sum += scaled_value
+        self.commitments.append(commitment.hex().upper())
+        self.nonces.append(nonce)
+        self.readings += 1
+        return self.commitments[-1], len(self.commitments) - 1
+
+    def close(self) -> Optional[ClosedWindow]:
+        """합계 commitment에 대한 range proof 생성 후 새 window 시작 (비어 있으면 None)"""
+        if not self.commitments:
+            return None
+        start = time.perf_counter()
+        proof = self.prover.prove(self.value_sum, self.window_id, gamma=self._gamma_sum, ipa_cutoff=self.ipa_cutoff)
+        prove_ms = (time.perf_counter() - start) * 1000
+        closed = ClosedWindow(self.window_id, self.commitments, self.nonces, self.value_sum, proof, prove_ms)
+        self.prove_ms += prove_ms
+        self.windows += 1
+        self._reset()
+        return closed
+
+    def get_stats(self) -> dict:
+        return {
+            "windows": self.windows,
+            "readings": self.readings,
+            "pending": self.pending,
+            "proofs_saved": self.readings - self.windows - self.pending,
+            "avg_commit_ms": round(self.commit_ms / self.readings, 3) if self.readings else 0.0,
+            "avg_prove_ms": round(self.prove_ms / self.windows, 1) if self.windows else 0.0
+        }
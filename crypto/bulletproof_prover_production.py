@@ -48,11 +48,18 @@ DELTA_SCHEME: "BULLETPROOF_PAPER_STANDARD"
 from petlib.ec import EcGroup, EcPt
 from petlib.bn import Bn
 from hashlib import sha256
-from typing import Dict, Any, List, Tuple, Optional
+from functools import cached_property
+from typing import Dict, Any, List, Tuple, Optional, Union
 import secrets
 import time
 import json
 
+from crypto.generator_store import GeneratorStore, default_store_dir, store_key
+from crypto.point_codec import export_points
+from crypto.randomness import ProofRandomness, proof_scalar_count
+from crypto.range_proof import RangeProof
+from crypto.transcript import Transcript
+
 
 # Protocol Constants
 PROTOCOL_VERSION = "ICS-BULLETPROOF-V1"
@@ -74,11 +81,14 @@ GENERATOR_SCHEMES = {
 class BulletproofProverProduction:
     """Production Mode: 수학적으로 완전한 Bulletproof Prover"""
 
-    def __init__(self, bit_length: int = 32, domain: str = "ICS_BULLETPROOF_VERIFIER_v1"):
+    def __init__(self, bit_length: int = 32, domain: str = "ICS_BULLETPROOF_VERIFIER_v1",
+                 store_dir: Optional[str] = None, use_store: bool = True):
         """
         Args:
             bit_length: 비트 길이 (기본: 32)
             domain: Fiat-Shamir 도메인 분리 태그
+            store_dir: generator 파일 디렉터리 (기본: ICS_GENERATOR_STORE 또는 ~/.cache/ics-bulletproof)
+            use_store: False면 generator 파일을 쓰지 않고 항상 직접 계산
         """
         self.bit_length = bit_length
         self.domain = domain.encode('utf-8')
@@ -88,10 +98,43 @@ class BulletproofProverProduction:
         self.g = self.group.generator()
         self.order = self.group.order()
 
-        # Generator 생성 (서버와 동일)
-        self.h = self._generate_h()
-        self.g_vec = self._generate_g_vector()
-        self.h_vec = self._generate_h_vector()
+        # Generator(H, G_vec, H_vec)는 처음 사용할 때 생성 (서버와 동일)
+        # scalar multiplication 2n+1번(n=32에서 ~70ms)을 시작 시점에서 첫 증명으로 미루고,
+        # 프로세스 간에는 generator 파일로 공유 (crypto/generator_store.py)
+        directory = (store_dir or default_store_dir()) if use_store else None
+        self.generator_store = GeneratorStore(directory) if directory else None
+        self.generator_key = store_key(PROTOCOL_VERSION, GENERATOR_SCHEME, self.group.nid(), bit_length, domain)
+
+    @cached_property
+    def _stored_generators(self) -> Dict[str, List[EcPt]]:
+        """generator 파일 로드 (없거나 key/checksum이 맞지 않으면 계산 후 저장)"""
+        return self.generator_store.load_or_build(self.generator_key, self.group, self._build_generators)
+
+    def _build_generators(self) -> Dict[str, List[EcPt]]:
+        return {"H": [self._generate_h()], "G_vec": self._generate_g_vector(), "H_vec": self._generate_h_vector()}
+
+    @cached_property
+    def h(self) -> EcPt:
+        if self.generator_store is None:
+            return self._generate_h()
+        return self._stored_generators["H"][0]
+
+    @cached_property
+    def g_vec(self) -> List[EcPt]:
+        if self.generator_store is None:
+            return self._generate_g_vector()
+        return self._stored_generators["G_vec"]
+
+    @cached_property
+    def h_vec(self) -> List[EcPt]:
+        if self.generator_store is None:
+            return self._generate_h_vector()
+        return self._stored_generators["H_vec"]
+
+    @cached_property
+    def neg_h_vec(self) -> List[EcPt]:
+        """-H_i: aR_i = -1 (비트 0)인 A 항을 덧셈만으로 더하기 위한 사전 계산"""
+        return [-hi for hi in self.h_vec]
 
     def _generate_h(self) -> EcPt:
         """독립적인 생성원 H 생성"""
@@ -125,27 +168,24 @@ class BulletproofProverProduction:
         random_bytes = secrets.token_bytes(32)
         return Bn.from_binary(random_bytes) % self.order
 
+    @cached_property
+    def transcript(self) -> Transcript:
+        """도메인 분리 prefix(domain || n)를 흡수한 Fiat-Shamir transcript (fork해서 사용)"""
+        return Transcript(self.domain, self.bit_length)
+
+    def _challenge_scalar(self, transcript: Transcript) -> Bn:
+        return Bn.from_binary(transcript.digest()) % self.order
+
     def _fiat_shamir_challenge(self, *elements) -> Bn:
-        """Fiat-Shamir 챌린지 생성"""
-        hasher = sha256()
-
-        # 도메인 분리
-        hasher.update(self.domain)
-        hasher.update(self.bit_length.to_bytes(4, 'big'))
-
-        # 입력 요소들 해싱
-        for elem in elements:
-            if isinstance(elem, EcPt):
-                hasher.update(elem.export())
-            elif isinstance(elem, Bn):
-                hasher.update(elem.binary())
-            elif isinstance(elem, bytes):
-                hasher.update(elem)
-            else:
-                hasher.update(str(elem).encode())
-
-        challenge_bytes = hasher.digest()
-        return Bn.from_binary(challenge_bytes) % self.order
+        """Fiat-Shamir 챌린지 생성: H(domain || n || elements...)"""
+        return self._challenge_scalar(self.transcript.fork().append(*elements))
+
+    def _challenges_yz(self, A: Union[EcPt, bytes], S: Union[EcPt, bytes]) -> Tuple[Bn, Bn]:
+        """y = H(domain||n||A||S), z = H(domain||n||A||S||y) - A, S는 한 번만 흡수"""
+        transcript = self.transcript.fork().append(A, S)
+        y = self._challenge_scalar(transcript)
+        z = self._challenge_scalar(transcript.append(y))
+        return y, z
 
     def _bit_decompose(self, value: int) -> List[Bn]:
         """
@@ -192,6 +232,24 @@ class BulletproofProverProduction:
             result = result + (bi * hi)
         return result
 
+    def _check_ipa_cutoff(self, cutoff: int):
+        if cutoff < 1 or cutoff > self.bit_length or cutoff & (cutoff - 1):
+            raise ValueError(f"IPA cutoff must be a power of two in [1, {self.bit_length}], got {cutoff}")
+
+    def _bit_vector_commit(self, value: int) -> EcPt:
+        """
+        비트 벡터 commitment: sum(aL_i * G_i) + sum(aR_i * H_i)
+
+        aL_i ∈ {0, 1}, aR_i = aL_i - 1 ∈ {0, -1}이므로 비트가 1이면 G_i, 0이면 -H_i를
+        더하기만 하면 됨 -> scalar mult 2n번 대신 point 덧셈 n번 (_vector_commit과 같은 점)
+        """
+        terms = [gi if (value >> i) & 1 else neg_hi for i, (gi, neg_hi) in enumerate(zip(self.g_vec, self.neg_h_vec))]
+        # group.infinite()와 generator는 공유 객체라 in-place 누적은 새 포인트(복사본)에서 시작
+        result = terms[0] + self.group.infinite()
+        for term in terms[1:]:
+            result.pt_add_inplace(term)
+        return result
+
     def _compute_delta(self, y: Bn, z: Bn) -> Bn:
         """
         delta(y, z) 계산 - BULLETPROOF_PAPER_STANDARD
@@ -238,27 +296,61 @@ class BulletproofProverProduction:
         delta = ((z - z2) * y_powers_sum - z3 * two_powers_sum) % self.order
         return delta
 
-    def generate_range_proof(self, value: int, nonce: str = "") -> Dict[str, Any]:
+    def commit(self, value: int, gamma: Optional[Bn] = None) -> Tuple[bytes, Bn]:
+        """
+        Pedersen commitment만 생성: V = value·G + gamma·H (증명 없음, scalar mult 2번)
+
+        Returns:
+            (압축 V encoding, gamma) - 합계 증명 시 gamma들의 합을 prove(gamma=...)에 전달
+        """
+        if gamma is None:
+            gamma = self._random_scalar()
+        V = Bn(value) * self.g + gamma * self.h
+        return V.export(), gamma
+
+    def generate_range_proof(self, value: int, nonce: str = "", seed: Optional[bytes] = None) -> Dict[str, Any]:
         """
-        Production Mode: 수학적으로 완전한 Range Proof 생성
+        Production Mode: 수학적으로 완전한 Range Proof 생성 (hex dict)
 
         Args:
             value: 증명할 값 (0 <= value < 2^bit_length)
             nonce: 고유 nonce
+            seed: blinding 난수 seed (재현 가능한 벤치마크/test vector 전용, 운영에서는 None)
 
         Returns:
-            proof 데이터 (commitment, proof, blinding_factor, timing)
+            proof 데이터 (commitment, proof, blinding_factor, timing) - prove().to_json_dict()
+        """
+        return self.prove(value, nonce, seed).to_json_dict()
+
+    def prove(self, value: int, nonce: str = "", seed: Optional[bytes] = None,
+              gamma: Optional[Bn] = None, ipa_cutoff: int = 1) -> RangeProof:
+        """
+        Range Proof 생성 -> RangeProof (hex/binary/challenges는 필요할 때 생성)
+
+        Args:
+            value: 증명할 값 (0 <= value < 2^bit_length)
+            nonce: 고유 nonce
+            seed: blinding 난수 seed (재현 가능한 벤치마크/test vector 전용, 운영에서는 None)
+            gamma: commitment blinding (commit()으로 만든 commitment들의 합을 증명할 때
+                   gamma 합 mod order; None이면 난수)
+            ipa_cutoff: 길이 k에서 IPA 라운드를 멈추고 a, b 벡터를 그대로 전송 (2의 거듭제곱,
+                        1이면 기존 형식; k > 1은 wire version 2 - crypto/range_proof.py)
         """
         start_time = time.time()
 
         # 값 범위 검증
         if value < 0 or value >= (1 << self.bit_length):
             raise ValueError(f"Value {value} out of range [0, 2^{self.bit_length})")
+        self._check_ipa_cutoff(ipa_cutoff)
 
         n = self.bit_length
 
+        # 증명에 필요한 blinding 스칼라를 OS seed 하나에서 한 번에 생성
+        rand = ProofRandomness(self.order, proof_scalar_count(n), seed)
+
         # === Step 1: Commitment 생성 ===
-        gamma = self._random_scalar()
+        drawn = rand.scalar()  # gamma를 받아도 소비해 이후 스칼라 스트림을 동일하게 유지
+        gamma = drawn if gamma is None else gamma % self.order
         v_bn = Bn(value)
         V = v_bn * self.g + gamma * self.h
 
@@ -267,21 +359,23 @@ class BulletproofProverProduction:
         aR = [(ai - Bn(1)) % self.order for ai in aL]  # [b_0 - 1, b_1 - 1, ...]
 
         # === Step 3: Blinding vectors ===
-        alpha = self._random_scalar()
-        sL = [self._random_scalar() for _ in range(n)]
-        sR = [self._random_scalar() for _ in range(n)]
-        rho = self._random_scalar()
+        alpha = rand.scalar()
+        sL = rand.take(n)
+        sR = rand.take(n)
+        rho = rand.scalar()
 
         # === Step 4: Compute A, S ===
-        # A = h^alpha * prod(g_i^{aL_i}) * prod(h_i^{aR_i})
-        A = alpha * self.h + self._vector_commit(aL, self.g_vec, aR, self.h_vec)
+        # A = h^alpha * prod(g_i^{aL_i}) * prod(h_i^{aR_i}) - 비트 항은 G_i / -H_i 덧셈만
+        A = alpha * self.h + self._bit_vector_commit(value)
 
         # S = h^rho * prod(g_i^{sL_i}) * prod(h_i^{sR_i})
         S = rho * self.h + self._vector_commit(sL, self.g_vec, sR, self.h_vec)
 
+        # V, A, S를 inversion 한 번으로 정규화해 직렬화 (transcript와 출력에 재사용)
+        V_bytes, A_bytes, S_bytes = export_points(self.group, [V, A, S])
+
         # === Step 5: Fiat-Shamir challenges y, z ===
-        y = self._fiat_shamir_challenge(A, S)
-        z = self._fiat_shamir_challenge(A, S, y)
+        y, z = self._challenges_yz(A_bytes, S_bytes)
 
         # === Step 6: Polynomial vectors l(x), r(x) ===
         # l(x) = aL - z*1^n + sL*x
@@ -325,14 +419,14 @@ class BulletproofProverProduction:
         t2 = self._inner_product(l1, r1)
 
         # === Step 8: Commitments T1, T2 ===
-        tau_1 = self._random_scalar()
-        tau_2 = self._random_scalar()
+        tau_1, tau_2 = rand.take(2)
 
         T1 = t1 * self.g + tau_1 * self.h
         T2 = t2 * self.g + tau_2 * self.h
+        T1_bytes, T2_bytes = export_points(self.group, [T1, T2])
 
         # === Step 9: Challenge x ===
-        x = self._fiat_shamir_challenge(T1, T2, z)
+        x = self._fiat_shamir_challenge(T1_bytes, T2_bytes, z)
 
         # === Step 10: Response values ===
         # tau_x = tau_2*x^2 + tau_1*x + z^2*gamma
@@ -352,38 +446,49 @@ class BulletproofProverProduction:
         t_hat = self._inner_product(l_vec, r_vec)
 
         # === Step 11: Inner Product Proof ===
-        inner_product_proof = self._generate_inner_product_proof(l_vec, r_vec, self.g_vec, self.h_vec, y, x)
+        L_vec, R_vec, final_a, final_b = self._inner_product_rounds(l_vec, r_vec, self.g_vec, self.h_vec, y, rand,
+                                                                    ipa_cutoff)
 
         proof_time = (time.time() - start_time) * 1000  # ms
 
-        # 결과 반환
-        return {
-            "commitment": V.export().hex().upper(),
-            "proof": {
-                "A": A.export().hex().upper(),
-                "S": S.export().hex().upper(),
-                "T1": T1.export().hex().upper(),
-                "T2": T2.export().hex().upper(),
-                "tau_x": tau_x.hex().upper().zfill(64),
-                "mu": mu.hex().upper().zfill(64),
-                "t": t_hat.hex().upper().zfill(64),
-                "inner_product_proof": inner_product_proof
-            },
-            "blinding_factor": gamma.hex().upper().zfill(64),
-            "timing": {
-                "proof_generation_ms": proof_time
-            }
-        }
+        # 결과 반환 (직렬화는 RangeProof view에서 지연)
+        return RangeProof(n, self.domain, V_bytes, A_bytes, S_bytes, T1_bytes, T2_bytes, L_vec, R_vec,
+                          tau_x, mu, t_hat, final_a, final_b, gamma=gamma, proof_time_ms=proof_time)
 
     def _generate_inner_product_proof(self, a: List[Bn], b: List[Bn],
                                       g_vec: List[EcPt], h_vec: List[EcPt],
-                                      y: Bn, x: Bn) -> Dict[str, Any]:
+                                      y: Bn, x: Bn, rand: Optional[ProofRandomness] = None) -> Dict[str, Any]:
         """
-        재귀적 Inner Product Proof 생성
+        재귀적 Inner Product Proof 생성 (hex dict)
 
         증명: <a, b> = t (이미 계산된 값)
+        rand: 라운드별 blinding(dL, dR) 스칼라 스트림 (None이면 새 OS seed)
+        """
+        L_vec, R_vec, final_a, final_b = self._inner_product_rounds(a, b, g_vec, h_vec, y, rand)
+        return {
+            "L": [L.hex().upper() for L in L_vec],
+            "R": [R.hex().upper() for R in R_vec],
+            "a": final_a[0].hex().upper().zfill(64),
+            "b": final_b[0].hex().upper().zfill(64)
+        }
+
+    def _inner_product_rounds(self, a: List[Bn], b: List[Bn],
+                              g_vec: List[EcPt], h_vec: List[EcPt], y: Bn,
+                              rand: Optional[ProofRandomness] = None,
+                              cutoff: int = 1) -> Tuple[List[bytes], List[bytes], List[Bn], List[Bn]]:
+        """
+        IPA 라운드 실행 (벡터 길이가 cutoff가 될 때까지)
+
+        Returns:
+            (L encoding 목록, R encoding 목록, 최종 a 벡터, 최종 b 벡터) - cutoff=1이면 길이 1
         """
         n = len(a)
+        if rand is None:
+            rand = ProofRandomness(self.order, 2 * (n.bit_length() - 1))
+        L_vec = []
+        R_vec = []
+        if n <= cutoff:
+            return L_vec, R_vec, a, b  # 라운드 없음: h' 변환도 불필요
 
         # y의 역원 계산 (h' = h^{y^-1} 변환용)
         y_inv = y.mod_inverse(self.order)
@@ -395,11 +500,8 @@ class BulletproofProverProduction:
             h_vec_prime.append(y_inv_power * h_vec[i])
             y_inv_power = (y_inv_power * y) % self.order
 
-        L_vec = []
-        R_vec = []
-
         # 재귀적으로 벡터 크기 절반씩 줄이기
-        while len(a) > 1:
+        while len(a) > cutoff:
             n = len(a) // 2
 
             # 벡터 분할
@@ -417,19 +519,19 @@ class BulletproofProverProduction:
             cR = self._inner_product(aR, bL)
 
             # Randomness
-            dL = self._random_scalar()
-            dR = self._random_scalar()
+            dL, dR = rand.take(2)
 
             # L = g^aL * h'^bR * h^dL + cL*G
             L = self._vector_commit(aL, gR, bR, hL) + dL * self.h
             # R = g^aR * h'^bL * h^dR + cR*G
             R = self._vector_commit(aR, gL, bL, hR) + dR * self.h
 
-            L_vec.append(L.export().hex().upper())
-            R_vec.append(R.export().hex().upper())
+            L_bytes, R_bytes = export_points(self.group, [L, R])
+            L_vec.append(L_bytes)
+            R_vec.append(R_bytes)
 
-            # Challenge w
-            w = self._fiat_shamir_challenge(L, R)
+            # Challenge w = H(domain||n||L||R)
+            w = self._fiat_shamir_challenge(L_bytes, R_bytes)
             w_inv = w.mod_inverse(self.order)
 
             # Fold vectors
@@ -442,16 +544,8 @@ class BulletproofProverProduction:
             # h' = hL*w + hR*w^-1
             h_vec_prime = [w * hL[i] + w_inv * hR[i] for i in range(n)]
 
-        # 최종 값
-        final_a = a[0]
-        final_b = b[0]
-
-        return {
-            "L": L_vec,
-            "R": R_vec,
-            "a": final_a.hex().upper().zfill(64),
-            "b": final_b.hex().upper().zfill(64)
-        }
+        # 최종 값 (cutoff개)
+        return L_vec, R_vec, a, b
 
     def dump_generators(self, output_path: str = "crypto/debug_generators_client.json"):
         """
@@ -487,7 +581,8 @@ class BulletproofProverProduction:
 
     def generate_range_proof_with_debug(self, value: int, nonce: str = "",
                                        sensor: str = "UNKNOWN",
-                                       dump_path: Optional[str] = None) -> Dict[str, Any]:
+                                       dump_path: Optional[str] = None,
+                                       seed: Optional[bytes] = None) -> Dict[str, Any]:
         """
         Production Mode: 디버그 모드로 Range Proof 생성 및 검증
 
@@ -496,6 +591,7 @@ class BulletproofProverProduction:
             nonce: 고유 nonce
             sensor: 센서 ID (디버그용)
             dump_path: 디버그 데이터를 저장할 JSON 경로 (None이면 저장 안함)
+            seed: blinding 난수 seed (재현 가능한 디버그 출력용, 운영에서는 None)
 
         Returns:
             proof 데이터 + 디버그 정보
@@ -508,8 +604,11 @@ class BulletproofProverProduction:
 
         n = self.bit_length
 
+        # 증명에 필요한 blinding 스칼라를 OS seed 하나에서 한 번에 생성
+        rand = ProofRandomness(self.order, proof_scalar_count(n), seed)
+
         # === Step 1: Commitment 생성 ===
-        gamma = self._random_scalar()
+        gamma = rand.scalar()
         v_bn = Bn(value)
         V = v_bn * self.g + gamma * self.h
 
@@ -518,18 +617,17 @@ class BulletproofProverProduction:
         aR = [(ai - Bn(1)) % self.order for ai in aL]
 
         # === Step 3: Blinding vectors ===
-        alpha = self._random_scalar()
-        sL = [self._random_scalar() for _ in range(n)]
-        sR = [self._random_scalar() for _ in range(n)]
-        rho = self._random_scalar()
+        alpha = rand.scalar()
+        sL = rand.take(n)
+        sR = rand.take(n)
+        rho = rand.scalar()
 
         # === Step 4: Compute A, S ===
         A = alpha * self.h + self._vector_commit(aL, self.g_vec, aR, self.h_vec)
         S = rho * self.h + self._vector_commit(sL, self.g_vec, sR, self.h_vec)
 
         # === Step 5: Fiat-Shamir challenges y, z ===
-        y = self._fiat_shamir_challenge(A, S)
-        z = self._fiat_shamir_challenge(A, S, y)
+        y, z = self._challenges_yz(A, S)
 
         # === Step 6: Polynomial vectors l(x), r(x) ===
         z_vec = [z for _ in range(n)]
@@ -559,8 +657,7 @@ class BulletproofProverProduction:
         t2 = self._inner_product(l1, r1)
 
         # === Step 8: Commitments T1, T2 ===
-        tau_1 = self._random_scalar()
-        tau_2 = self._random_scalar()
+        tau_1, tau_2 = rand.take(2)
 
         T1 = t1 * self.g + tau_1 * self.h
         T2 = t2 * self.g + tau_2 * self.h
@@ -595,7 +692,7 @@ class BulletproofProverProduction:
         check_2_main_equation = (left == right)
 
         # === Step 11: Inner Product Proof ===
-        inner_product_proof = self._generate_inner_product_proof(l_vec, r_vec, self.g_vec, self.h_vec, y, x)
+        inner_product_proof = self._generate_inner_product_proof(l_vec, r_vec, self.g_vec, self.h_vec, y, x, rand)
 
         # === 로컬 검증 3: L[], R[] 포인트 인코딩 검증 ===
         lr_encoding_checks = []
@@ -755,9 +852,20 @@ class BulletproofProverProduction:
         return proof_data
 
 
+_PROVERS: Dict[Tuple[int, str], BulletproofProverProduction] = {}
+
+
+def get_prover(n: int = 32, domain: str = "ICS_BULLETPROOF_VERIFIER_v1") -> BulletproofProverProduction:
+    """(n, domain)별로 재사용하는 prover (generator를 증명마다 다시 만들지 않음)"""
+    prover = _PROVERS.get((n, domain))
+    if prover is None:
+        prover = _PROVERS.setdefault((n, domain), BulletproofProverProduction(bit_length=n, domain=domain))
+    return prover
+
+
 def generate_range_proof(value_int: int, nonce: str, n: int = 32,
                         domain: str = "ICS_BULLETPROOF_VERIFIER_v1",
-                        mode: str = "production") -> Dict[str, Any]:
+                        mode: str = "production", seed: Optional[bytes] = None) -> Dict[str, Any]:
     """
     Range proof 생성 (호환성 함수)
 
@@ -767,13 +875,13 @@ def generate_range_proof(value_int: int, nonce: str, n: int = 32,
         n: 비트 길이
         domain: 도메인 태그
         mode: "production" (수학적으로 완전) or "dev" (구조적만)
+        seed: blinding 난수 seed (production 전용, 재현 가능한 벤치마크/test vector용)
 
     Returns:
         proof 데이터
     """
     if mode == "production":
-        prover = BulletproofProverProduction(bit_length=n, domain=domain)
-        return prover.generate_range_proof(value_int, nonce)
+        return get_prover(n, domain).generate_range_proof(value_int, nonce, seed=seed)
     else:
         # Development mode는 기존 prover 사용
         from crypto.bulletproof_prover_petlib import BulletproofProverPetlib
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bulletproof Range Proof Verifier - Local Stand-in
+
+외부 검증 서버(ics-server-verifier)를 대신해 로컬 end-to-end 벤치마크에 쓰는 검증기.
+bulletproof_prover_production.py와 동일한 generator, Fiat-Shamir 규칙, delta를 사용합니다.
+
+검증 항목:
+- 포인트 인코딩 (V, A, S, T1, T2, L[], R[])과 스칼라 형식
+- Main equation: t·G + tau_x·H == z²·V + delta(y,z)·G + x·T1 + x²·T2
+- Inner product proof 구조 (L/R 라운드 수 == log2(n))
+  version 2 (IPA cutoff k): a, b가 길이 k 벡터, L/R 라운드 수 == log2(n/k)
+- window 모드: COMMIT_ONLY commitment 인코딩, ZK_AGGREGATE의 Σ commitment == 합계 commitment
+
+제한:
+- 현재 prover의 L/R에는 랜덤 blinding(dL·H, dR·H)이 섞이고 cL·u 항이 없으므로
+  inner product argument 자체는 완전 검증할 수 없습니다. 구조만 확인합니다.
+
+Batch 검증:
+- 무작위 128-bit 가중치 r_i로 main equation을 선형 결합해 한 번의 multi-scalar
+  multiplication(EcGroup.wsum)으로 확인하고, 실패하면 개별 검증으로 원인 증명을 찾습니다.
+"""
+
+import secrets
+from typing import Dict, List, Optional, Tuple
+
+from petlib.ec import EcPt
+from petlib.bn import Bn
+
+from crypto.bulletproof_prover_production import BulletproofProverProduction
+from crypto.range_proof import IPA_CUTOFF_VERSION
+
+
+# (ok, 실패 사유)
+VerifyResult = Tuple[bool, Optional[str]]
+
+
+class BulletproofVerifier:
+    """Production prover와 호환되는 로컬 Bulletproof 검증기"""
+
+    def __init__(self, bit_length: int = 32, domain: str = "ICS_BULLETPROOF_VERIFIER_v1"):
+        """
+        Args:
+            bit_length: 비트 길이 (기본: 32)
+            domain: Fiat-Shamir 도메인 분리 태그
+        """
+        # generator / challenge / delta 계산을 prover와 공유 (서버와 동일한 파라미터)
+        # 검증에는 H만 필요하므로 generator 파일 대신 직접 계산 (파일 변조가 검증 결과에 영향 없음)
+        self.params = BulletproofProverProduction(bit_length=bit_length, domain=domain, use_store=False)
+        self.bit_length = bit_length
+        self.group = self.params.group
+        self.order = self.params.order
+        self.g = self.params.g
+        self.h = self.params.h
+        self.ipa_rounds = bit_length.bit_length() - 1
+
+    # ------------------------------------------------------------------
+    # 파싱
+    # ------------------------------------------------------------------
+
+    def _point(self, hex_str: str, name: str) -> EcPt:
+        try:
+            return EcPt.from_binary(bytes.fromhex(hex_str), self.group)
+        except Exception:
+            raise ValueError(f"invalid point encoding: {name}")
+
+    def _scalar(self, hex_str: str, name: str) -> Bn:
+        try:
+            value = Bn.from_hex(hex_str)
+        except Exception:
+            raise ValueError(f"invalid scalar encoding: {name}")
+        if value < 0 or value >= self.order:
+            raise ValueError(f"scalar out of range: {name}")
+        return value
+
+    def _ipa_rounds(self, ipp: Dict) -> int:
+        """최종 a, b 확인 -> 기대 L/R 라운드 수 (version 1: log2(n), version 2: log2(n/k))"""
+        version = ipp.get("version", 1)
+        if version == 1:
+            self._scalar(ipp.get("a", ""), "a")
+            self._scalar(ipp.get("b", ""), "b")
+            return self.ipa_rounds
+        if version != IPA_CUTOFF_VERSION:
+            raise ValueError(f"unsupported inner product proof version {version}")
+        a, b = ipp.get("a"), ipp.get("b")
+        if not isinstance(a, list) or not isinstance(b, list) or len(a) != len(b):
+            raise ValueError("inner product proof a, b must be lists of equal length")
+        k = len(a)
+        if k < 1 or k > self.bit_length or k & (k - 1):
+            raise ValueError(f"IPA cutoff must be a power of two in [1, {self.bit_length}], got {k}")
+        for i, (a_hex, b_hex) in enumerate(zip(a, b)):
+            self._scalar(a_hex, f"a[{i}]")
+            self._scalar(b_hex, f"b[{i}]")
+        return self.ipa_rounds - (k.bit_length() - 1)
+
+    def prepare(self, commitment: str, proof: Dict) -> Dict:
+        """
+        증명 파싱 + challenge 재계산 -> main equation 항목
+
+        Raises:
+            ValueError: 형식 오류 (사유 메시지 포함)
+        """
+        if not isinstance(proof, dict):
+            raise ValueError("proof must be an object")
+        missing = [k for k in ("A", "S", "T1", "T2", "tau_x", "mu", "t", "inner_product_proof") if k not in proof]
+        if missing:
+            raise ValueError(f"missing proof fields: {missing}")
+
+        V = self._point(commitment, "commitment")
+        A = self._point(proof["A"], "A")
+        S = self._point(proof["S"], "S")
+        T1 = self._point(proof["T1"], "T1")
+        T2 = self._point(proof["T2"], "T2")
+        tau_x = self._scalar(proof["tau_x"], "tau_x")
+        self._scalar(proof["mu"], "mu")
+        t_hat = self._scalar(proof["t"], "t")
+
+        ipp = proof["inner_product_proof"]
+        if not isinstance(ipp, dict):
+            raise ValueError("inner_product_proof must be an object")
+        L, R = ipp.get("L", []), ipp.get("R", [])
+        rounds = self._ipa_rounds(ipp)
+        if len(L) != rounds or len(R) != rounds:
+            raise ValueError(f"inner product proof must have {rounds} L/R rounds")
+        for i, (l_hex, r_hex) in enumerate(zip(L, R)):
+            self._point(l_hex, f"L[{i}]")
+            self._point(r_hex, f"R[{i}]")
+
+        y, z = self.params._challenges_yz(A, S)
+        x = self.params._fiat_shamir_challenge(T1, T2, z)
+        return {"V": V, "T1": T1, "T2": T2, "tau_x": tau_x, "t": t_hat,
+                "z2": (z * z) % self.order, "x": x, "x2": (x * x) % self.order,
+                "delta": self.params._compute_delta(y, z)}
+
+    def check_commitment(self, commitment: str) -> VerifyResult:
+        """COMMIT_ONLY 항목: commitment 인코딩만 확인 (범위는 window 합계 증명에서)"""
+        try:
+            self._point(commitment, "commitment")
+        except ValueError as e:
+            return False, str(e)
+        return True, None
+
+    def check_commitment_sum(self, commitment: str, commitments: List[str]) -> VerifyResult:
+        """ZK_AGGREGATE 항목: 측정값별 commitment의 합 == 증명된 합계 commitment"""
+        if not isinstance(commitments, list) or not commitments:
+            return False, "commitments must be a non-empty list"
+        try:
+            total = self._point(commitment, "commitment")
+            points = [self._point(c, f"commitments[{i}]") for i, c in enumerate(commitments)]
+        except (ValueError, TypeError) as e:
+            return False, str(e)
+        if self.group.wsum([Bn(1)] * len(points), points) != total:
+            return False, "sum of commitments does not match aggregate commitment"
+        return True, None
+
+    # ------------------------------------------------------------------
+    # 검증
+    # ------------------------------------------------------------------
+
+    def _equation_terms(self, p: Dict, weight: Bn) -> Tuple[Bn, Bn, List[Bn], List[EcPt]]:
+        """
+        weight · (t·G + tau_x·H - z²·V - delta·G - x·T1 - x²·T2) 의 G/H 계수와 나머지 항
+        """
+        o = self.order
+        g_coeff = (weight * (p["t"] - p["delta"])) % o
+        h_coeff = (weight * p["tau_x"]) % o
+        weights = [(-weight * p["z2"]) % o, (-weight * p["x"]) % o, (-weight * p["x2"]) % o]
+        return g_coeff, h_coeff, weights, [p["V"], p["T1"], p["T2"]]
+
+    def _check(self, prepared: List[Dict], weights: List[Bn]) -> bool:
+        g_total, h_total = Bn(0), Bn(0)
+        scalars: List[Bn] = []
+        points: List[EcPt] = []
+        for p, w in zip(prepared, weights):
+            g_coeff, h_coeff, term_weights, term_points = self._equation_terms(p, w)
+            g_total = (g_total + g_coeff) % self.order
+            h_total = (h_total + h_coeff) % self.order
+            scalars.extend(term_weights)
+            points.extend(term_points)
+        scalars.extend([g_total, h_total])
+        points.extend([self.g, self.h])
+        return self.group.wsum(scalars, points).is_infinite()
+
+    def verify(self, commitment: str, proof: Dict) -> VerifyResult:
+        """증명 하나 검증"""
+        try:
+            prepared = self.prepare(commitment, proof)
+        except ValueError as e:
+            return False, str(e)
+        if not self._check([prepared], [Bn(1)]):
+            return False, "main equation check failed"
+        return True, None
+
+    def check_batch(self, prepared: List[Dict]) -> List[bool]:
+        """prepare()된 증명들의 main equation을 무작위 선형 결합으로 한 번에 확인"""
+        if not prepared:
+            return []
+        weights = [Bn.from_binary(secrets.token_bytes(16)) for _ in prepared]
+        if self._check(prepared, weights):
+            return [True] * len(prepared)
+        # 결합 검증 실패: 개별 검증으로 실패한 증명 식별
+        return [self._check([p], [Bn(1)]) for p in prepared]
+
+    def verify_batch(self, items: List[Tuple[str, Dict]]) -> List[VerifyResult]:
+        """
+        증명 여러 개를 한 번의 multi-scalar multiplication으로 검증
+
+        Args:
+            items: (commitment, proof) 목록
+
+        Returns:
+            items와 같은 순서의 (ok, 실패 사유) 목록
+        """
+        results: List[VerifyResult] = [(False, None)] * len(items)
+        prepared, indices = [], []
+        for i, (commitment, proof) in enumerate(items):
+            try:
+                prepared.append(self.prepare(commitment, proof))
+                indices.append(i)
+            except ValueError as e:
+                results[i] = (False, str(e))
+
+        for i, ok in zip(indices, self.check_batch(prepared)):
+            results[i] = (True, None) if ok else (False, "main equation check failed")
+        return results
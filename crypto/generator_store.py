@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+On-disk Generator Store
+
+BulletproofProverProduction / BulletproofVerifier를 쓰는 모든 프로세스는 같은
+generator(H, G_vec, H_vec)를 hash + scalar multiplication 2n+1번(n=32에서 ~70ms)으로
+다시 만듭니다. 클라이언트 수십 개와 worker pool에서 같은 계산이 반복되므로 한 번
+만든 결과를 버전이 붙은 파일로 공유합니다.
+
+파일 형식:
+    MAGIC(8) | u32 header 길이 | header JSON | payload
+    - header: key(PROTOCOL_VERSION, GENERATOR_SCHEME, curve, bit_length, domain,
+      STORE_FORMAT_VERSION), section 목록 [(이름, 포인트 수)], payload SHA-256
+    - payload: section 순서대로 비압축(65바이트) SEC1 포인트
+      (압축 포인트는 로드 시 제곱근 계산으로 ~7배 느림)
+
+로드:
+- mmap으로 열어 key와 SHA-256을 확인한 뒤 포인트를 파싱 (65개 ~0.5ms)
+- 파일이 없거나 key/버전/checksum이 다르면 다시 생성해 임시 파일 + os.replace로
+  원자적으로 교체 (동시에 생성하는 프로세스가 있어도 내용이 같으므로 안전)
+- 디렉터리에 쓸 수 없으면 메모리에서만 생성
+
+위치는 ICS_GENERATOR_STORE 환경 변수(디렉터리, "off"면 사용 안 함)로 바꿀 수
+있으며 기본값은 ~/.cache/ics-bulletproof 입니다.
+
+Usage:
+    python3 -m crypto.generator_store --bits 32          # 배포 시 미리 생성
+    python3 -m crypto.generator_store --bits 32 --verify # 저장된 값을 다시 계산해 비교
+"""
+
+import os
+import json
+import mmap
+import struct
+import hashlib
+import tempfile
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from petlib.ec import EcGroup, EcPt
+
+
+STORE_FORMAT_VERSION = 1
+MAGIC = b"ICSGENS\x00"
+HEADER_LEN = struct.Struct('<I')
+POINT_FORM_UNCOMPRESSED = 4
+STORE_ENV = "ICS_GENERATOR_STORE"
+DISABLED_VALUES = ("", "0", "off", "none", "false")
+
+# section 이름 -> 포인트 목록
+Sections = Dict[str, List[EcPt]]
+
+
+def default_store_dir() -> Optional[str]:
+    """ICS_GENERATOR_STORE 또는 ~/.cache/ics-bulletproof (비활성화 시 None)"""
+    configured = os.environ.get(STORE_ENV)
+    if configured is not None:
+        return None if configured.strip().lower() in DISABLED_VALUES else configured
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "ics-bulletproof")
+
+
+class GeneratorStore:
+    """버전/checksum으로 검증하는 generator 파일 저장소"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.last_status: Optional[str] = None   # "loaded", "built", "memory"
+        self.last_reason: Optional[str] = None   # 다시 생성한 이유
+
+    def path_for(self, key: Dict) -> str:
+        """key별 파일 경로 (사람이 읽을 수 있는 접두어 + key digest)"""
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.directory, f"{key['scheme']}-n{key['bit_length']}-{digest}.gens")
+
+    # ------------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------------
+
+    def load(self, key: Dict, group: EcGroup) -> Optional[Sections]:
+        """저장된 generator 로드 (없거나 key/checksum이 다르면 None, 사유는 last_reason)"""
+        path = self.path_for(key)
+        try:
+            with open(path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return self._parse(data, key, group)
+        except FileNotFoundError:
+            self.last_reason = "missing"
+        except (OSError, ValueError) as e:
+            self.last_reason = f"unreadable: {e}"
+        return None
+
+    def _parse(self, data: mmap.mmap, key: Dict, group: EcGroup) -> Optional[Sections]:
+        prefix = len(MAGIC) + HEADER_LEN.size
+        if len(data) < prefix or data[:len(MAGIC)] != MAGIC:
+            self.last_reason = "bad magic"
+            return None
+        (header_len,) = HEADER_LEN.unpack_from(data, len(MAGIC))
+        header = json.loads(data[prefix:prefix + header_len])
+        if header.get("key") != key:
+            self.last_reason = "key mismatch"
+            return None
+
+        start = prefix + header_len
+        point_size = header["point_size"]
+        expected_end = start + point_size * sum(count for _, count in header["sections"])
+        if len(data) != expected_end:
+            self.last_reason = "size mismatch"
+            return None
+        with memoryview(data) as view:
+            payload_digest = hashlib.sha256(view[start:]).hexdigest()
+        if payload_digest != header["sha256"]:
+            self.last_reason = "checksum mismatch"
+            return None
+
+        sections: Sections = {}
+        offset = start
+        for name, count in header["sections"]:
+            points = []
+            for _ in range(count):
+                points.append(EcPt.from_binary(data[offset:offset + point_size], group))
+                offset += point_size
+            sections[name] = points
+        return sections
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+
+    def save(self, key: Dict, sections: Sections) -> str:
+        """generator 파일을 원자적으로 기록 -> 경로"""
+        payload = b''.join(pt.export(POINT_FORM_UNCOMPRESSED) for points in sections.values() for pt in points)
+        point_size = len(next(iter(sections.values()))[0].export(POINT_FORM_UNCOMPRESSED))
+        header = json.dumps({
+            "key": key,
+            "point_size": point_size,
+            "sections": [[name, len(points)] for name, points in sections.items()],
+            "sha256": hashlib.sha256(payload).hexdigest()
+        }, sort_keys=True).encode('utf-8')
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".gens-")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(MAGIC + HEADER_LEN.pack(len(header)) + header + payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        return path
+
+    def load_or_build(self, key: Dict, group: EcGroup, build: Callable[[], Sections]) -> Sections:
+        """저장된 generator를 로드하고, 없거나 맞지 않으면 build()로 다시 생성해 저장"""
+        sections = self.load(key, group)
+        if sections is not None:
+            self.last_status = "loaded"
+            self.last_reason = None
+            return sections
+        sections = build()
+        try:
+            self.save(key, sections)
+            self.last_status = "built"
+        except OSError as e:
+            self.last_status = "memory"
+            self.last_reason = f"{self.last_reason}; not saved: {e}"
+        return sections
+
+
+def store_key(protocol: str, scheme: str, curve_nid: int, bit_length: int, domain: str) -> Dict:
+    """generator 파일 key (어느 항목이든 바뀌면 다른 파일 / 재생성)"""
+    return {
+        "format": STORE_FORMAT_VERSION,
+        "protocol": protocol,
+        "scheme": scheme,
+        "curve_nid": curve_nid,
+        "bit_length": bit_length,
+        "domain": domain
+    }
+
+
+def _sections_equal(a: Sections, b: Sections, names: Sequence[str]) -> List[Tuple[str, int]]:
+    """다른 포인트 (section, index) 목록"""
+    diffs = []
+    for name in names:
+        for i, (pa, pb) in enumerate(zip(a[name], b[name])):
+            if pa != pb:
+                diffs.append((name, i))
+        if len(a[name]) != len(b[name]):
+            diffs.append((name, -1))
+    return diffs
+
+
+def main():
+    import argparse
+    import time
+
+    from crypto.bulletproof_prover_production import BulletproofProverProduction
+
+    parser = argparse.ArgumentParser(description="Build or verify the on-disk Bulletproof generator store")
+    parser.add_argument("--bits", type=int, nargs="+", default=[32], help="Bit lengths to build (default: 32)")
+    parser.add_argument("--domain", default="ICS_BULLETPROOF_VERIFIER_v1", help="Fiat-Shamir domain tag")
+    parser.add_argument("--dir", default=None, help=f"Store directory (default: ${STORE_ENV} or ~/.cache/ics-bulletproof)")
+    parser.add_argument("--verify", action="store_true", help="Recompute the generators and compare with the stored file")
+    args = parser.parse_args()
+
+    directory = args.dir or default_store_dir()
+    if directory is None:
+        parser.error(f"generator store disabled by {STORE_ENV}; pass --dir")
+
+    for bits in args.bits:
+        start = time.perf_counter()
+        prover = BulletproofProverProduction(bit_length=bits, domain=args.domain, store_dir=directory)
+        prover.h
+        status = prover.generator_store.last_status
+        print(f"[STORE] n={bits} {status} in {(time.perf_counter() - start) * 1000:.1f}ms: "
+              f"{prover.generator_store.path_for(prover.generator_key)}")
+        if args.verify:
+            computed = prover._build_generators()
+            stored = {"H": [prover.h], "G_vec": prover.g_vec, "H_vec": prover.h_vec}
+            diffs = _sections_equal(stored, computed, ("H", "G_vec", "H_vec"))
+            print(f"[VERIFY] n={bits} {'OK' if not diffs else f'MISMATCH {diffs[:5]}'}")
+            if diffs:
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
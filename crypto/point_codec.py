@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch Point Normalization / Export
+
+덧셈으로 만든 EC 포인트(V, A, S, T1, T2, L, R)는 Jacobian 좌표로 남아 있어
+export()마다 affine 좌표를 구하려고 field inversion을 한 번씩 합니다
+(secp256k1에서 포인트당 ~25us, 이미 affine이면 ~4us).
+
+- normalize_points: OpenSSL EC_POINTs_make_affine으로 여러 포인트를 inversion
+  한 번(Montgomery trick)에 affine으로 변환 (포인트 값은 같고 표현만 바뀜)
+- export_points: 정규화 후 미리 할당한 버퍼 하나에 연속으로 직렬화해 포인트별
+  bytes를 반환 (transcript에 그대로 흡수하고 hex로 출력)
+
+Fiat-Shamir 챌린지가 이전 단계 포인트에 의존하므로 prover는 동시에 존재하는
+포인트끼리 묶습니다 (V/A/S, T1/T2, 라운드별 L/R). 출력은 export()와 바이트 단위로
+같습니다.
+
+Usage:
+    V_bytes, A_bytes, S_bytes = export_points(group, [V, A, S])
+    L_bytes, R_bytes = export_points(group, [L, R])
+"""
+
+from typing import List, Sequence
+
+from petlib.ec import EcGroup, EcPt, get_ctx
+from petlib.bindings import _C, _FFI
+
+
+POINT_FORM_COMPRESSED = 2
+
+
+def normalize_points(group: EcGroup, points: Sequence[EcPt]) -> None:
+    """포인트들을 한 번의 공유 inversion으로 affine 좌표로 변환 (in place)"""
+    # 무한원점은 affine 표현이 없어 make_affine이 실패하므로 제외
+    finite = [pt.pt for pt in points if not pt.is_infinite()]
+    if len(finite) < 2:
+        return  # 하나뿐이면 export()의 inversion과 같음
+    array = _FFI.new("EC_POINT *[]", finite)
+    if not _C.EC_POINTs_make_affine(group.ecg, len(finite), array, get_ctx().bnctx):
+        raise ValueError("EC_POINTs_make_affine failed")
+
+
+def export_points(group: EcGroup, points: Sequence[EcPt],
+                  form: int = POINT_FORM_COMPRESSED) -> List[bytes]:
+    """정규화 후 버퍼 하나에 직렬화 -> 포인트별 bytes (pt.export(form)와 동일)"""
+    normalize_points(group, points)
+    bnctx = get_ctx().bnctx
+    # buf=NULL이면 좌표 계산 없이 인코딩 길이만 반환
+    sizes = [_C.EC_POINT_point2oct(group.ecg, pt.pt, form, _FFI.NULL, 0, bnctx) for pt in points]
+    buf = _FFI.new("unsigned char[]", sum(sizes))
+    offset = 0
+    for pt, size in zip(points, sizes):
+        if _C.EC_POINT_point2oct(group.ecg, pt.pt, form, buf + offset, size, bnctx) != size:
+            raise ValueError("EC_POINT_point2oct failed")
+        offset += size
+    data = bytes(_FFI.buffer(buf))
+    out = []
+    offset = 0
+    for size in sizes:
+        out.append(data[offset:offset + size])
+        offset += size
+    return out
+
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Per-proof Randomness Engine
+
+증명 하나에 필요한 blinding 스칼라(gamma, alpha, rho, tau_1, tau_2, sL/sR 2n개,
+IPA 라운드마다 dL/dR)는 n=32에서 79개입니다. 스칼라마다 secrets.token_bytes(32)
+(OS 난수 syscall)를 부르는 대신 OS 난수 32바이트 seed 하나를 SHAKE-256 XOF로
+확장해 필요한 스칼라를 한 번에 만듭니다.
+
+- i번째 스칼라 = SHAKE-256(TAG || seed) 출력의 [48i, 48i+48) 구간 mod order
+  (order보다 128비트 긴 입력이라 mod bias는 2^-128 이하)
+- 예상 개수를 생성 시 한 번에 squeeze하고, 더 필요하면 더 길게 squeeze해 이어 붙임
+  (출력은 미리 만든 개수와 무관하게 seed로만 결정)
+- seed를 주입하면 결정적 출력 -> 재현 가능한 벤치마크와 test vector 전용.
+  같은 seed로 두 증명을 만들면 blinding이 재사용되어 값이 노출되므로 운영에서는
+  절대 seed를 지정하지 않습니다.
+
+Usage:
+    rand = ProofRandomness(order, count=79)
+    gamma, alpha = rand.take(2)
+    sL = rand.take(32)
+"""
+
+import secrets
+import hashlib
+from typing import List, Optional
+
+from petlib.bn import Bn
+
+
+RANDOMNESS_TAG = b"ICS-BULLETPROOF-V1/proof-randomness"
+SEED_BYTES = 32
+SCALAR_BYTES = 48
+
+
+def proof_scalar_count(bit_length: int) -> int:
+    """증명 하나의 blinding 스칼라 수: gamma, alpha, rho, tau_1, tau_2 + sL/sR + IPA dL/dR"""
+    return 5 + 2 * bit_length + 2 * (bit_length.bit_length() - 1)
+
+
+class ProofRandomness:
+    """OS seed 하나를 XOF로 확장하는 스칼라 스트림"""
+
+    def __init__(self, order: Bn, count: int = 0, seed: Optional[bytes] = None):
+        """
+        Args:
+            order: 스칼라 modulus (곡선 order)
+            count: 한 번에 미리 만들 스칼라 수 (부족하면 추가 생성)
+            seed: 결정적 seed (테스트/벤치마크 전용; None이면 OS 난수)
+        """
+        self.order = order
+        self._order_int = int(order)
+        self.seed = secrets.token_bytes(SEED_BYTES) if seed is None else bytes(seed)
+        self._xof = hashlib.shake_256(RANDOMNESS_TAG + self.seed)
+        self._produced = 0  # 지금까지 만든 스칼라 수 (XOF 출력 위치)
+        self._buffer: List[Bn] = []
+        self._pos = 0
+        if count > 0:
+            self._refill(count)
+
+    def _refill(self, count: int):
+        # digest(n)은 상태를 소비하지 않으므로 더 길게 squeeze한 뒤 새 구간만 사용
+        start = self._produced * SCALAR_BYTES
+        stream = self._xof.digest(start + count * SCALAR_BYTES)[start:]
+        self._produced += count
+        # mod 연산은 Python int로 (Bn % Bn보다 빠름), 결과만 32바이트로 Bn 변환
+        order = self._order_int
+        self._buffer = [Bn.from_binary((int.from_bytes(stream[i:i + SCALAR_BYTES], 'big') % order).to_bytes(32, 'big'))
+                        for i in range(0, len(stream), SCALAR_BYTES)]
+        self._pos = 0
+
+    def take(self, k: int) -> List[Bn]:
+        """다음 스칼라 k개"""
+        if self._pos + k > len(self._buffer):
+            rest = self._buffer[self._pos:]
+            self._refill(max(k - len(rest), 16))
+            self._buffer = rest + self._buffer
+        scalars = self._buffer[self._pos:self._pos + k]
+        self._pos += k
+        return scalars
+
+    def scalar(self) -> Bn:
+        """다음 스칼라 하나"""
+        return self.take(1)[0]
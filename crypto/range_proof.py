@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RangeProof Result Object
+
+generate_range_proof()는 대문자 hex 문자열 ~20개로 된 중첩 dict를 즉시 만듭니다.
+binary만 필요하거나 worker pool에서 부모 프로세스로 넘기기만 하는 경우에도 모든
+필드를 포맷하므로, prover.prove()는 __slots__ 기반 RangeProof를 반환하고 필요한
+형식만 처음 요청될 때 만들어 캐시합니다.
+
+보관 형식:
+- 포인트(V, A, S, T1, T2, L[], R[]): 압축 SEC1 bytes (Fiat-Shamir transcript를 위해
+  prover가 이미 직렬화한 값; point_codec 참고)
+- 스칼라(tau_x, mu, t, gamma): Bn
+- IPA 최종 벡터(a, b): Bn tuple, 길이 = IPA cutoff k (기본 1)
+
+View (처음 호출 시 계산 후 캐시, 반환값은 수정하지 말 것):
+- to_json_dict(): 기존 generate_range_proof() dict와 동일
+  {commitment, proof{A, S, T1, T2, tau_x, mu, t, inner_product_proof}, blinding_factor, timing}
+- to_binary(): 고정 폭 binary (blinding_factor, timing 제외)
+    u8 version | u8 bit_length | u8 rounds
+    | V A S T1 T2 (33바이트씩) | tau_x mu t (32바이트씩) | (L_i R_i) * rounds | a[k] b[k]
+  version 1: k = 1 (기존 형식), version 2: k = bit_length >> rounds
+
+IPA cutoff (prove(ipa_cutoff=k), 기본 k=1 = 기존 wire 형식):
+길이가 k가 되면 라운드를 멈추고 남은 a, b 벡터를 그대로 보냅니다 (라운드당 L/R 66바이트
+대신 스칼라 2k개). k > 1이면 inner_product_proof에 "version": 2가 붙고 a, b가 hex 목록이
+되므로, 이 형식을 아는 검증기(local_verifier_server.py)에만 사용합니다.
+- challenges(): 요청의 challenges 필드 {y, z, x} (클라이언트 규칙, hex 재파싱 없음)
+
+pickle은 to_binary() + gamma + timing + domain만 전달합니다 (hex dict의 ~절반 크기).
+
+Usage:
+    result = prover.prove(value, nonce)
+    request["proof"] = result.to_json_dict()["proof"]
+    request["challenges"] = result.challenges()
+"""
+
+import struct
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+from petlib.bn import Bn
+
+from crypto.transcript import Transcript, challenges_from_points
+
+
+BINARY_VERSION = 1
+# IPA cutoff: a, b가 벡터 (JSON inner_product_proof.version, binary version 공통)
+IPA_CUTOFF_VERSION = 2
+BINARY_HEADER = struct.Struct('>BBB')
+POINT_BYTES = 33
+SCALAR_BYTES = 32
+
+# (domain, bit_length) -> prefix를 흡수한 transcript (fork만 하므로 공유 가능)
+_TRANSCRIPTS: Dict[Tuple[str, int], Transcript] = {}
+
+
+def _base_transcript(domain: str, bit_length: int) -> Transcript:
+    transcript = _TRANSCRIPTS.get((domain, bit_length))
+    if transcript is None:
+        transcript = _TRANSCRIPTS.setdefault((domain, bit_length), Transcript(domain, bit_length))
+    return transcript
+
+
+def _scalar_hex(value: Bn) -> str:
+    return value.hex().upper().zfill(64)
+
+
+def _scalar_bytes(value: Bn) -> bytes:
+    # Bn.binary()보다 hex 경유가 ~3배 빠름
+    return bytes.fromhex(value.hex().zfill(2 * SCALAR_BYTES))
+
+
+class RangeProof:
+    """Bulletproof range proof 결과 (포인트 encoding + Bn 스칼라, 직렬화는 지연)"""
+
+    __slots__ = ("bit_length", "domain", "V", "A", "S", "T1", "T2", "L", "R",
+                 "tau_x", "mu", "t", "a", "b", "gamma", "proof_time_ms",
+                 "_json", "_binary", "_challenges")
+
+    def __init__(self, bit_length: int, domain: str,
+                 V: bytes, A: bytes, S: bytes, T1: bytes, T2: bytes,
+                 L: Sequence[bytes], R: Sequence[bytes],
+                 tau_x: Bn, mu: Bn, t: Bn, a: Union[Bn, Sequence[Bn]], b: Union[Bn, Sequence[Bn]],
+                 gamma: Optional[Bn] = None, proof_time_ms: float = 0.0):
+        self.bit_length = bit_length
+        self.domain = domain
+        self.V, self.A, self.S, self.T1, self.T2 = V, A, S, T1, T2
+        self.L: Tuple[bytes, ...] = tuple(L)
+        self.R: Tuple[bytes, ...] = tuple(R)
+        self.tau_x, self.mu, self.t = tau_x, mu, t
+        self.a: Tuple[Bn, ...] = (a,) if isinstance(a, Bn) else tuple(a)
+        self.b: Tuple[Bn, ...] = (b,) if isinstance(b, Bn) else tuple(b)
+        self.gamma = gamma
+        self.proof_time_ms = proof_time_ms
+        self._json: Optional[Dict[str, Any]] = None
+        self._binary: Optional[bytes] = None
+        self._challenges: Optional[Dict[str, str]] = None
+
+    @property
+    def ipa_cutoff(self) -> int:
+        """IPA를 멈춘 벡터 길이 k (1이면 기존 형식)"""
+        return len(self.a)
+
+    @property
+    def version(self) -> int:
+        """wire/binary 형식 버전 (1: 기존, 2: IPA cutoff)"""
+        return BINARY_VERSION if self.ipa_cutoff == 1 else IPA_CUTOFF_VERSION
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    def to_json_dict(self) -> Dict[str, Any]:
+        """기존 generate_range_proof() 반환 dict (대문자 hex)"""
+        if self._json is None:
+            points = b''.join((self.V, self.A, self.S, self.T1, self.T2) + self.L + self.R).hex().upper()
+            hexes = [points[i:i + 2 * POINT_BYTES] for i in range(0, len(points), 2 * POINT_BYTES)]
+            rounds = len(self.L)
+            inner_product_proof = {"L": hexes[5:5 + rounds], "R": hexes[5 + rounds:]}
+            if self.ipa_cutoff == 1:
+                inner_product_proof["a"] = _scalar_hex(self.a[0])
+                inner_product_proof["b"] = _scalar_hex(self.b[0])
+            else:
+                inner_product_proof = {"version": IPA_CUTOFF_VERSION, **inner_product_proof,
+                                       "a": [_scalar_hex(v) for v in self.a],
+                                       "b": [_scalar_hex(v) for v in self.b]}
+            self._json = {
+                "commitment": hexes[0],
+                "proof": {
+                    "A": hexes[1],
+                    "S": hexes[2],
+                    "T1": hexes[3],
+                    "T2": hexes[4],
+                    "tau_x": _scalar_hex(self.tau_x),
+                    "mu": _scalar_hex(self.mu),
+                    "t": _scalar_hex(self.t),
+                    "inner_product_proof": inner_product_proof
+                },
+                "blinding_factor": _scalar_hex(self.gamma) if self.gamma is not None else None,
+                "timing": {
+                    "proof_generation_ms": self.proof_time_ms
+                }
+            }
+        return self._json
+
+    def to_binary(self) -> bytes:
+        """고정 폭 binary encoding (증명 본문만)"""
+        if self._binary is None:
+            parts = [BINARY_HEADER.pack(self.version, self.bit_length, len(self.L)),
+                     self.V, self.A, self.S, self.T1, self.T2,
+                     _scalar_bytes(self.tau_x), _scalar_bytes(self.mu), _scalar_bytes(self.t)]
+            for L, R in zip(self.L, self.R):
+                parts.append(L)
+                parts.append(R)
+            parts.extend(_scalar_bytes(v) for v in self.a + self.b)
+            self._binary = b''.join(parts)
+        return self._binary
+
+    def challenges(self) -> Dict[str, str]:
+        """요청 challenges 필드 {y, z, x} (대문자 hex)"""
+        if self._challenges is None:
+            self._challenges = challenges_from_points(_base_transcript(self.domain, self.bit_length),
+                                                      self.A, self.S, self.T1, self.T2)
+        return self._challenges
+
+    # ------------------------------------------------------------------
+    # Binary / pickle
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_binary(cls, data: bytes, domain: str, gamma: Optional[Bn] = None,
+                    proof_time_ms: float = 0.0) -> "RangeProof":
+        """to_binary() 역변환 (포인트는 검증하지 않음; 검증은 verifier의 몫)"""
+        if len(data) < BINARY_HEADER.size:
+            raise ValueError("range proof binary too short")
+        version, bit_length, rounds = BINARY_HEADER.unpack_from(data)
+        if version not in (BINARY_VERSION, IPA_CUTOFF_VERSION):
+            raise ValueError(f"unsupported range proof binary version {version}")
+        k = bit_length >> rounds
+        if k < 1 or k << rounds != bit_length or (k == 1) != (version == BINARY_VERSION):
+            raise ValueError(f"{rounds} IPA rounds do not match bit length {bit_length} for version {version}")
+        expected = BINARY_HEADER.size + (5 + 2 * rounds) * POINT_BYTES + (3 + 2 * k) * SCALAR_BYTES
+        if len(data) != expected:
+            raise ValueError(f"range proof binary length {len(data)} != {expected}")
+
+        offset = BINARY_HEADER.size
+        V, A, S, T1, T2 = [data[i:i + POINT_BYTES] for i in range(offset, offset + 5 * POINT_BYTES, POINT_BYTES)]
+        offset += 5 * POINT_BYTES
+        tau_x, mu, t = [Bn.from_binary(data[i:i + SCALAR_BYTES])
+                        for i in range(offset, offset + 3 * SCALAR_BYTES, SCALAR_BYTES)]
+        offset += 3 * SCALAR_BYTES
+        pairs = [data[i:i + POINT_BYTES] for i in range(offset, offset + 2 * rounds * POINT_BYTES, POINT_BYTES)]
+        offset += 2 * rounds * POINT_BYTES
+        final = [Bn.from_binary(data[i:i + SCALAR_BYTES]) for i in range(offset, len(data), SCALAR_BYTES)]
+        a, b = final[:k], final[k:]
+        proof = cls(bit_length, domain, V, A, S, T1, T2, pairs[0::2], pairs[1::2], tau_x, mu, t, a, b,
+                    gamma, proof_time_ms)
+        proof._binary = bytes(data)
+        return proof
+
+    def __reduce__(self):
+        gamma = _scalar_bytes(self.gamma) if self.gamma is not None else None
+        return (_restore, (self.to_binary(), self.domain, gamma, self.proof_time_ms))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RangeProof):
+            return NotImplemented
+        return self.domain == other.domain and self.to_binary() == other.to_binary()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"RangeProof(n={self.bit_length}, V={self.V.hex().upper()[:16]}..., rounds={len(self.L)}, "
+                f"ipa_cutoff={self.ipa_cutoff})")
+
+
+def _restore(data: bytes, domain: str, gamma: Optional[bytes], proof_time_ms: float) -> RangeProof:
+    """unpickle: binary에서 RangeProof 복원"""
+    return RangeProof.from_binary(data, domain, Bn.from_binary(gamma) if gamma is not None else None,
+                                  proof_time_ms)
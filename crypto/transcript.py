@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fiat-Shamir Transcript (incremental SHA-256)
+
+모든 챌린지는 sha256(domain || n(4바이트 big-endian) || 원소...) 입니다.
+도메인 prefix를 한 번만 흡수한 해시 상태를 두고 hash.copy()로 갈라(fork)
+챌린지를 계산하므로, 챌린지마다 prefix를 다시 해싱하지 않고 y와 z는 A, S를
+한 번만 흡수합니다. 출력은 기존 계산과 바이트 단위로 같습니다.
+
+원소 인코딩 (prover의 기존 규칙):
+- bytes: 그대로
+- EC 포인트 (export()가 있는 객체): export() (압축 SEC1)
+- Bn (binary()가 있는 객체): binary() (앞의 0 바이트 없는 big-endian)
+- 그 외: str(원소)의 UTF-8
+
+petlib를 import하지 않으므로 hex 증명만 다루는 클라이언트와 부하 생성기도 사용합니다.
+
+Usage:
+    base = Transcript("ICS_BULLETPROOF_VERIFIER_v1", 32)   # prefix 한 번 흡수
+    t = base.fork().append(A, S)
+    y = t.digest()
+    z = t.append(y).digest()                               # A, S 재해싱 없음
+"""
+
+from hashlib import sha256
+from typing import Dict, Union
+
+
+def encode_element(elem) -> bytes:
+    """transcript 원소 -> 흡수할 바이트"""
+    if isinstance(elem, (bytes, bytearray)):
+        return bytes(elem)
+    if hasattr(elem, "export"):
+        return elem.export()
+    if hasattr(elem, "binary"):
+        return elem.binary()
+    return str(elem).encode()
+
+
+class Transcript:
+    """도메인 prefix를 흡수한 SHA-256 상태 (fork로 챌린지 계산)"""
+
+    def __init__(self, domain: Union[str, bytes], bit_length: int):
+        """
+        Args:
+            domain: Fiat-Shamir 도메인 분리 태그
+            bit_length: 비트 길이 n (4바이트 big-endian으로 흡수)
+        """
+        if isinstance(domain, str):
+            domain = domain.encode('utf-8')
+        self._hasher = sha256(domain + bit_length.to_bytes(4, 'big'))
+
+    def fork(self) -> "Transcript":
+        """현재 상태의 복사본 (원본은 그대로)"""
+        child = Transcript.__new__(Transcript)
+        child._hasher = self._hasher.copy()
+        return child
+
+    def append(self, *elements) -> "Transcript":
+        """원소 흡수 (chaining을 위해 self 반환)"""
+        for elem in elements:
+            self._hasher.update(encode_element(elem))
+        return self
+
+    def digest(self) -> bytes:
+        """현재 상태의 챌린지 digest (상태는 유지되어 계속 append 가능)"""
+        return self._hasher.digest()
+
+    def hexdigest(self) -> str:
+        """대문자 hex digest (요청의 challenges 필드 형식)"""
+        return self._hasher.hexdigest().upper()
+
+    def challenge(self, *elements) -> bytes:
+        """fork + append + digest: 이 상태에 elements를 더한 챌린지 digest"""
+        return self.fork().append(*elements).digest()
+
+
+def challenges_from_points(base: Transcript, A: bytes, S: bytes, T1: bytes, T2: bytes) -> Dict[str, str]:
+    """
+    인코딩된 포인트의 y, z, x (클라이언트 교차 검증용 challenges 필드)
+
+    클라이언트 규칙은 z, x에 이전 챌린지의 32바이트 digest 전체를 흡수합니다
+    (prover는 mod order 후 Bn.binary()를 흡수하므로 digest 앞 바이트가 0이면 다름).
+    """
+    t = base.fork().append(A, S)
+    y = t.digest()
+    z = t.append(y).digest()
+    x = base.fork().append(T1, T2, z)
+    return {"y": y.hex().upper(), "z": z.hex().upper(), "x": x.hexdigest()}
+
+
+def proof_challenges(base: Transcript, proof: Dict) -> Dict[str, str]:
+    """hex 증명 dict의 y, z, x (challenges_from_points 참고)"""
+    return challenges_from_points(base, *(bytes.fromhex(proof.get(k, "")) for k in ("A", "S", "T1", "T2")))
@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HAI CSV Sensor Data Source
+
+두 클라이언트는 수십 개 컬럼, 수십만 행의 HAI CSV에서 센서 컬럼 하나만 사용합니다.
+전체 파일을 pd.read_csv로 읽으면 시작에 수 초, 프로세스당 수백 MB RSS가 들기 때문에
+요청한 컬럼만 스트리밍으로 읽습니다.
+
+StreamingCSVSource:
+- 요청한 컬럼만 읽기 (pandas usecols + chunksize, pandas가 없으면 stdlib csv 경로)
+- 백그라운드 reader가 최대 lookahead_chunks개 chunk만 미리 읽어 둠 (bounded buffer)
+- EOF에서 첫 행으로 되돌아가 반복 재생
+
+ColumnCache + ArraySource:
+- CSV를 한 번만 파싱해 숫자 컬럼별 .npy(float64) 파일로 변환
+- manifest.json은 원본 파일 SHA-256으로 캐시를 식별 (크기/mtime이 같으면 해시 재계산 생략)
+- 이후 시작 시에는 np.load(mmap_mode='r')로 매핑만 하므로 즉시 시작되고,
+  같은 호스트의 여러 클라이언트 프로세스가 OS page cache를 공유
+
+모든 소스는 next_value()(측정값 하나)와 next_values(k)(k개를 배열로 한 번에)를
+제공하므로 배치/집계 전송기는 한 번의 호출로 여러 측정값을 가져올 수 있습니다.
+
+Usage:
+    source = open_sensor_source("./HAI/HAI1.csv", "P1_PIT01")
+    value = source.next_value()
+    window = source.next_values(64)
+"""
+
+import os
+import csv
+import json
+import math
+import queue
+import shutil
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+from importlib.util import find_spec
+from typing import Dict, List, Optional
+
+# numpy/pandas import는 수백 ms가 걸리므로 (pandas만 ~0.5초) 설치 여부만 확인하고
+# 실제로 사용하는 함수 안에서 import -> 시뮬레이션/캐시 경로는 pandas를 로드하지 않음
+NUMPY_AVAILABLE = find_spec("numpy") is not None
+PANDAS_AVAILABLE = find_spec("pandas") is not None
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: manifest updates are not serialized across processes
+    fcntl = None
+
+
+CSV_ENGINES = ("auto", "pandas", "csv")
+DEFAULT_CHUNK_ROWS = 8192
+DEFAULT_LOOKAHEAD_CHUNKS = 4
+CACHE_DIR_NAME = ".hai_cache"
+CACHE_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+_EOF = object()
+
+
+def read_csv_header(csv_path: str) -> List[str]:
+    """CSV 헤더(컬럼 이름)만 읽기"""
+    with open(csv_path, newline='') as f:
+        header = next(csv.reader(f), [])
+    return [name.strip() for name in header]
+
+
+def _resolve_engine(engine: str) -> str:
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"Invalid CSV engine: {engine}. Must be one of {CSV_ENGINES}")
+    if engine == "auto":
+        return "pandas" if PANDAS_AVAILABLE else "csv"
+    if engine == "pandas" and not PANDAS_AVAILABLE:
+        raise RuntimeError("CSV engine 'pandas' requires pandas. Install with: pip3 install pandas")
+    return engine
+
+
+class StreamingCSVSource:
+    """CSV 컬럼 하나를 chunk 단위로 읽는 스트리밍 소스 (bounded lookahead)"""
+
+    def __init__(self, csv_path: str, column: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                 lookahead_chunks: int = DEFAULT_LOOKAHEAD_CHUNKS, loop: bool = True,
+                 dropna: bool = True, engine: str = "auto"):
+        """
+        Args:
+            csv_path: CSV 파일 경로
+            column: 읽을 센서 컬럼
+            chunk_rows: chunk당 행 수
+            lookahead_chunks: 미리 읽어 둘 최대 chunk 수
+            loop: True면 EOF에서 첫 행부터 반복
+            dropna: True면 빈 값/숫자가 아닌 값 건너뜀
+            engine: 'pandas', 'csv' (stdlib) 또는 'auto' (pandas 설치 시 pandas)
+        """
+        self.csv_path = csv_path
+        self.column = column
+        self.chunk_rows = chunk_rows
+        self.loop = loop
+        self.dropna = dropna
+        self.engine = _resolve_engine(engine)
+
+        self.columns = read_csv_header(csv_path)
+        if column not in self.columns:
+            raise ValueError(f"Sensor '{column}' not in CSV. Available: {self.columns[:10]}")
+
+        self.rows_read = 0
+        self.passes = 0
+
+        self._queue: queue.Queue = queue.Queue(maxsize=lookahead_chunks)
+        self._chunk: List[float] = []
+        self._pos = 0
+        self._exhausted = False
+        self._thread = threading.Thread(target=self._reader, daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # 백그라운드 reader
+    # ------------------------------------------------------------------
+
+    def _iter_chunks_pandas(self):
+        import pandas as pd
+        reader = pd.read_csv(self.csv_path, usecols=lambda name: name.strip() == self.column,
+                             chunksize=self.chunk_rows)
+        for frame in reader:
+            series = pd.to_numeric(frame.iloc[:, 0], errors="coerce")
+            if self.dropna:
+                series = series.dropna()
+            yield series.astype(float).tolist()
+
+    def _iter_chunks_csv(self):
+        index = self.columns.index(self.column)
+        with open(self.csv_path, newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            chunk = []
+            for row in reader:
+                try:
+                    value = float(row[index])
+                except (ValueError, IndexError):
+                    value = math.nan
+                if self.dropna and value != value:
+                    continue
+                chunk.append(value)
+                if len(chunk) >= self.chunk_rows:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+    def _reader(self):
+        iter_chunks = self._iter_chunks_pandas if self.engine == "pandas" else self._iter_chunks_csv
+        try:
+            while True:
+                rows_this_pass = 0
+                for chunk in iter_chunks():
+                    if chunk:
+                        rows_this_pass += len(chunk)
+                        self._queue.put(chunk)
+                self.passes += 1
+                if not self.loop:
+                    break
+                if rows_this_pass == 0:
+                    raise ValueError(f"Sensor '{self.column}' has no numeric values in {self.csv_path}")
+        except Exception as e:
+            self._queue.put(e)
+            return
+        self._queue.put(_EOF)
+
+    # ------------------------------------------------------------------
+    # 소비자 API
+    # ------------------------------------------------------------------
+
+    def _next_chunk(self) -> bool:
+        item = self._queue.get()
+        if item is _EOF:
+            self._exhausted = True
+            return False
+        if isinstance(item, Exception):
+            self._exhausted = True
+            raise RuntimeError(f"Failed to read CSV: {item}") from item
+        self._chunk = item
+        self._pos = 0
+        return True
+
+    def next_value(self) -> float:
+        """다음 측정값 (loop=True면 EOF에서 반복)"""
+        if self._pos >= len(self._chunk):
+            if self._exhausted or not self._next_chunk():
+                raise StopIteration("CSV source exhausted")
+        value = self._chunk[self._pos]
+        self._pos += 1
+        self.rows_read += 1
+        return value
+
+    def next_values(self, k: int):
+        """
+        다음 측정값 k개
+
+        Returns:
+            float64 ndarray (numpy가 없으면 list); loop=False이고 EOF면 k개보다 적을 수 있음,
+            k=0이면 빈 배열
+        """
+        values: List[float] = []
+        while len(values) < k:
+            if self._pos >= len(self._chunk):
+                if self._exhausted or not self._next_chunk():
+                    break
+            take = self._chunk[self._pos:self._pos + k - len(values)]
+            values.extend(take)
+            self._pos += len(take)
+        if not values and k > 0:
+            raise StopIteration("CSV source exhausted")
+        self.rows_read += len(values)
+        if not NUMPY_AVAILABLE:
+            return values
+        import numpy as np
+        return np.asarray(values, dtype=np.float64)
+
+    def describe(self) -> str:
+        return f"streaming column '{self.column}' (engine={self.engine}, chunk_rows={self.chunk_rows})"
+
+
+class ArraySource:
+    """
+    연속 배열(메모리 또는 mmap)에서 값을 순서대로 꺼내는 소스
+
+    next_value()는 배열 구간을 block 단위로 Python float 리스트로 변환해 두고
+    하나씩 꺼내므로 측정값당 numpy 인덱싱 비용이 없습니다. next_values(k)는
+    배열 slice로 k개를 한 번에 반환합니다.
+    """
+
+    BLOCK_ROWS = 4096
+
+    def __init__(self, values, column: str, loop: bool = True, origin: str = "memory"):
+        if len(values) == 0:
+            raise ValueError(f"Sensor '{column}' has no numeric values")
+        import numpy as np
+        # memmap 서브클래스 인덱싱 오버헤드를 피하기 위해 일반 ndarray view 사용 (복사 없음)
+        self.values = np.asarray(values)
+        self.column = column
+        self.loop = loop
+        self.origin = origin
+        self.rows_read = 0
+        self._pos = 0            # 다음에 읽을 배열 위치
+        self._block: List[float] = []
+        self._block_pos = 0
+
+    def _refill(self):
+        if self._pos >= len(self.values):
+            if not self.loop:
+                raise StopIteration("array source exhausted")
+            self._pos = 0
+        end = min(self._pos + self.BLOCK_ROWS, len(self.values))
+        self._block = self.values[self._pos:end].tolist()
+        self._block_pos = 0
+        self._pos = end
+
+    def next_value(self) -> float:
+        """다음 측정값 (loop=True면 EOF에서 반복)"""
+        if self._block_pos >= len(self._block):
+            self._refill()
+        value = self._block[self._block_pos]
+        self._block_pos += 1
+        self.rows_read += 1
+        return value
+
+    def next_values(self, k: int):
+        """다음 측정값 k개 (float64 ndarray, loop=True면 EOF를 넘어 이어 붙임, k=0이면 빈 배열)"""
+        import numpy as np
+        # next_value()용 block에 남은 값부터 소비해 순서 유지
+        pending = self._block[self._block_pos:self._block_pos + k]
+        self._block_pos += len(pending)
+        parts = [np.asarray(pending, dtype=np.float64)] if pending else []
+        needed = k - len(pending)
+        total = len(self.values)
+        while needed > 0:
+            if self._pos >= total:
+                if not self.loop:
+                    break
+                self._pos = 0
+            end = min(self._pos + needed, total)
+            parts.append(self.values[self._pos:end])
+            needed -= end - self._pos
+            self._pos = end
+        if not parts:
+            if k > 0:
+                raise StopIteration("array source exhausted")
+            return np.empty(0, dtype=np.float64)
+        batch = parts[0].copy() if len(parts) == 1 else np.concatenate(parts)
+        self.rows_read += len(batch)
+        return batch
+
+    def describe(self) -> str:
+        values = self.values
+        return (f"{self.origin} column '{self.column}' ({len(values)} rows, "
+                f"range=[{float(values.min()):.3f}, {float(values.max()):.3f}])")
+
+
+def load_column_array(csv_path: str, column: str, engine: str = "auto",
+                      chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """센서 컬럼 전체를 하나의 연속 float64 배열로 추출 (캐시 없이 메모리에 적재)"""
+    import numpy as np
+    source = StreamingCSVSource(csv_path, column, chunk_rows=chunk_rows, loop=False, engine=engine)
+    chunks = []
+    while source._next_chunk():
+        chunks.append(np.asarray(source._chunk, dtype=np.float64))
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.float64)
+
+
+class ColumnCache:
+    """
+    HAI CSV -> 컬럼별 .npy 캐시
+
+    디렉터리 구조:
+        <cache_dir>/manifest.json
+        <cache_dir>/<sha256[:16]>/c000.npy, c001.npy, ...
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # manifest
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _locked(self):
+        """manifest 갱신을 프로세스 간 직렬화 (flock)"""
+        with open(os.path.join(self.cache_dir, ".lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get("version") == CACHE_FORMAT_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {"version": CACHE_FORMAT_VERSION, "files": {}, "sources": {}}
+
+    def _write_manifest(self, manifest: Dict):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f, indent=1)
+        os.chmod(tmp_path, 0o644)  # 다른 사용자로 실행되는 클라이언트도 읽을 수 있도록
+        os.replace(tmp_path, self.manifest_path)
+
+    # ------------------------------------------------------------------
+    # 원본 식별
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def source_hash(self, csv_path: str, manifest: Dict) -> str:
+        """원본 CSV SHA-256 (크기/mtime이 manifest와 같으면 저장된 값 재사용)"""
+        path = os.path.abspath(csv_path)
+        st = os.stat(path)
+        known = manifest["files"].get(path)
+        if known and known["size"] == st.st_size and known["mtime_ns"] == st.st_mtime_ns:
+            return known["sha256"]
+        return self._hash_file(path)
+
+    # ------------------------------------------------------------------
+    # 변환
+    # ------------------------------------------------------------------
+
+    def _convert(self, csv_path: str, out_dir: str) -> Dict:
+        """
+        CSV 한 번 파싱 -> 숫자 컬럼별 .npy 기록, 컬럼 메타데이터 반환
+
+        chunk마다 컬럼별 raw 파일에 이어 쓰므로 메모리 사용은 chunk 크기로 제한됩니다.
+        """
+        import numpy as np
+        columns = read_csv_header(csv_path)
+        raw_paths = [os.path.join(out_dir, f"c{i:03d}.raw") for i in range(len(columns))]
+        raw_files = [open(path, "wb") for path in raw_paths]
+        rows = [0] * len(columns)
+        lows = [math.inf] * len(columns)
+        highs = [-math.inf] * len(columns)
+
+        def append(i: int, values):
+            values = values[~np.isnan(values)]
+            if len(values):
+                raw_files[i].write(values.astype("<f8", copy=False).tobytes())
+                rows[i] += len(values)
+                lows[i] = min(lows[i], float(values.min()))
+                highs[i] = max(highs[i], float(values.max()))
+
+        try:
+            if PANDAS_AVAILABLE:
+                import pandas as pd
+                for frame in pd.read_csv(csv_path, chunksize=65536, header=0, names=columns):
+                    for i, name in enumerate(columns):
+                        append(i, pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=np.float64))
+            else:
+                with open(csv_path, newline='') as f:
+                    reader = csv.reader(f)
+                    next(reader, None)
+                    while True:
+                        block = [row for _, row in zip(range(65536), reader)]
+                        if not block:
+                            break
+                        for i in range(len(columns)):
+                            cells = []
+                            for row in block:
+                                try:
+                                    cells.append(float(row[i]))
+                                except (ValueError, IndexError):
+                                    pass
+                            append(i, np.asarray(cells, dtype=np.float64))
+        finally:
+            for f in raw_files:
+                f.close()
+
+        meta = {}
+        for i, name in enumerate(columns):
+            if rows[i]:
+                filename = f"c{i:03d}.npy"
+                raw = np.memmap(raw_paths[i], dtype="<f8", mode="r", shape=(rows[i],))
+                np.save(os.path.join(out_dir, filename), raw)
+                del raw
+                meta[name] = {"file": filename, "rows": rows[i], "min": lows[i], "max": highs[i]}
+            # timestamp 등 숫자가 아닌 컬럼은 캐시하지 않음
+            os.remove(raw_paths[i])
+        return meta
+
+    def _cached_entry(self, manifest: Dict, digest: str) -> Optional[Dict]:
+        """manifest 항목과 .npy 파일이 모두 있으면 항목 반환, 없거나 손상되었으면 None"""
+        entry = manifest["sources"].get(digest)
+        if entry is None:
+            return None
+        data_dir = os.path.join(self.cache_dir, entry["dir"])
+        if not all(os.path.exists(os.path.join(data_dir, c["file"])) for c in entry["columns"].values()):
+            return None
+        return entry
+
+    @staticmethod
+    def _file_record(path: str, digest: str) -> Dict:
+        st = os.stat(path)
+        return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+
+    def ensure(self, csv_path: str, rebuild: bool = False) -> Dict:
+        """
+        해당 원본의 manifest 항목 반환 (캐시가 없거나 손상되었으면 생성)
+
+        캐시 적중이면 lock 없이 읽기만 하므로 읽기 전용/공유 캐시 디렉터리에서도 동작합니다.
+        flock과 manifest 쓰기는 재생성이 필요할 때만 합니다. rebuild=True면 .npy 파일이
+        있어도 원본에서 다시 생성합니다 (load()가 손상된 파일을 발견한 경우).
+        """
+        path = os.path.abspath(csv_path)
+        manifest = self._read_manifest()
+        digest = self.source_hash(path, manifest)
+        entry = None if rebuild else self._cached_entry(manifest, digest)
+        if entry is not None:
+            record = self._file_record(path, digest)
+            if manifest["files"].get(path) != record:
+                # 내용은 같고 mtime만 바뀐 경우: 다음 load의 재해시를 피하도록 가능하면 기록
+                try:
+                    with self._locked():
+                        manifest = self._read_manifest()
+                        manifest["files"][path] = record
+                        self._write_manifest(manifest)
+                except OSError:
+                    pass
+            return entry
+
+        with self._locked():
+            manifest = self._read_manifest()
+            # 다른 프로세스가 먼저 생성했을 수 있음
+            entry = None if rebuild else self._cached_entry(manifest, digest)
+            if entry is None:
+                data_dir = os.path.join(self.cache_dir, digest[:16])
+                tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=".build-")
+                try:
+                    columns = self._convert(path, tmp_dir)
+                    os.chmod(tmp_dir, 0o755)
+                    shutil.rmtree(data_dir, ignore_errors=True)
+                    os.replace(tmp_dir, data_dir)
+                except BaseException:
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
+                    raise
+                entry = {"source": path, "dir": digest[:16], "columns": columns}
+                manifest["sources"][digest] = entry
+
+            manifest["files"][path] = self._file_record(path, digest)
+            self._write_manifest(manifest)
+        return entry
+
+    def load(self, csv_path: str, column: str):
+        """센서 컬럼을 read-only mmap 배열로 반환 (.npy가 손상되었거나 잘렸으면 한 번 재생성)"""
+        entry = self.ensure(csv_path)
+        info = entry["columns"].get(column)
+        if info is None:
+            raise ValueError(f"Sensor '{column}' not in CSV (or not numeric). "
+                             f"Available: {list(entry['columns'])[:10]}")
+        values = self._open_column(entry, info)
+        if values is None:
+            print(f"[WARN] CSV cache file for '{column}' is corrupt or truncated; rebuilding {self.cache_dir}")
+            entry = self.ensure(csv_path, rebuild=True)
+            info = entry["columns"][column]
+            values = self._open_column(entry, info)
+            if values is None:
+                raise ValueError(f"Cache file for '{column}' is still unreadable after rebuilding {self.cache_dir}")
+        return values
+
+    def _open_column(self, entry: Dict, info: Dict):
+        """컬럼 .npy를 mmap으로 열기 (손상되었거나 행 수가 다르면 None)"""
+        import numpy as np
+        try:
+            values = np.load(os.path.join(self.cache_dir, entry["dir"], info["file"]), mmap_mode="r")
+        except (ValueError, EOFError):
+            return None  # 잘못된 header/pickle 데이터, 파일 크기보다 긴 shape 등
+        if len(values) != info["rows"]:
+            return None
+        return values
+
+
+def default_cache_dir(csv_path: str) -> str:
+    """기본 캐시 위치: CSV와 같은 디렉터리의 .hai_cache/"""
+    return os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR_NAME)
+
+
+def open_sensor_source(csv_path: str, column: str, engine: str = "auto",
+                       chunk_rows: int = DEFAULT_CHUNK_ROWS, dropna: bool = True,
+                       cache_dir: Optional[str] = None, use_cache: bool = True,
+                       preload: bool = False):
+    """
+    CSV 파일의 센서 컬럼 하나에 대한 데이터 소스 열기
+
+    use_cache=True이고 numpy가 있으면 .npy 캐시(mmap)를 사용하고,
+    캐시를 만들 수 없으면(읽기 전용 디렉터리 등) 스트리밍으로 대체합니다.
+    preload=True면 스트리밍 대신 컬럼을 연속 배열로 미리 추출합니다.
+    """
+    if use_cache and NUMPY_AVAILABLE:
+        try:
+            cache = ColumnCache(cache_dir or default_cache_dir(csv_path))
+            return ArraySource(cache.load(csv_path, column), column, origin="mmap")
+        except OSError as e:
+            print(f"[WARN] CSV cache unavailable ({e}); streaming CSV instead")
+    if preload and NUMPY_AVAILABLE:
+        return ArraySource(load_column_array(csv_path, column, engine=engine, chunk_rows=chunk_rows),
+                           column, origin="memory")
+    return StreamingCSVSource(csv_path, column, chunk_rows=chunk_rows, dropna=dropna, engine=engine)
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Deadband (Change-triggered) Proving with Signed Heartbeats
+
+HAI 태그 상당수는 오랫동안 거의 일정한데도 클라이언트는 매 주기 32비트 증명
+(~450ms)을 만듭니다. deadband 모드에서는 다음 경우에만 증명을 만듭니다:
+- 첫 측정값
+- 마지막으로 증명한 값에서 band를 벗어남: |v - v_last| > max(abs, rel·|v_last|)
+- 마지막 증명 후 max_staleness 초가 지남
+
+그 사이에는 HMAC-SHA256으로 서명한 heartbeat만 보냅니다. heartbeat는 검증 서버가
+성공을 응답한 마지막 증명(nonce, commitment)을 참조해 "값이 그 증명의 band 안에 있음"을
+나타내며, RAW 값은 지금과 같이 측정값마다 Reveal 서버에 저장됩니다. 보냈지만 아직
+검증되지 않은 증명(batch 대기, window, deferred)은 기준이 되지 않습니다.
+
+Heartbeat 요청:
+    {"mode": "HEARTBEAT", "sensor", "ts", "nonce", "type": "sensor_value",
+     "heartbeat": {"seq", "ref_nonce", "ref_commitment", "band", "age_s"},
+     "signature": HMAC-SHA256(key, canonical JSON(sensor, ts, nonce, heartbeat))}
+
+서명 key는 센서와 검증 서버가 공유하는 비밀값입니다 (--heartbeat-key 또는
+ICS_HEARTBEAT_KEY 환경 변수). local_verifier_server.py는 같은 key로 서명을 확인하고,
+ref_nonce/ref_commitment가 그 센서의 검증된 증명인지, 같은 참조에 대한 seq가 증가하는지
+(재전송 거부) 확인합니다.
+
+메트릭 (metrics.py Registry, --deadband-metrics-file로 Prometheus text format 기록):
+- client_deadband_readings_total{action="proof"|"heartbeat"}
+- client_deadband_proof_triggers_total{reason="first"|"band"|"stale"}
+- client_deadband_request_bytes_total{kind="proof"|"heartbeat"}
+- client_deadband_proofs_saved / client_deadband_bytes_saved (heartbeat로 대신한 증명 수와
+  평균 증명 요청 크기로 추정한 절감 bytes)
+
+Usage:
+    policy = DeadbandPolicy(absolute=0.05, max_staleness_s=60)
+    reason = policy.check(value)          # None이면 heartbeat
+    if reason is None:
+        request = policy.heartbeat(sensor, ts, nonce, key)
+    else:
+        ... 증명 ...
+        policy.proof_sent(value, nonce, commitment, reason, request_bytes)
+    ...
+    policy.proven([nonce])                # 검증 성공 응답 (ZK_AGGREGATE는 window의 nonce 전체)
+"""
+
+import os
+import hmac
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from metrics import MetricsRegistry
+
+
+HEARTBEAT_KEY_ENV = "ICS_HEARTBEAT_KEY"
+
+# 검증 결과를 기다리는 증명 측정값 상한 (spool/shed로 결과가 오지 않는 항목은 오래된 것부터 버림)
+MAX_PENDING_PROOFS = 1024
+
+
+def _signed_message(request: Dict) -> bytes:
+    """서명 대상: sensor, ts, nonce, heartbeat의 canonical JSON"""
+    body = {k: request.get(k) for k in ("sensor", "ts", "nonce", "heartbeat")}
+    return json.dumps(body, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def sign_heartbeat(key: bytes, request: Dict) -> str:
+    """heartbeat 요청 서명 (대문자 hex)"""
+    return hmac.new(key, _signed_message(request), hashlib.sha256).hexdigest().upper()
+
+
+def verify_heartbeat(key: bytes, request: Dict) -> Tuple[bool, Optional[str]]:
+    """
+    heartbeat 서명과 형식 확인 -> (ok, 실패 사유)
+
+    상태가 없는 확인만 합니다. 참조가 검증된 증명인지와 재전송 여부는 검증 서버가
+    센서별로 추적합니다 (local_verifier_server.HeartbeatReferences).
+    """
+    heartbeat = request.get("heartbeat")
+    if not isinstance(heartbeat, dict) or not heartbeat.get("ref_nonce") or not heartbeat.get("ref_commitment"):
+        return False, "heartbeat must reference a proven reading (ref_nonce, ref_commitment)"
+    if not isinstance(heartbeat.get("seq"), int):
+        return False, "heartbeat seq must be an integer"
+    signature = str(request.get("signature", ""))
+    if not hmac.compare_digest(signature.upper(), sign_heartbeat(key, request)):
+        return False, "invalid heartbeat signature"
+    return True, None
+
+
+def heartbeat_key_from(value: Optional[str]) -> Optional[bytes]:
+    """--heartbeat-key 값 또는 ICS_HEARTBEAT_KEY (없으면 None)"""
+    value = value if value is not None else os.environ.get(HEARTBEAT_KEY_ENV)
+    return value.encode('utf-8') if value else None
+
+
+class DeadbandPolicy:
+    """센서 하나의 deadband 판단 + 절감 메트릭"""
+
+    def __init__(self, absolute: float = 0.0, relative: float = 0.0, max_staleness_s: float = 60.0):
+        """
+        Args:
+            absolute: 절대 band (센서 단위)
+            relative: 상대 band (마지막 증명 값 대비 비율, 예: 0.01 = 1%)
+            max_staleness_s: 값이 band 안이어도 이 시간이 지나면 다시 증명
+        """
+        self.absolute = max(0.0, absolute)
+        self.relative = max(0.0, relative)
+        self.max_staleness_s = max_staleness_s
+        # heartbeat 기준: 검증 성공 응답을 받은 가장 최근 측정값
+        self.last_value: Optional[float] = None
+        self.last_nonce: Optional[str] = None
+        self.last_commitment: Optional[str] = None
+        self._last_proof_at = 0.0
+        self._seq = 0
+        # 보냈지만 검증 결과를 기다리는 측정값: nonce -> (value, commitment, 측정 시각)
+        # 검증 결과는 coalescer/deferred 스레드에서 오므로 기준 갱신은 lock으로 보호
+        self._pending: "OrderedDict[str, Tuple[float, str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.registry = MetricsRegistry()
+        self._readings = self.registry.counter("client_deadband_readings_total",
+                                               "readings by action", ["action"])
+        self._triggers = self.registry.counter("client_deadband_proof_triggers_total",
+                                               "why a full proof was generated", ["reason"])
+        self._bytes = self.registry.counter("client_deadband_request_bytes_total",
+                                            "verify request bytes sent", ["kind"])
+        self.registry.gauge("client_deadband_proofs_saved", "readings sent as heartbeats instead of proofs",
+                            lambda: self.proofs_saved)
+        self.registry.gauge("client_deadband_bytes_saved", "estimated request bytes saved by heartbeats",
+                            lambda: self.bytes_saved)
+        self.registry.gauge("client_deadband_last_proof_age_seconds", "seconds since the last full proof",
+                            lambda: self.age())
+
+    def band(self) -> float:
+        """현재 band 폭 (마지막 증명 값 기준)"""
+        return max(self.absolute, self.relative * abs(self.last_value or 0.0))
+
+    def age(self) -> float:
+        return time.monotonic() - self._last_proof_at if self.last_value is not None else 0.0
+
+    def check(self, value: float) -> Optional[str]:
+        """증명이 필요한 이유 ("first", "band", "stale"), heartbeat면 None"""
+        with self._lock:
+            if self.last_value is None or self.last_nonce is None:
+                return "first"
+            if abs(value - self.last_value) > self.band():
+                return "band"
+            if self.age() >= self.max_staleness_s:
+                return "stale"
+            return None
+
+    def proof_sent(self, value: float, nonce: str, commitment: str, reason: str, request_bytes: int):
+        """증명 요청을 보낸 측정값 기록 (검증 성공 응답이 오면 proven()으로 heartbeat 기준이 됨)"""
+        with self._lock:
+            self._pending[nonce] = (value, commitment, time.monotonic())
+            while len(self._pending) > MAX_PENDING_PROOFS:
+                self._pending.popitem(last=False)
+        self._readings.labels(action="proof").inc()
+        self._triggers.labels(reason=reason).inc()
+        self._bytes.labels(kind="proof").inc(request_bytes)
+
+    def proven(self, nonces: Iterable[str]):
+        """검증에 성공한 증명의 측정값 중 가장 최근 것을 heartbeat 기준으로 승격"""
+        with self._lock:
+            latest = None
+            for nonce in nonces:
+                pending = self._pending.pop(nonce, None)
+                if pending is not None and (latest is None or pending[2] >= latest[1][2]):
+                    latest = (nonce, pending)
+            # 결과가 순서를 바꿔 도착해도 더 최근 기준을 되돌리지 않음
+            if latest is None or latest[1][2] < self._last_proof_at:
+                return
+            nonce, (value, commitment, sent_at) = latest
+            self.last_value = value
+            self.last_nonce = nonce
+            self.last_commitment = commitment
+            self._last_proof_at = sent_at
+
+    def rejected(self, nonces: Iterable[str]):
+        """검증에 실패한 증명의 측정값은 기준 후보에서 제외"""
+        with self._lock:
+            for nonce in nonces:
+                self._pending.pop(nonce, None)
+
+    def heartbeat(self, sensor: str, event_ts: int, nonce: str, key: bytes) -> Dict:
+        """마지막으로 검증된 증명을 참조하는 서명된 heartbeat 요청"""
+        with self._lock:
+            self._seq += 1
+            heartbeat = {
+                "seq": self._seq,
+                "ref_nonce": self.last_nonce,
+                "ref_commitment": self.last_commitment,
+                "band": self.band(),
+                "age_s": round(self.age(), 3)
+            }
+        request = {
+            "mode": "HEARTBEAT",
+            "sensor": sensor,
+            "ts": event_ts,
+            "nonce": nonce,
+            "type": "sensor_value",
+            "heartbeat": heartbeat
+        }
+        request["signature"] = sign_heartbeat(key, request)
+        return request
+
+    def heartbeat_sent(self, request_bytes: int):
+        self._readings.labels(action="heartbeat").inc()
+        self._bytes.labels(kind="heartbeat").inc(request_bytes)
+
+    # ------------------------------------------------------------------
+    # 노출
+    # ------------------------------------------------------------------
+
+    @property
+    def proofs_saved(self) -> int:
+        return int(self._readings.labels(action="heartbeat").value())
+
+    @property
+    def bytes_saved(self) -> int:
+        proofs = self._readings.labels(action="proof").value()
+        if not proofs:
+            return 0
+        avg_proof_bytes = self._bytes.labels(kind="proof").value() / proofs
+        return int(self.proofs_saved * avg_proof_bytes - self._bytes.labels(kind="heartbeat").value())
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        return self.registry.render()
+
+    def write_metrics(self, path: str):
+        """node_exporter textfile collector용으로 메트릭 파일을 원자적으로 갱신"""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    def get_stats(self) -> Dict:
+        proofs = int(self._readings.labels(action="proof").value())
+        return {
+            "proofs": proofs,
+            "heartbeats": self.proofs_saved,
+            "proofs_saved": self.proofs_saved,
+            "bytes_saved": self.bytes_saved,
+            "awaiting_verification": len(self._pending),
+            "triggers": {reason: int(self._triggers.labels(reason=reason).value())
+                         for reason in ("first", "band", "stale")}
+        }
+
+
+def add_deadband_arguments(parser):
+    """argparse에 deadband 옵션 추가"""
+    parser.add_argument("--deadband-abs", type=float, default=None,
+                        help="Prove only when the value moves more than this from the last proven value")
+    parser.add_argument("--deadband-rel", type=float, default=None,
+                        help="Relative band, e.g. 0.01 = 1%% of the last proven value (the larger band wins)")
+    parser.add_argument("--max-staleness", type=float, default=60.0,
+                        help="Prove at least this often in seconds even inside the band (default: 60)")
+    parser.add_argument("--heartbeat-key", default=None,
+                        help=f"HMAC key for signed heartbeats between proofs (default: ${HEARTBEAT_KEY_ENV})")
+    parser.add_argument("--deadband-metrics-file", default=None,
+                        help="Write deadband metrics (Prometheus text format) to this file")
+
+
+def deadband_from_args(args) -> Optional[DeadbandPolicy]:
+    """add_deadband_arguments() 옵션으로 policy 생성 (band가 없으면 None)"""
+    if args.deadband_abs is None and args.deadband_rel is None:
+        return None
+    return DeadbandPolicy(absolute=args.deadband_abs or 0.0, relative=args.deadband_rel or 0.0,
+                          max_staleness_s=args.max_staleness)
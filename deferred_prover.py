@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Deferred Proofs: Commitment Now, Range Proof Later
+
+32비트 증명(~450ms)이 샘플링 주기 안에 끝나지 않으면 클라이언트는 그만큼 늦게
+전송합니다. deferred 모드에서는 send_value가 Pedersen commitment(scalar mult 2번,
+~2ms)와 metadata만 즉시 게시하고, 같은 gamma로 만든 range proof는 백그라운드
+스레드에서 생성해 나중에 여러 개씩 batch endpoint로 제출합니다.
+
+메시지 (단건 요청과 같은 endpoint/batch 스키마, nonce로 연결):
+- 측정값마다 즉시 COMMIT_ONLY
+    {"mode": "COMMIT_ONLY", "sensor", "ts", "nonce", "commitment": V, "deferred": true, ...}
+- 증명 완료 후 ZK_DEFERRED (VerifyCoalescer로 묶어서 전송)
+    {"mode": "ZK_DEFERRED", "sensor", "ts", "nonce", "commitment": V, "proof", "challenges", ...}
+  검증자는 같은 (sensor, nonce)로 게시된 commitment와 V가 같은지 확인한 뒤 일반 증명처럼
+  검증합니다. ts와 nonce는 측정 시점 값이므로 Reveal 서버의 RAW 값 pairing은 그대로입니다.
+
+순서: COMMIT_ONLY와 ZK_DEFERRED는 서로 다른 대기열로 나가므로, 완성된 증명은 호출자가
+published(nonce)로 COMMIT_ONLY 성공 응답을 알려줄 때까지 보류합니다. COMMIT_ONLY가
+spool에 보관되면 증명도 그 뒤에 spool로 보내고 (spool은 FIFO), 거부/유실되면 작업을 버립니다.
+
+backlog 상한: 게시 후 증명/제출을 기다리는 commitment가 max_backlog개면 accepts()가 False를
+반환하고, 호출자는 그 측정값을 기존처럼 바로 증명합니다 (ZK_ONLY). 증명이 샘플링보다
+계속 느려도 메모리와 종료 시 drain 시간은 max_backlog개 증명으로 제한됩니다.
+
+지연은 따로 집계합니다 (metrics.py Registry, --deferred-metrics-file):
+- client_deferred_commit_seconds: commitment 계산
+- client_deferred_publish_seconds: commitment 게시 (COMMIT_ONLY 전송 -> 성공 응답)
+- client_deferred_proof_lag_seconds: commitment 계산 -> 증명 검증 결과 수신
+- client_deferred_proofs_total{result="verified"|"failed"|"error"|"spooled"|"unpublished"}
+- client_deferred_inline_total (backlog가 가득 차 바로 증명한 측정값), client_deferred_backlog
+
+Usage:
+    deferred = DeferredProver(prover, server_url, build_request=make_zk_request,
+                              on_result=handle_result, max_batch=16, max_delay_ms=1000)
+    if deferred.accepts():
+        commitment = deferred.commit(scaled_value, nonce, context)   # 즉시 게시
+        ... COMMIT_ONLY 전송 ...
+        deferred.published(nonce, latency_ms)      # 성공 응답 후 증명 제출 허용
+        deferred.unpublished(nonce, spooled=True)  # 또는 spool 보관 / 거부(spooled=False)
+    deferred.close()                               # COMMIT_ONLY 응답을 모두 받은 뒤 호출
+"""
+
+import os
+import time
+import queue
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+from metrics import MetricsRegistry
+from verify_coalescer import VerifyCoalescer
+
+# 게시 후 증명/제출을 기다리는 commitment 기본 상한 (~0.45s 증명 기준 최대 ~15s 지연)
+DEFAULT_MAX_BACKLOG = 32
+
+# 증명 지연 bucket (초): 증명 ~0.45s + batch 대기 + backlog
+LAG_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+PUBLISH_BUCKETS = (0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# build_request(proof: RangeProof, context) -> 검증 요청 dict
+RequestBuilder = Callable[[Any, Any], Dict]
+# on_result(request, result, error, proof_lag_ms, context)
+DeferredResultCallback = Callable[[Dict, Optional[Dict], Optional[str], float, Any], None]
+
+
+def _p90(samples) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))] if ordered else 0.0
+
+
+class DeferredProver:
+    """commitment는 호출 스레드에서 즉시, range proof는 백그라운드에서 생성 후 batch 제출"""
+
+    def __init__(self, prover, server_url: str, build_request: RequestBuilder,
+                 max_batch: int = 16, max_delay_ms: float = 1000.0,
+                 on_result: Optional[DeferredResultCallback] = None,
+                 on_unreachable: Optional[Callable[[Dict], None]] = None, ipa_cutoff: int = 1,
+                 max_backlog: int = DEFAULT_MAX_BACKLOG):
+        """
+        Args:
+            prover: BulletproofProverProduction (commit / prove(gamma=...))
+            server_url: 검증 서버 URL (증명은 batch endpoint로 제출)
+            build_request: 완성된 RangeProof와 commit() context로 ZK_DEFERRED 요청 생성
+            max_batch: 제출 batch당 최대 증명 수
+            max_delay_ms: 첫 증명이 완성된 뒤 제출까지 최대 대기 시간
+            on_result: 증명별 검증 결과 콜백 (coalescer 스레드에서 호출)
+            on_unreachable: 연결 실패/5xx로 제출하지 못한 요청 콜백 (예: spool)
+            ipa_cutoff: 증명의 IPA cutoff (prove(ipa_cutoff=...))
+            max_backlog: 게시 후 증명/제출을 기다리는 commitment 상한 (넘으면 accepts()가 False)
+        """
+        self.prover = prover
+        self.ipa_cutoff = ipa_cutoff
+        self.build_request = build_request
+        self.on_result = on_result
+        self.on_unreachable = on_unreachable
+        self.max_backlog = max(1, max_backlog)
+        self.coalescer = VerifyCoalescer(server_url, max_batch=max_batch, max_delay_ms=max_delay_ms,
+                                         on_result=self._on_result, on_unreachable=on_unreachable)
+        self._jobs: "queue.Queue" = queue.Queue()  # 항목 수는 _committed (max_backlog)로 제한
+        # nonce -> {"at": commit 시각, "context", "state": "pending"|"published"|"spooled",
+        #           "request": 완성된 ZK_DEFERRED 요청 (COMMIT_ONLY 응답 전이면 보류)}
+        self._committed: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._lags = deque(maxlen=1024)
+        self._publishes = deque(maxlen=1024)
+        self.proofs_failed = 0                     # 증명 생성 예외
+
+        self.registry = MetricsRegistry()
+        self._commit_time = self.registry.histogram("client_deferred_commit_seconds",
+                                                    "time to compute a commitment", buckets=PUBLISH_BUCKETS)
+        self._publish_time = self.registry.histogram("client_deferred_publish_seconds",
+                                                     "reading to published commitment", buckets=PUBLISH_BUCKETS)
+        self._lag = self.registry.histogram("client_deferred_proof_lag_seconds",
+                                            "commitment to verified range proof", buckets=LAG_BUCKETS)
+        self._proofs = self.registry.counter("client_deferred_proofs_total",
+                                             "deferred proofs by verification result", ["result"])
+        self._inline = self.registry.counter("client_deferred_inline_total",
+                                             "readings proved inline because the backlog was full")
+        self.registry.gauge("client_deferred_backlog", "commitments waiting for a proof", lambda: self.backlog)
+
+        self._thread = threading.Thread(target=self._run, name="deferred-prover", daemon=True)
+        self._thread.start()
+
+    @property
+    def backlog(self) -> int:
+        return len(self._committed)
+
+    def accepts(self) -> bool:
+        """backlog 여유 확인 (False면 호출자가 바로 증명, inline counter 증가)"""
+        if self.backlog < self.max_backlog:
+            return True
+        self._inline.inc()
+        return False
+
+    def commit(self, scaled_value: int, nonce: str, context: Any = None) -> str:
+        """
+        commitment 생성 후 증명 작업 예약
+
+        Returns:
+            commitment 대문자 hex (COMMIT_ONLY 요청으로 즉시 게시)
+        """
+        start = time.perf_counter()
+        commitment, gamma = self.prover.commit(scaled_value)
+        self._commit_time.observe(time.perf_counter() - start)
+        with self._lock:
+            self._committed[nonce] = {"at": time.monotonic(), "context": context, "state": "pending",
+                                      "request": None}
+        self._jobs.put((scaled_value, gamma, nonce, context))
+        return commitment.hex().upper()
+
+    def published(self, nonce: str, latency_ms: float):
+        """COMMIT_ONLY 성공 응답: 게시 지연 기록, 증명이 완성되어 있으면 제출"""
+        self._publish_time.observe(latency_ms / 1000.0)
+        self._publishes.append(latency_ms)
+        with self._lock:
+            entry = self._committed.get(nonce)
+            if entry is None or entry["state"] != "pending":
+                return
+            entry["state"] = "published"
+            request, entry["request"] = entry["request"], None
+        if request is not None:
+            self.coalescer.submit(request)
+
+    def unpublished(self, nonce: str, spooled: bool = False):
+        """
+        COMMIT_ONLY가 게시되지 않음
+
+        spooled=True면 증명도 같은 spool로 보내 (완성 시) 게시 뒤에 재전송되게 하고,
+        아니면 (거부/유실) 검증될 수 없는 증명 작업을 버립니다.
+        """
+        with self._lock:
+            entry = self._committed.get(nonce)
+            if entry is None or entry["state"] != "pending":
+                return
+            if spooled and self.on_unreachable is not None:
+                entry["state"] = "spooled"
+                request = entry["request"]
+                if request is None:
+                    return
+                del self._committed[nonce]
+            else:
+                del self._committed[nonce]
+                request = None
+        if request is not None:
+            self._spool(request)
+        else:
+            self._proofs.labels(result="unpublished").inc()
+
+    def close(self):
+        """
+        남은 증명을 모두 생성/제출하고 스레드 종료
+
+        COMMIT_ONLY 응답을 모두 받은 뒤 (클라이언트 coalescer를 닫은 뒤) 호출해야
+        보류 중인 증명이 제출됩니다. 그때까지 게시되지 않은 commitment의 증명은 버립니다.
+        """
+        self._jobs.put(None)
+        self._thread.join()
+        with self._lock:
+            dropped = [nonce for nonce, entry in self._committed.items() if entry["state"] == "pending"]
+            for nonce in dropped:
+                del self._committed[nonce]
+        self._proofs.labels(result="unpublished").inc(len(dropped))
+        self.coalescer.close()
+
+    def _spool(self, request: Dict):
+        self._proofs.labels(result="spooled").inc()
+        self.on_unreachable(request)
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            scaled_value, gamma, nonce, context = job
+            if nonce not in self._committed:
+                continue  # COMMIT_ONLY가 거부/유실되어 취소된 작업
+            try:
+                proof = self.prover.prove(scaled_value, nonce, gamma=gamma, ipa_cutoff=self.ipa_cutoff)
+                request = self.build_request(proof, context)
+            except Exception as e:
+                self.proofs_failed += 1
+                with self._lock:
+                    self._committed.pop(nonce, None)
+                self._proofs.labels(result="error").inc()
+                if self.on_result is not None:
+                    self.on_result({"nonce": nonce}, None, f"proof generation failed: {e}", 0.0, context)
+                continue
+            self._ready(nonce, request)
+
+    def _ready(self, nonce: str, request: Dict):
+        """완성된 증명: COMMIT_ONLY가 게시됐으면 제출, spool에 있으면 spool로, 아니면 응답까지 보류"""
+        with self._lock:
+            entry = self._committed.get(nonce)
+            if entry is None:
+                return
+            state = entry["state"]
+            if state == "pending":
+                entry["request"] = request
+                return
+            if state == "spooled":
+                del self._committed[nonce]
+        if state == "spooled":
+            self._spool(request)
+        else:
+            self.coalescer.submit(request)
+
+    def _on_result(self, request: Dict, result: Optional[Dict], error: Optional[str], latency_ms: float):
+        with self._lock:
+            entry = self._committed.pop(request["nonce"], None)
+        committed_at, context = (entry["at"], entry["context"]) if entry else (time.monotonic(), None)
+        lag = time.monotonic() - committed_at
+        self._lag.observe(lag)
+        self._lags.append(lag * 1000)
+        if error is not None:
+            outcome = "error"
+        else:
+            outcome = "verified" if result.get("success", result.get("verified", result.get("ok"))) else "failed"
+        self._proofs.labels(result=outcome).inc()
+        if self.on_result is not None:
+            self.on_result(request, result, error, lag * 1000, context)
+
+    # ------------------------------------------------------------------
+    # 노출
+    # ------------------------------------------------------------------
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        return self.registry.render()
+
+    def write_metrics(self, path: str):
+        """node_exporter textfile collector용으로 메트릭 파일을 원자적으로 갱신"""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    def get_stats(self) -> Dict:
+        publishes, lags = list(self._publishes), list(self._lags)
+        return {
+            "proofs": {result: int(self._proofs.labels(result=result).value())
+                       for result in ("verified", "failed", "error", "spooled", "unpublished")},
+            "inline": int(self._inline.value()),
+            "backlog": self.backlog,
+            "avg_publish_ms": round(sum(publishes) / len(publishes), 1) if publishes else 0.0,
+            "p90_publish_ms": round(_p90(publishes), 1),
+            "avg_proof_lag_ms": round(sum(lags) / len(lags), 1) if lags else 0.0,
+            "p90_proof_lag_ms": round(_p90(lags), 1),
+            "max_proof_lag_ms": round(max(lags), 1) if lags else 0.0,
+            "batches": self.coalescer.get_stats()["batches"]
+        }
+
+
+def add_deferred_arguments(parser):
+    """argparse에 deferred proof 옵션 추가"""
+    parser.add_argument("--deferred", action="store_true",
+                        help="Publish the commitment immediately and submit the range proof later in batches")
+    parser.add_argument("--deferred-batch", type=int, default=16,
+                        help="Max deferred proofs per batch request (default: 16)")
+    parser.add_argument("--deferred-delay-ms", type=float, default=1000.0,
+                        help="Max wait after a deferred proof is ready before submitting (default: 1000)")
+    parser.add_argument("--deferred-max-backlog", type=int, default=DEFAULT_MAX_BACKLOG,
+                        help="Max commitments awaiting a proof; beyond this readings are proved inline "
+                             f"(default: {DEFAULT_MAX_BACKLOG})")
+    parser.add_argument("--deferred-metrics-file", default=None,
+                        help="Write deferred proof metrics (Prometheus text format) to this file")
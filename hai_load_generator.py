@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HAI Replay Load Generator for the Verification Server
+
+sensor_client.py는 프로세스당 센서 1개, interval당 측정값 1개만 보내므로 부하
+도구로 쓰기 어렵습니다. 이 도구는 HAI 컬럼을 여러 가상 센서로 N배속 재생하여
+/api/v1/verify/bulletproof에 open-loop 부하를 겁니다.
+
+특징:
+- 가상 센서: CSV 숫자 컬럼을 순환 배정하고, 같은 컬럼을 쓰는 센서는 시작 위치를 어긋나게 함
+- N배속 재생: HAI는 1Hz 샘플이므로 센서당 초당 --speedup 건 (전체 목표율 = 센서 수 x speedup)
+- Open-loop 도착: 응답을 기다리지 않고 일정 간격(constant) 또는 지수 분포(poisson)로 전송,
+  지연 시간은 예정 전송 시각부터 측정 (coordinated omission 방지)
+- Proof pool: 실제 Bulletproof 증명을 시작 시 미리 K개 생성해 순환 사용
+  (nonce는 transcript에 포함되지 않으므로 요청마다 새 nonce를 붙여도 유효)
+- 리포트: 달성 RPS, 지연 백분위, 서버 응답 기반 오류 분류
+- Batch 모드(--batch-size > 1): 여러 센서의 측정값을 공유 header 하나 아래에 묶어
+  /api/v1/verify/bulletproof/batch로 전송 (지연은 항목별 예정 시각부터 측정하므로 묶음 대기 시간 포함)
+
+Usage:
+    python3 hai_load_generator.py --server http://127.0.0.1:8085 --csv ./HAI/HAI1.csv \\
+        --virtual-sensors 50 --speedup 10 --duration 30
+    python3 hai_load_generator.py --server http://127.0.0.1:8085 --rate 2000 --arrival poisson --proof-pool 64
+    python3 hai_load_generator.py --server http://127.0.0.1:8085 --rate 2000 --batch-size 32 --batch-delay-ms 20
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from data_source import ArraySource, ColumnCache, default_cache_dir
+from sensor_client import BUILTIN_SAMPLE_PROOF, load_proof_file
+from verify_coalescer import BATCH_PATH, VERIFY_PATH
+from crypto.transcript import Transcript, proof_challenges
+
+
+DOMAIN = "ICS_BULLETPROOF_VERIFIER_v1"
+N_BITS = 32
+FS_TRANSCRIPT = Transcript(DOMAIN, N_BITS)  # domain || n prefix를 한 번만 흡수
+HAI_SAMPLE_HZ = 1.0
+
+
+# ----------------------------------------------------------------------
+# 가상 센서
+# ----------------------------------------------------------------------
+
+class VirtualSensor:
+    """HAI 컬럼 하나를 재생하는 가상 센서 (CSV가 없으면 시뮬레이션 값)"""
+
+    def __init__(self, sensor_id: str, source: Optional[ArraySource] = None):
+        self.sensor_id = sensor_id
+        self.source = source
+
+    def next_value(self) -> float:
+        if self.source is not None:
+            return self.source.next_value()
+        return max(0.0, random.gauss(5.0, 2.0))
+
+
+def build_virtual_sensors(count: int, csv_path: Optional[str] = None,
+                          columns: Optional[List[str]] = None,
+                          cache_dir: Optional[str] = None) -> List[VirtualSensor]:
+    """가상 센서 count개 생성 (컬럼 순환 배정, 같은 컬럼은 시작 위치 분산)"""
+    if csv_path is None:
+        return [VirtualSensor(f"SIM_{i:04d}") for i in range(count)]
+
+    cache = ColumnCache(cache_dir or default_cache_dir(csv_path))
+    available = list(cache.ensure(csv_path)["columns"])
+    columns = columns or available
+    missing = [c for c in columns if c not in available]
+    if missing:
+        raise ValueError(f"Columns not in CSV (or not numeric): {missing[:10]}")
+
+    sensors = []
+    for i in range(count):
+        column = columns[i % len(columns)]
+        replica = i // len(columns)
+        source = ArraySource(cache.load(csv_path, column), column)
+        # 같은 컬럼의 복제 센서는 재생 위치를 어긋나게 시작 (컬럼 길이가 나눠떨어지면 offset 0)
+        offset = (replica * 7919) % len(source.values)
+        if offset:
+            source.next_values(offset)
+        sensors.append(VirtualSensor(column if replica == 0 else f"{column}#{replica}", source))
+    return sensors
+
+
+# ----------------------------------------------------------------------
+# Proof pool
+# ----------------------------------------------------------------------
+
+def compute_challenges(proof: Dict) -> Dict[str, str]:
+    """Fiat-Shamir 챌린지 (y, z, x) 계산 - 클라이언트와 동일 규칙"""
+    return proof_challenges(FS_TRANSCRIPT, proof)
+
+
+def _prove_values(items: List[Tuple[int, Optional[bytes]]]) -> List:
+    """
+    워커 프로세스: (값, blinding seed) 목록에 대한 실제 증명 생성 (prover 인스턴스 재사용)
+
+    RangeProof를 그대로 반환 (pickle은 binary encoding이라 hex dict의 절반 크기)
+    """
+    from crypto.bulletproof_prover_production import BulletproofProverProduction
+    prover = BulletproofProverProduction(bit_length=N_BITS, domain=DOMAIN)
+    return [prover.prove(v, "", seed=seed) for v, seed in items]
+
+
+def build_proof_pool(size: int, sensors: List[VirtualSensor], workers: int = 1,
+                     proof_file: Optional[str] = None, seed: Optional[int] = None) -> List[Dict]:
+    """
+    요청에 순환 사용할 증명 목록 생성
+
+    proof_file(또는 size=0)이면 고정 템플릿 1개를 사용하고, 아니면 재생 데이터에서
+    뽑은 값으로 실제 Bulletproof 증명 size개를 생성합니다.
+    seed를 주면 증명 i의 blinding seed = SHA-256(seed:i) (worker 수와 무관하게 같은 증명 집합)
+    """
+    if proof_file or size <= 0:
+        template = load_proof_file(proof_file) if proof_file else BUILTIN_SAMPLE_PROOF
+        return [{"commitment": template.get("commitment", ""), "proof": template.get("proof", {})}]
+
+    values = []
+    for i in range(size):
+        scaled = int(sensors[i % len(sensors)].next_value() * 1000)
+        values.append(min(max(scaled, 0), 2 ** N_BITS - 1))
+    seeds = [None if seed is None else hashlib.sha256(f"{seed}:{i}".encode()).digest() for i in range(size)]
+    items = list(zip(values, seeds))
+
+    workers = max(1, min(workers, size))
+    if workers == 1:
+        proofs = _prove_values(items)
+    else:
+        shards = [items[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            proofs = [p for shard in pool.map(_prove_values, shards) for p in shard]
+    pool = []
+    for p in proofs:
+        data = p.to_json_dict()
+        pool.append({"commitment": data["commitment"], "proof": data["proof"], "challenges": p.challenges()})
+    return pool
+
+
+# ----------------------------------------------------------------------
+# 요청 인코딩
+# ----------------------------------------------------------------------
+
+# batch 항목: (seq, sensor_id, value, ts)
+BatchEntry = Tuple[int, str, float, int]
+
+
+class RequestEncoder:
+    """
+    요청 본문 인코더: 요청마다 바뀌지 않는 부분(proof, metadata)은 미리 직렬화
+
+    공유 header(type, range, metadata)와 항목별 고정 부분(commitment, proof, challenges)을
+    따로 보관해 단건 요청과 batch 요청(verify_coalescer 스키마)을 모두 만듭니다.
+    """
+
+    def __init__(self, mode: str, pool: List[Dict]):
+        self.mode = mode
+        metadata = {"domain": DOMAIN, "n": N_BITS, "encoding": "secp256k1-compressed-hex",
+                    "client": "hai_load_generator.py"}
+        header = {"type": "sensor_value", "range_min": 0, "range_max": 2 ** N_BITS - 1, "metadata": metadata}
+        self.header_part = json.dumps(header)[1:-1]
+        if mode == "ZK_ONLY":
+            self.item_parts = []
+            for entry in pool:
+                item = {"commitment": entry["commitment"], "proof": entry["proof"],
+                        "challenges": entry.get("challenges") or compute_challenges(entry["proof"])}
+                self.item_parts.append(json.dumps(item)[1:-1])
+        else:
+            self.item_parts = [json.dumps({"commitment": "02" + "0" * 64})[1:-1]]
+
+    def _item(self, seq: int, sensor_id: str, value: float, ts: int) -> str:
+        nonce = f"{seq:024X}"
+        dynamic = f'"sensor": {json.dumps(sensor_id)}, "ts": {ts}, "nonce": "{nonce}"'
+        if self.mode == "RAW":
+            value_hex = format(max(int(value * 1000), 0), '064x')
+            dynamic += f', "opening": {{"x": "{value_hex}", "r": "{"0" * 64}"}}, "raw_value": {value!r}'
+        return dynamic + ", " + self.item_parts[seq % len(self.item_parts)]
+
+    def encode(self, seq: int, sensor_id: str, value: float, ts: int) -> bytes:
+        item = self._item(seq, sensor_id, value, ts)
+        return ('{"mode": "' + self.mode + '", ' + item + ", " + self.header_part + "}").encode()
+
+    def encode_batch(self, entries: List[BatchEntry]) -> bytes:
+        items = ", ".join("{" + self._item(*entry) + "}" for entry in entries)
+        return ('{"mode": "' + self.mode + '", ' + self.header_part + ', "items": [' + items + "]}").encode()
+
+
+# ----------------------------------------------------------------------
+# HTTP (keep-alive 연결 풀)
+# ----------------------------------------------------------------------
+
+class HTTPConnectionPool:
+    """asyncio keep-alive HTTP/1.1 연결 풀 (연결 수 = 최대 동시 요청 수)"""
+
+    def __init__(self, url: str, size: int, timeout: float):
+        parts = urlsplit(url)
+        if parts.scheme != "http":
+            raise ValueError(f"Only http:// servers are supported: {url}")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self._slots: asyncio.Queue = asyncio.Queue()
+        for _ in range(size):
+            self._slots.put_nowait(None)
+
+    async def _read_response(self, reader: asyncio.StreamReader) -> Tuple[int, bytes, bool]:
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ")[1])
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            body = b""
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                body += chunk[:-2]
+        else:
+            body = await reader.readexactly(int(headers.get("content-length", "0") or 0))
+        close = headers.get("connection", "").lower() == "close"
+        return status, body, close
+
+    async def post(self, path: str, body: bytes) -> Tuple[int, bytes]:
+        conn = await self._slots.get()
+        try:
+            if conn is None:
+                conn = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+            reader, writer = conn
+            writer.write((f"POST {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                          f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode() + body)
+            await writer.drain()
+            status, payload, close = await asyncio.wait_for(self._read_response(reader), self.timeout)
+            if close:
+                writer.close()
+                conn = None
+            return status, payload
+        except BaseException:
+            if conn is not None:
+                conn[1].close()
+            conn = None
+            raise
+        finally:
+            self._slots.put_nowait(conn)
+
+
+# ----------------------------------------------------------------------
+# 부하 실행
+# ----------------------------------------------------------------------
+
+class LoadStats:
+    """지연 시간과 결과 분류 집계"""
+
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.service_ms: List[float] = []
+        self.outcomes: Counter = Counter()
+        self.scheduled = 0
+        self.http_requests = 0
+        self.max_send_lag_ms = 0.0
+
+    def record(self, outcome: str, scheduled_at: float, sent_at: float):
+        now = time.perf_counter()
+        self.outcomes[outcome] += 1
+        self.latencies_ms.append((now - scheduled_at) * 1000)
+        self.service_ms.append((now - sent_at) * 1000)
+
+
+def classify_result(result: Dict) -> str:
+    """항목 하나의 검증 결과 dict -> 결과 분류"""
+    if result.get("success", result.get("verified", result.get("ok", False))):
+        return "ok"
+    reason = result.get("error_message") or result.get("reason") or "unknown"
+    return f"verify_fail:{str(reason)[:60]}"
+
+
+def classify_response(status: int, body: bytes) -> str:
+    """서버 응답 -> 결과 분류 ('ok' 또는 오류 종류)"""
+    if status != 200:
+        return f"http_{status}"
+    try:
+        result = json.loads(body)
+    except ValueError:
+        return "bad_json"
+    return classify_result(result)
+
+
+def classify_batch_response(status: int, body: bytes, count: int) -> List[str]:
+    """batch 응답 -> 항목별 결과 분류"""
+    if status != 200:
+        return [f"http_{status}"] * count
+    try:
+        results = json.loads(body)["results"]
+    except (ValueError, KeyError, TypeError):
+        return ["bad_json"] * count
+    outcomes = [classify_result(r) if isinstance(r, dict) else "bad_json" for r in results[:count]]
+    return outcomes + ["bad_json"] * (count - len(outcomes))
+
+
+async def _send_one(pool: HTTPConnectionPool, stats: LoadStats, body: bytes, scheduled_at: float):
+    sent_at = time.perf_counter()
+    stats.http_requests += 1
+    try:
+        status, payload = await pool.post(VERIFY_PATH, body)
+        outcome = classify_response(status, payload)
+    except asyncio.TimeoutError:
+        outcome = "timeout"
+    except (ConnectionError, OSError, asyncio.IncompleteReadError) as e:
+        outcome = f"connection:{type(e).__name__}"
+    stats.record(outcome, scheduled_at, sent_at)
+
+
+async def _send_batch(pool: HTTPConnectionPool, stats: LoadStats, body: bytes, scheduled: List[float]):
+    sent_at = time.perf_counter()
+    stats.http_requests += 1
+    try:
+        status, payload = await pool.post(BATCH_PATH, body)
+        outcomes = classify_batch_response(status, payload, len(scheduled))
+    except asyncio.TimeoutError:
+        outcomes = ["timeout"] * len(scheduled)
+    except (ConnectionError, OSError, asyncio.IncompleteReadError) as e:
+        outcomes = [f"connection:{type(e).__name__}"] * len(scheduled)
+    for outcome, scheduled_at in zip(outcomes, scheduled):
+        stats.record(outcome, scheduled_at, sent_at)
+
+
+async def run_load(server: str, sensors: List[VirtualSensor], encoder: RequestEncoder,
+                   rate: float, duration: float, arrival: str = "constant",
+                   connections: int = 64, timeout: float = 10.0, max_pending: int = 10000,
+                   batch_size: int = 1, batch_delay_ms: float = 20.0) -> Tuple[LoadStats, float]:
+    """
+    Open-loop 부하 실행
+
+    Args:
+        batch_size: 1보다 크면 측정값을 최대 이 개수까지 묶어 batch endpoint로 전송
+        batch_delay_ms: 묶음의 첫 측정값 예정 시각부터 전송까지 최대 대기 시간
+
+    Returns:
+        (stats, 전송 시작부터 마지막 응답까지 경과 시간)
+    """
+    pool = HTTPConnectionPool(server, connections, timeout)
+    stats = LoadStats()
+    pending = set()
+    batch: List[BatchEntry] = []
+    batch_scheduled: List[float] = []
+
+    def spawn(coro):
+        task = asyncio.ensure_future(coro)
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    def flush():
+        if len(pending) >= max_pending:
+            stats.outcomes["client_backlog_drop"] += len(batch)
+        else:
+            spawn(_send_batch(pool, stats, encoder.encode_batch(batch), list(batch_scheduled)))
+        batch.clear()
+        batch_scheduled.clear()
+
+    start = time.perf_counter()
+    deadline = start + duration
+    next_at = start
+    seq = 0
+    while next_at < deadline:
+        if batch and batch_scheduled[0] + batch_delay_ms / 1000.0 <= next_at:
+            # 다음 도착 전에 묶음 대기 시간이 끝남
+            delay = batch_scheduled[0] + batch_delay_ms / 1000.0 - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            flush()
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        stats.max_send_lag_ms = max(stats.max_send_lag_ms, (time.perf_counter() - next_at) * 1000)
+
+        sensor = sensors[seq % len(sensors)]
+        stats.scheduled += 1
+        if batch_size > 1:
+            batch.append((seq, sensor.sensor_id, sensor.next_value(), int(time.time())))
+            batch_scheduled.append(next_at)
+            if len(batch) >= batch_size:
+                flush()
+        elif len(pending) >= max_pending:
+            stats.outcomes["client_backlog_drop"] += 1
+        else:
+            body = encoder.encode(seq, sensor.sensor_id, sensor.next_value(), int(time.time()))
+            spawn(_send_one(pool, stats, body, next_at))
+        seq += 1
+        next_at += random.expovariate(rate) if arrival == "poisson" else 1.0 / rate
+
+    if batch:
+        flush()
+    if pending:
+        await asyncio.wait(pending)
+    return stats, time.perf_counter() - start
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def build_report(stats: LoadStats, elapsed: float, target_rate: float) -> Dict:
+    latencies = sorted(stats.latencies_ms)
+    service = sorted(stats.service_ms)
+    completed = len(latencies)
+    ok = stats.outcomes.get("ok", 0)
+    return {
+        "target_rps": target_rate,
+        "scheduled": stats.scheduled,
+        "completed": completed,
+        "ok": ok,
+        "http_requests": stats.http_requests,
+        "achieved_rps": completed / elapsed if elapsed else 0.0,
+        "goodput_rps": ok / elapsed if elapsed else 0.0,
+        "elapsed_s": elapsed,
+        "max_send_lag_ms": stats.max_send_lag_ms,
+        "latency_ms": {f"p{p}": _percentile(latencies, p) for p in (50, 90, 99, 99.9)},
+        "service_latency_ms": {f"p{p}": _percentile(service, p) for p in (50, 90, 99, 99.9)},
+        "max_latency_ms": latencies[-1] if latencies else 0.0,
+        "errors": {k: v for k, v in stats.outcomes.most_common() if k != "ok"}
+    }
+
+
+def print_report(report: Dict):
+    print("=" * 60)
+    print(f"[REPORT] target={report['target_rps']:.0f} req/s, scheduled={report['scheduled']}, "
+          f"completed={report['completed']}, ok={report['ok']}, http_requests={report['http_requests']}")
+    print(f"  achieved: {report['achieved_rps']:.1f} req/s (goodput {report['goodput_rps']:.1f} req/s) "
+          f"over {report['elapsed_s']:.1f}s")
+    lat = report["latency_ms"]
+    svc = report["service_latency_ms"]
+    print(f"  latency (from schedule): p50={lat['p50']:.2f} p90={lat['p90']:.2f} p99={lat['p99']:.2f} "
+          f"p99.9={lat['p99.9']:.2f} max={report['max_latency_ms']:.2f} ms")
+    print(f"  latency (on the wire):   p50={svc['p50']:.2f} p90={svc['p90']:.2f} p99={svc['p99']:.2f} "
+          f"p99.9={svc['p99.9']:.2f} ms")
+    print(f"  max send lag: {report['max_send_lag_ms']:.1f} ms")
+    if report["errors"]:
+        print("  errors:")
+        for kind, count in report["errors"].items():
+            print(f"    {kind}: {count}")
+    else:
+        print("  errors: none")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accelerated HAI replay load generator for the verification server")
+    parser.add_argument("--server", required=True, help="Verification server URL (e.g., http://127.0.0.1:8085)")
+    parser.add_argument("--csv", default=None, help="HAI CSV file to replay (default: simulated values)")
+    parser.add_argument("--columns", nargs="+", default=None,
+                        help="CSV columns to replay (default: all numeric columns)")
+    parser.add_argument("--csv-cache-dir", default=None,
+                        help="Binary column cache directory (default: .hai_cache/ next to the CSV)")
+    parser.add_argument("--virtual-sensors", type=int, default=16, help="Number of virtual sensors (default: 16)")
+    parser.add_argument("--speedup", type=float, default=1.0,
+                        help="Replay speed as a multiple of HAI's 1 Hz sampling (default: 1.0)")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="Total target requests/sec (default: virtual-sensors x speedup)")
+    parser.add_argument("--arrival", choices=["constant", "poisson"], default="constant",
+                        help="Open-loop inter-arrival distribution (default: constant)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load (default: 10)")
+    parser.add_argument("--mode", choices=["ZK_ONLY", "RAW"], default="ZK_ONLY",
+                        help="Request schema (default: ZK_ONLY)")
+    parser.add_argument("--proof-pool", type=int, default=32,
+                        help="Real proofs pre-generated and reused round-robin; 0 = built-in sample (default: 32)")
+    parser.add_argument("--proof-file", default=None, help="Use this proof JSON for every request instead of a pool")
+    parser.add_argument("--pool-workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes for proof pool generation (default: CPU count)")
+    parser.add_argument("--connections", type=int, default=64,
+                        help="Keep-alive connections = max concurrent requests (default: 64)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds (default: 10)")
+    parser.add_argument("--max-pending", type=int, default=10000,
+                        help="Outstanding requests before new arrivals are dropped (default: 10000)")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="Readings per batch verify request; 1 sends one request per reading (default: 1)")
+    parser.add_argument("--batch-delay-ms", type=float, default=20.0,
+                        help="Max time a reading waits for its batch to fill (default: 20ms)")
+    parser.add_argument("--report-json", default=None, help="Also write the report to this JSON file")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed simulated values, Poisson arrivals and proof blinding for a reproducible run "
+                             "(benchmarks only: the proofs' blinding factors become predictable)")
+    args = parser.parse_args()
+
+    rate = args.rate or args.virtual_sensors * args.speedup * HAI_SAMPLE_HZ
+    if rate <= 0:
+        print("[ERROR] Target rate must be positive")
+        return 1
+
+    print("=" * 60)
+    print("HAI Replay Load Generator")
+    print("=" * 60)
+    print(f"[INIT] Server: {args.server}{BATCH_PATH if args.batch_size > 1 else VERIFY_PATH}")
+    if args.batch_size > 1:
+        print(f"[INIT] Coalescing: max_batch={args.batch_size}, max_delay={args.batch_delay_ms}ms")
+    print(f"[INIT] Virtual sensors: {args.virtual_sensors}, speedup={args.speedup}x, "
+          f"target={rate:.1f} req/s ({args.arrival} arrivals), duration={args.duration}s")
+    if args.seed is not None:
+        random.seed(args.seed)
+        print(f"[INIT] Seed: {args.seed} (reproducible values, arrivals and proofs)")
+
+    try:
+        sensors = build_virtual_sensors(args.virtual_sensors, args.csv, args.columns, args.csv_cache_dir)
+    except Exception as e:
+        print(f"[ERROR] Failed to load CSV: {e}")
+        return 1
+    print(f"[INIT] Data source: {'CSV ' + args.csv if args.csv else 'Simulated'}")
+
+    pool = []
+    if args.mode == "ZK_ONLY":
+        start = time.perf_counter()
+        pool = build_proof_pool(args.proof_pool, sensors, args.pool_workers, args.proof_file, args.seed)
+        print(f"[INIT] Proof pool: {len(pool)} proof(s) in {time.perf_counter() - start:.1f}s")
+    encoder = RequestEncoder(args.mode, pool)
+
+    print(f"[START] Sending for {args.duration}s ...")
+    stats, elapsed = asyncio.run(run_load(args.server, sensors, encoder, rate, args.duration, args.arrival,
+                                          args.connections, args.timeout, args.max_pending,
+                                          args.batch_size, args.batch_delay_ms))
+    report = build_report(stats, elapsed, rate)
+    print_report(report)
+
+    if args.report_json:
+        with open(args.report_json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[SAVE] {args.report_json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
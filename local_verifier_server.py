@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Local Bulletproof Verification Server (stand-in for the external verifier)
+
+클라이언트가 전송하는 외부 검증 서버와 같은 엔드포인트/응답 스키마를 구현하여
+reveal_server.py와 함께 한 대의 Linux 머신에서 전체 파이프라인을 오프라인으로
+벤치마크할 수 있게 합니다.
+
+Dependencies:
+    pip3 install flask petlib
+
+Usage:
+    python3 local_verifier_server.py --port 8085
+
+    # micro-batch: 2ms 창 안에 도착한 증명을 최대 64개까지 한 번에 검증
+    python3 local_verifier_server.py --port 8085 --batch-window-ms 2 --max-batch 64 \\
+        --server-mode async --workers 64
+
+API Endpoints:
+    POST /api/v1/verify/bulletproof       - 증명 검증 (ZK_ONLY) 또는 opening 범위 확인 (RAW)
+                                            window 모드: COMMIT_ONLY는 commitment 형식만,
+                                            ZK_AGGREGATE는 commitment 합 확인 + 증명 검증
+                                            deadband: HEARTBEAT는 HMAC 서명 확인 (--heartbeat-key),
+                                            참조가 그 센서의 검증된 증명인지와 seq 증가(재전송) 확인
+                                            deferred: COMMIT_ONLY(deferred)로 게시된 commitment와
+                                            같은지 확인 후 ZK_DEFERRED 증명 검증
+    POST /api/v1/verify/bulletproof/batch - 공유 header + items 여러 개를 한 번에 검증
+                                            (스키마: verify_coalescer.py)
+    GET  /api/v1/verify/stats             - 검증 통계 조회
+
+응답 스키마:
+    {"success": bool, "verified": bool, "ok": bool, "processing_time_ms": float,
+     "algorithm": str, "sensor": str, "nonce": str, "error_message": str (실패 시)}
+"""
+
+import time
+import queue
+import argparse
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+try:
+    from flask import Flask, request, jsonify
+except ImportError:
+    print("Error: 'flask' library not found. Install with: pip3 install flask")
+    exit(1)
+
+from async_wsgi_server import AsyncWSGIServer
+from log_pipeline import configure_logging, add_logging_arguments, get_logger, get_log_stats, log_event
+from verify_coalescer import decode_batch
+from deadband import heartbeat_key_from, verify_heartbeat
+from crypto.bulletproof_verifier import BulletproofVerifier, VerifyResult
+
+logger = get_logger("verifier")
+
+ALGORITHM = "Bulletproof-secp256k1"
+
+
+class MicroBatcher:
+    """
+    요청 스레드들이 제출한 증명을 짧은 창 동안 모아 한 번에 검증
+
+    파싱/challenge 계산(prepare)은 요청 스레드에서 하고, batch 스레드는
+    결합된 main equation 확인(check_batch)만 수행합니다.
+    """
+
+    def __init__(self, verifier: BulletproofVerifier, window_ms: float = 2.0, max_batch: int = 64):
+        """
+        Args:
+            verifier: 로컬 검증기
+            window_ms: 첫 증명 도착 후 추가 증명을 기다리는 최대 시간 (ms)
+            max_batch: 한 번에 검증할 최대 증명 수
+        """
+        self.verifier = verifier
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.batches = 0
+        self.batched_proofs = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def verify(self, commitment: str, proof: Dict) -> VerifyResult:
+        """증명 하나 검증 (같은 창의 다른 증명과 함께 확인될 때까지 대기)"""
+        try:
+            prepared = self.verifier.prepare(commitment, proof)
+        except ValueError as e:
+            return False, str(e)
+        future: Future = Future()
+        self._queue.put((prepared, future))
+        return future.result()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                results = [(True, None) if ok else (False, "main equation check failed")
+                           for ok in self.verifier.check_batch([p for p, _ in batch])]
+            except Exception as e:
+                results = [(False, f"verifier error: {e}")] * len(batch)
+            self.batches += 1
+            self.batched_proofs += len(batch)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def get_stats(self) -> Dict:
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch,
+            "batches": self.batches,
+            "avg_batch_size": round(self.batched_proofs / self.batches, 2) if self.batches else 0.0
+        }
+
+
+class VerifyStats:
+    """검증 결과 카운터 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.batch_requests = 0
+        self.requests = 0
+        self.verified = 0
+        self.failed = 0
+        self.by_mode: Dict[str, int] = {}
+        self.total_time_ms = 0.0
+
+    def record(self, mode: str, ok: bool, elapsed_ms: float):
+        with self._lock:
+            self.requests += 1
+            if ok:
+                self.verified += 1
+            else:
+                self.failed += 1
+            self.by_mode[mode] = self.by_mode.get(mode, 0) + 1
+            self.total_time_ms += elapsed_ms
+
+    def record_batch(self):
+        with self._lock:
+            self.batch_requests += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "batch_requests": self.batch_requests,
+                "verified": self.verified,
+                "failed": self.failed,
+                "by_mode": dict(self.by_mode),
+                "avg_processing_time_ms": round(self.total_time_ms / self.requests, 3) if self.requests else 0.0
+            }
+
+
+class DeferredCommitments:
+    """deferred 모드에서 게시된 commitment: (sensor, nonce) -> V (증명이 검증되면 제거)"""
+
+    def __init__(self, max_pending: int = 100000):
+        self._lock = threading.Lock()
+        self._pending: "OrderedDict[tuple, str]" = OrderedDict()
+        self.max_pending = max_pending
+        self.published = 0
+        self.resolved = 0
+        self.evicted = 0
+
+    @staticmethod
+    def _key(data: Dict) -> tuple:
+        return data.get("sensor"), data.get("nonce")
+
+    def publish(self, data: Dict):
+        with self._lock:
+            self._pending[self._key(data)] = str(data.get("commitment", "")).upper()
+            self.published += 1
+            while len(self._pending) > self.max_pending:
+                self._pending.popitem(last=False)
+                self.evicted += 1
+
+    def check(self, data: Dict) -> VerifyResult:
+        """ZK_DEFERRED: 증명의 commitment == 같은 (sensor, nonce)로 게시된 commitment"""
+        with self._lock:
+            published = self._pending.get(self._key(data))
+        if published is None:
+            return False, "no deferred commitment published for this sensor/nonce"
+        if published != str(data.get("commitment", "")).upper():
+            return False, "commitment differs from the published deferred commitment"
+        return True, None
+
+    def resolve(self, data: Dict):
+        with self._lock:
+            if self._pending.pop(self._key(data), None) is not None:
+                self.resolved += 1
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {"pending": len(self._pending), "published": self.published,
+                    "resolved": self.resolved, "evicted": self.evicted}
+
+
+class HeartbeatReferences:
+    """
+    deadband heartbeat가 참조할 수 있는 검증된 측정값
+
+    센서별로 최근 검증된 증명 refs_per_sensor개를 nonce -> [commitment, ts, 마지막 seq]로
+    보관합니다. 클라이언트의 기준은 검증 응답을 받은 뒤에 바뀌므로 가장 최근 증명보다 조금
+    오래된 참조도 허용하고, 같은 참조에 대해 seq가 증가하지 않는 heartbeat는 재전송으로 거부합니다.
+    """
+
+    def __init__(self, refs_per_sensor: int = 16, max_sensors: int = 100000):
+        self._lock = threading.Lock()
+        self._sensors: "OrderedDict[str, OrderedDict]" = OrderedDict()
+        self.refs_per_sensor = refs_per_sensor
+        self.max_sensors = max_sensors
+        self.accepted = 0
+        self.rejected = 0
+
+    def proven(self, data: Dict, mode: str):
+        """검증된 증명의 측정값 기록 (ZK_AGGREGATE는 window의 측정값 전체)"""
+        if mode == "ZK_AGGREGATE":
+            window = data.get("window") or {}
+            readings = list(zip(window.get("nonces") or [], window.get("commitments") or []))
+        else:
+            readings = [(data.get("nonce"), data.get("commitment"))]
+        ts = data.get("ts", 0)
+        with self._lock:
+            refs = self._sensors.pop(data.get("sensor"), None) or OrderedDict()
+            self._sensors[data.get("sensor")] = refs
+            for nonce, commitment in readings:
+                refs[nonce] = [str(commitment).upper(), ts, 0]
+            while len(refs) > self.refs_per_sensor:
+                refs.popitem(last=False)
+            while len(self._sensors) > self.max_sensors:
+                self._sensors.popitem(last=False)
+
+    def check(self, data: Dict) -> VerifyResult:
+        """HEARTBEAT (서명 확인 후): 참조 = 이 센서의 검증된 증명, 그 참조에 대한 seq 증가"""
+        heartbeat = data["heartbeat"]
+        with self._lock:
+            ok, reason = self._check_locked(data, heartbeat)
+            if ok:
+                self.accepted += 1
+            else:
+                self.rejected += 1
+        return ok, reason
+
+    def _check_locked(self, data: Dict, heartbeat: Dict) -> VerifyResult:
+        ref = self._sensors.get(data.get("sensor"), {}).get(heartbeat.get("ref_nonce"))
+        if ref is None:
+            return False, "heartbeat does not reference a verified proof from this sensor"
+        if ref[0] != str(heartbeat.get("ref_commitment", "")).upper():
+            return False, "heartbeat ref_commitment differs from the verified proof"
+        if heartbeat["seq"] <= ref[2]:
+            return False, "replayed heartbeat (seq not increasing)"
+        try:
+            if int(data.get("ts")) < int(ref[1]):
+                return False, "heartbeat is older than the referenced proof"
+        except (TypeError, ValueError):
+            return False, "invalid heartbeat ts"
+        ref[2] = heartbeat["seq"]
+        return True, None
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {"sensors": len(self._sensors), "accepted": self.accepted, "rejected": self.rejected}
+
+
+def _check_raw_opening(data: Dict) -> VerifyResult:
+    """RAW 모드: opening.x (64자리 hex)가 [range_min, range_max] 안에 있는지 확인"""
+    opening = data.get("opening") or {}
+    if not isinstance(opening, dict):
+        return False, "invalid opening (expected an object)"
+    try:
+        value = int(opening.get("x", ""), 16)
+    except (TypeError, ValueError):
+        return False, "invalid opening.x"
+    try:
+        range_min = int(data.get("range_min", 0))
+        range_max = int(data.get("range_max", 2 ** 32 - 1))
+    except (TypeError, ValueError):
+        return False, "invalid range_min/range_max"
+    if not range_min <= value <= range_max:
+        return False, f"value {value} outside [{range_min}, {range_max}]"
+    return True, None
+
+
+def _check_window_sum(verifier: BulletproofVerifier, data: Dict, mode: str) -> VerifyResult:
+    """ZK_AGGREGATE: window의 측정값별 commitment 합 == 증명된 commitment (다른 mode는 통과)"""
+    if mode != "ZK_AGGREGATE":
+        return True, None
+    window = data.get("window")
+    if not isinstance(window, dict):
+        return False, "Missing required field: window"
+    return verifier.check_commitment_sum(data["commitment"], window.get("commitments"))
+
+
+def _check_heartbeat(heartbeat_key: Optional[bytes], references: HeartbeatReferences, data: Dict) -> VerifyResult:
+    """HEARTBEAT: deadband 클라이언트의 서명 확인 후 참조/재전송 확인 (key가 없으면 거부)"""
+    if heartbeat_key is None:
+        return False, "heartbeat key not configured (--heartbeat-key)"
+    ok, reason = verify_heartbeat(heartbeat_key, data)
+    if not ok:
+        return ok, reason
+    return references.check(data)
+
+
+def _item_response(data: Dict, mode: str, ok: bool, reason: Optional[str], elapsed_ms: float) -> Dict:
+    response = {
+        "success": ok,
+        "verified": ok,
+        "ok": ok,
+        "algorithm": ALGORITHM,
+        "verifier": "local",
+        "mode": mode,
+        "sensor": data.get("sensor"),
+        "nonce": data.get("nonce"),
+        "processing_time_ms": round(elapsed_ms, 3)
+    }
+    if not ok:
+        response["error_message"] = reason
+    return response
+
+
+def create_app(verifier: BulletproofVerifier, batcher: Optional[MicroBatcher] = None,
+               max_batch_items: int = 1000, heartbeat_key: Optional[bytes] = None) -> Flask:
+    """
+    Flask 앱 생성
+
+    Args:
+        verifier: 로컬 검증기
+        batcher: 단건 요청용 micro-batcher (None이면 요청 스레드에서 바로 검증)
+        max_batch_items: /verify/bulletproof/batch 요청당 최대 항목 수
+        heartbeat_key: deadband heartbeat HMAC key (None이면 HEARTBEAT 거부)
+    """
+    app = Flask(__name__)
+    stats = VerifyStats()
+    deferred = DeferredCommitments()
+    references = HeartbeatReferences()
+
+    @app.route('/api/v1/verify/bulletproof', methods=['POST'])
+    def verify_bulletproof():
+        start = time.perf_counter()
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"success": False, "verified": False, "ok": False,
+                            "error_message": "Request body must be a JSON object"}), 400
+
+        mode = str(data.get("mode", "ZK_ONLY")).upper()
+        if mode == "RAW":
+            ok, reason = _check_raw_opening(data)
+        elif mode == "COMMIT_ONLY":
+            ok, reason = verifier.check_commitment(data.get("commitment", ""))
+            if ok and data.get("deferred"):
+                deferred.publish(data)
+        elif mode == "HEARTBEAT":
+            ok, reason = _check_heartbeat(heartbeat_key, references, data)
+        elif "commitment" not in data or "proof" not in data:
+            ok, reason = False, "Missing required fields: commitment, proof"
+        else:
+            ok, reason = _check_window_sum(verifier, data, mode)
+            if ok and mode == "ZK_DEFERRED":
+                ok, reason = deferred.check(data)
+            if ok:
+                verify = batcher.verify if batcher is not None else verifier.verify
+                ok, reason = verify(data["commitment"], data["proof"])
+            if ok and mode == "ZK_DEFERRED":
+                deferred.resolve(data)
+            if ok:
+                references.proven(data, mode)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        stats.record(mode, ok, elapsed_ms)
+        log_event(logger, logging.DEBUG, "verify", sensor=data.get("sensor"), mode=mode,
+                  result="OK" if ok else "FAIL", reason=reason, ms=round(elapsed_ms, 3))
+        return jsonify(_item_response(data, mode, ok, reason, elapsed_ms)), 200
+
+    @app.route('/api/v1/verify/bulletproof/batch', methods=['POST'])
+    def verify_bulletproof_batch():
+        """공유 header 아래 여러 항목을 검증 (ZK_ONLY 항목은 한 번의 결합 검증)"""
+        start = time.perf_counter()
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"success": False, "error_message": "Request body must be a JSON object"}), 400
+        try:
+            items = decode_batch(data)
+        except ValueError as e:
+            return jsonify({"success": False, "error_message": str(e)}), 400
+        if len(items) > max_batch_items:
+            return jsonify({"success": False,
+                            "error_message": f"At most {max_batch_items} items per request (got {len(items)})"}), 413
+
+        modes = [str(item.get("mode", "ZK_ONLY")).upper() for item in items]
+        outcomes: List[VerifyResult] = [(False, None)] * len(items)
+        zk_indices, zk_items = [], []
+        for i, (item, mode) in enumerate(zip(items, modes)):
+            if mode == "RAW":
+                outcomes[i] = _check_raw_opening(item)
+            elif mode == "COMMIT_ONLY":
+                outcomes[i] = verifier.check_commitment(item.get("commitment", ""))
+                if outcomes[i][0] and item.get("deferred"):
+                    deferred.publish(item)
+            elif mode == "HEARTBEAT":
+                outcomes[i] = _check_heartbeat(heartbeat_key, references, item)
+            elif "commitment" not in item or "proof" not in item:
+                outcomes[i] = (False, "Missing required fields: commitment, proof")
+            else:
+                outcomes[i] = _check_window_sum(verifier, item, mode)
+                if outcomes[i][0] and mode == "ZK_DEFERRED":
+                    outcomes[i] = deferred.check(item)
+                if outcomes[i][0]:
+                    zk_indices.append(i)
+                    zk_items.append((item["commitment"], item["proof"]))
+        for i, outcome in zip(zk_indices, verifier.verify_batch(zk_items)):
+            outcomes[i] = outcome
+            if outcome[0] and modes[i] == "ZK_DEFERRED":
+                deferred.resolve(items[i])
+            if outcome[0]:
+                references.proven(items[i], modes[i])
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        per_item_ms = elapsed_ms / len(items) if items else 0.0
+        stats.record_batch()
+        results = []
+        for item, mode, (ok, reason) in zip(items, modes, outcomes):
+            stats.record(mode, ok, per_item_ms)
+            results.append(_item_response(item, mode, ok, reason, per_item_ms))
+        verified = sum(1 for ok, _ in outcomes if ok)
+        log_event(logger, logging.DEBUG, "verify-batch", items=len(items), verified=verified,
+                  ms=round(elapsed_ms, 3))
+
+        return jsonify({
+            "success": verified == len(items),
+            "count": len(items),
+            "verified": verified,
+            "failed": len(items) - verified,
+            "results": results,
+            "processing_time_ms": round(elapsed_ms, 3)
+        }), 200
+
+    @app.route('/api/v1/verify/stats', methods=['GET'])
+    def verify_stats():
+        result = stats.snapshot()
+        result["batching"] = batcher.get_stats() if batcher is not None else None
+        result["deferred"] = deferred.get_stats()
+        result["heartbeats"] = references.get_stats()
+        result["logging"] = get_log_stats()
+        return jsonify(result), 200
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Bulletproof Verification Server")
+    parser.add_argument("--port", type=int, default=8085, help="Server port (default: 8085)")
+    parser.add_argument("--host", default="127.0.0.1", help="Server host (default: 127.0.0.1)")
+    parser.add_argument("--batch-window-ms", type=float, default=0.0,
+                        help="Micro-batch window in ms; 0 verifies each request on its own thread (default: 0)")
+    parser.add_argument("--max-batch", type=int, default=64, help="Max proofs per micro-batch (default: 64)")
+    parser.add_argument("--max-batch-items", type=int, default=1000,
+                        help="Max items per batch verify request (default: 1000)")
+    parser.add_argument("--server-mode", choices=["dev", "async"], default="dev",
+                        help="Serving mode: 'dev' (Flask dev server, thread per connection) or 'async' (asyncio, bounded workers)")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="Worker threads in async mode; use >= --max-batch when batching (default: 8)")
+    parser.add_argument("--max-connections", type=int, default=1024, help="Max concurrent connections in async mode (default: 1024)")
+    parser.add_argument("--keepalive-timeout", type=float, default=15.0, help="Idle keep-alive timeout in async mode (default: 15.0s)")
+    parser.add_argument("--heartbeat-key", default=None,
+                        help="HMAC key for deadband heartbeats (default: $ICS_HEARTBEAT_KEY; unset rejects HEARTBEAT)")
+    add_logging_arguments(parser)
+
+    args = parser.parse_args()
+    heartbeat_key = heartbeat_key_from(args.heartbeat_key)
+
+    configure_logging(level=args.log_level, fmt=args.log_format,
+                      sample_rate=args.log_sample, rate_limit=args.log_rate_limit)
+
+    verifier = BulletproofVerifier()
+    batcher = MicroBatcher(verifier, args.batch_window_ms, args.max_batch) if args.batch_window_ms > 0 else None
+
+    print("=" * 70)
+    print("  Local Bulletproof Verification Server")
+    print("=" * 70)
+    print(f"[INIT] Host: {args.host}")
+    print(f"[INIT] Port: {args.port}")
+    print(f"[INIT] Verifier: {ALGORITHM}, n={verifier.bit_length} (main equation + proof structure)")
+    if batcher is not None:
+        print(f"[INIT] Micro-batching: window={args.batch_window_ms}ms, max_batch={args.max_batch}")
+    else:
+        print("[INIT] Micro-batching: disabled")
+    print(f"[INIT] Max batch verify request: {args.max_batch_items} items")
+    print(f"[INIT] Heartbeats: {'HMAC-SHA256 key configured' if heartbeat_key else 'disabled (no --heartbeat-key)'}")
+    if args.server_mode == "async":
+        print(f"[INIT] Server mode: async (workers={args.workers}, max_connections={args.max_connections}, "
+              f"keepalive={args.keepalive_timeout}s)")
+    else:
+        print("[INIT] Server mode: dev (Flask threaded)")
+    print("=" * 70)
+    print(f"[INFO] Verify API: POST http://{args.host}:{args.port}/api/v1/verify/bulletproof")
+    print(f"[INFO] Batch API:  POST http://{args.host}:{args.port}/api/v1/verify/bulletproof/batch")
+    print(f"[INFO] Stats API:  GET  http://{args.host}:{args.port}/api/v1/verify/stats")
+    print("=" * 70)
+    print()
+
+    app = create_app(verifier, batcher, max_batch_items=args.max_batch_items, heartbeat_key=heartbeat_key)
+    if args.server_mode == "async":
+        server = AsyncWSGIServer(app, host=args.host, port=args.port, workers=args.workers,
+                                 max_connections=args.max_connections,
+                                 keepalive_timeout=args.keepalive_timeout)
+        server.run()
+    else:
+        app.run(host=args.host, port=args.port, debug=False, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Non-blocking Structured Logging Pipeline
+
+reveal_server.py와 두 센서 클라이언트가 요청마다 print()로 stdout에 직접 쓰던
+로그를 대체합니다. 호출 스레드는 bounded 큐에 레코드를 넣기만 하고, 실제
+포맷팅과 stdout 쓰기는 백그라운드 QueueListener 스레드가 담당합니다.
+
+구성:
+- QueueHandler(put_nowait): 큐가 가득 차면 블록하지 않고 레코드를 버리고 카운트
+- 샘플링: WARNING 미만 레코드를 sample_rate 비율로만 통과
+- Rate limit: WARNING 미만 레코드에 초당 token bucket 적용
+- 포맷: 'kv' ([timestamp] LEVEL event key=value ...) 또는 'json' (한 줄 JSON)
+- 통계: get_log_stats()로 레벨별 로그량, 샘플링/rate limit/큐 drop 카운터 조회
+
+Usage:
+    from log_pipeline import configure_logging, get_logger, log_event
+
+    configure_logging(level="INFO", sample_rate=1.0, rate_limit=200)
+    logger = get_logger("reveal_server")
+    log_event(logger, logging.INFO, "store", sensor="P1_PIT01", value=1.234)
+"""
+
+import sys
+import json
+import atexit
+import time
+import queue
+import random
+import logging
+import logging.handlers
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+
+LOG_FORMATS = ("kv", "json")
+
+
+class LogStats:
+    """로그 파이프라인 카운터 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.enqueued: Dict[str, int] = {}
+            self.sampled_out = 0
+            self.rate_limited = 0
+            self.dropped = 0
+
+    def count_enqueued(self, levelname: str):
+        with self._lock:
+            self.enqueued[levelname] = self.enqueued.get(levelname, 0) + 1
+
+    def count_sampled_out(self):
+        with self._lock:
+            self.sampled_out += 1
+
+    def count_rate_limited(self):
+        with self._lock:
+            self.rate_limited += 1
+
+    def count_dropped(self):
+        with self._lock:
+            self.dropped += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "enqueued": dict(self.enqueued),
+                "enqueued_total": sum(self.enqueued.values()),
+                "sampled_out": self.sampled_out,
+                "rate_limited": self.rate_limited,
+                "dropped_queue_full": self.dropped
+            }
+
+
+LOG_STATS = LogStats()
+
+
+class SamplingRateLimitFilter(logging.Filter):
+    """WARNING 미만 레코드에 샘플링 + token bucket rate limit 적용"""
+
+    def __init__(self, sample_rate: float = 1.0, rate_limit: float = 0.0):
+        """
+        Args:
+            sample_rate: 통과 비율 (0 < rate <= 1.0)
+            rate_limit: 초당 최대 레코드 수 (0이면 무제한)
+        """
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.rate_limit = rate_limit
+        self._tokens = rate_limit
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            LOG_STATS.count_sampled_out()
+            return False
+
+        if self.rate_limit > 0:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.rate_limit, self._tokens + (now - self._last_refill) * self.rate_limit)
+                self._last_refill = now
+                if self._tokens < 1.0:
+                    LOG_STATS.count_rate_limited()
+                    return False
+                self._tokens -= 1.0
+
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 호출 스레드를 막지 않고 레코드를 버리는 QueueHandler"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 같은 프로세스 내 큐이므로 포맷팅은 listener 스레드로 미룸
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            LOG_STATS.count_enqueued(record.levelname)
+        except queue.Full:
+            LOG_STATS.count_dropped()
+
+
+class StructuredFormatter(logging.Formatter):
+    """'kv' 또는 'json' 한 줄 포맷"""
+
+    def __init__(self, fmt: str = "kv"):
+        super().__init__()
+        if fmt not in LOG_FORMATS:
+            raise ValueError(f"Invalid log format: {fmt}. Must be one of {LOG_FORMATS}")
+        self.fmt = fmt
+
+    def format(self, record: logging.LogRecord) -> str:
+        timestamp = datetime.fromtimestamp(record.created).strftime("%Y-%m-%dT%H:%M:%S")
+        fields = getattr(record, "fields", None) or {}
+        message = record.getMessage()
+
+        if self.fmt == "json":
+            data = {"ts": timestamp, "level": record.levelname, "logger": record.name, "event": message}
+            data.update(fields)
+            if record.exc_info:
+                data["exc"] = self.formatException(record.exc_info)
+            return json.dumps(data, default=str, ensure_ascii=False)
+
+        parts = [f"[{timestamp}]", record.levelname, message]
+        for key, value in fields.items():
+            if isinstance(value, float):
+                value = f"{value:.6f}".rstrip('0').rstrip('.')
+            parts.append(f"{key}={value}")
+        line = " ".join(parts)
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(level: str = "INFO", fmt: str = "kv", sample_rate: float = 1.0,
+                      rate_limit: float = 0.0, queue_size: int = 10000, stream=None):
+    """
+    root logger에 non-blocking 큐 파이프라인 설치 (재호출 시 기존 설정 교체)
+
+    Args:
+        level: 최소 로그 레벨 (DEBUG/INFO/WARNING/ERROR)
+        fmt: 'kv' 또는 'json'
+        sample_rate: WARNING 미만 레코드 통과 비율
+        rate_limit: WARNING 미만 레코드 초당 상한 (0이면 무제한)
+        queue_size: 큐 용량 (가득 차면 drop)
+        stream: 출력 스트림 (기본: sys.stdout)
+    """
+    global _listener
+    shutdown_logging()
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(StructuredFormatter(fmt))
+
+    handler = NonBlockingQueueHandler(log_queue)
+    handler.addFilter(SamplingRateLimitFilter(sample_rate=sample_rate, rate_limit=rate_limit))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(getattr(logging, level.upper()))
+
+    # werkzeug 요청별 access 로그는 hot path이므로 경고 이상만
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """대기 중인 레코드를 모두 기록하고 listener 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(name)
+
+
+def log_event(logger: logging.Logger, level: int, event: str, exc_info=None, **fields):
+    """구조화된 이벤트 로그 (레벨이 꺼져 있으면 fields 포맷 비용 없음)"""
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={"fields": fields}, exc_info=exc_info)
+
+
+def get_log_stats() -> Dict:
+    """레벨별 로그량과 drop 카운터"""
+    stats = LOG_STATS.snapshot()
+    stats["queue_depth"] = _listener.queue.qsize() if _listener is not None else 0
+    return stats
+
+
+def add_logging_arguments(parser):
+    """argparse에 공통 로깅 옵션 추가"""
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="Minimum log level (default: INFO)")
+    parser.add_argument("--log-format", default="kv", choices=list(LOG_FORMATS),
+                        help="Log line format: 'kv' (key=value) or 'json' (default: kv)")
+    parser.add_argument("--log-sample", type=float, default=1.0,
+                        help="Fraction of DEBUG/INFO records to keep (default: 1.0)")
+    parser.add_argument("--log-rate-limit", type=float, default=0.0,
+                        help="Max DEBUG/INFO records per second, 0 = unlimited (default: 0)")
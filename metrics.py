@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Prometheus-style Metrics (no external dependencies)
+
+Counter / Histogram / Gauge와 text exposition format(0.0.4) 렌더러입니다.
+
+Hot path 설계:
+- Counter와 Histogram 값은 스레드별 shard(list)에 기록하므로 증가 연산에 lock이 없음
+- 수집(render) 시에만 모든 shard를 합산; 종료된 스레드의 shard는 누적값으로 흡수
+- Gauge는 수집 시점에 콜백으로 계산 (hot path 비용 0)
+
+Usage:
+    REGISTRY = MetricsRegistry()
+    requests_total = REGISTRY.counter("app_requests_total", "Requests", ["route"])
+    requests_total.labels(route="store").inc()
+    text = REGISTRY.render()
+"""
+
+import math
+import time
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+             for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _ShardedCells:
+    """스레드별 shard에 float 슬롯을 기록하는 lock-free 누적기"""
+
+    def __init__(self, width: int):
+        self.width = width
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, List[float]]] = []
+        self._retired = [0.0] * width
+        self._registry_lock = threading.Lock()  # shard 등록/수집 시에만 사용
+
+    def shard(self) -> List[float]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            cells = [0.0] * self.width
+            with self._registry_lock:
+                # 스레드별 연결 서버에서도 shard 수가 살아 있는 스레드 수로 유지되도록 등록 시에도 정리
+                self._retire_dead_locked()
+                self._shards.append((threading.current_thread(), cells))
+            self._local.shard = cells
+            return cells
+
+    def _retire_dead_locked(self):
+        """registry lock 보유 상태에서 종료된 스레드의 shard를 누적값으로 흡수"""
+        alive = []
+        for thread, cells in self._shards:
+            if thread.is_alive():
+                alive.append((thread, cells))
+            else:
+                for i in range(self.width):
+                    self._retired[i] += cells[i]
+        self._shards = alive
+
+    def collect(self) -> List[float]:
+        """모든 shard 합산 (종료된 스레드 shard는 누적값으로 흡수)"""
+        with self._registry_lock:
+            self._retire_dead_locked()
+            totals = list(self._retired)
+            for _, cells in self._shards:
+                for i in range(self.width):
+                    totals[i] += cells[i]
+        return totals
+
+
+class _LabeledMetric:
+    """label 값 조합별 child를 관리하는 공통 부모"""
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._children_lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, **labels):
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._children_lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _items(self) -> Iterable[Tuple[Tuple[str, ...], object]]:
+        if not self.labelnames:
+            return [((), self._default)]
+        with self._children_lock:
+            return list(self._children.items())
+
+
+class _CounterChild:
+    __slots__ = ("_cells",)
+
+    def __init__(self):
+        self._cells = _ShardedCells(1)
+
+    def inc(self, amount: float = 1.0):
+        self._cells.shard()[0] += amount
+
+    def value(self) -> float:
+        return self._cells.collect()[0]
+
+
+class Counter(_LabeledMetric):
+    """단조 증가 카운터"""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def value(self) -> float:
+        return self._default.value()
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value())}"
+                for key, child in self._items()]
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_cells")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        # [bucket_0 .. bucket_k, +Inf bucket, sum, count]
+        self._cells = _ShardedCells(len(bounds) + 3)
+
+    def observe(self, value: float):
+        cells = self._cells.shard()
+        cells[bisect.bisect_left(self._bounds, value)] += 1
+        cells[-2] += value
+        cells[-1] += 1
+
+    def snapshot(self) -> Tuple[List[float], float, float]:
+        totals = self._cells.collect()
+        return totals[:-2], totals[-2], totals[-1]
+
+
+class Histogram(_LabeledMetric):
+    """고정 bucket 히스토그램 (누적 bucket은 수집 시 계산)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, help_text, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, child in self._items():
+            buckets, total, count = child.snapshot()
+            cumulative = 0.0
+            for bound, bucket_count in zip(self.bounds + (math.inf,), buckets):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {_format_value(count)}")
+        return lines
+
+
+class Gauge:
+    """수집 시점에 콜백으로 계산되는 gauge
+
+    callback은 숫자 하나 또는 {label 값 tuple: 숫자} dict를 반환합니다.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, callback: Callable, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        value = self.callback()
+        if not self.labelnames:
+            return [f"{self.name} {_format_value(value)}"]
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}"
+                for key, v in sorted(value.items())]
+
+
+class MetricsRegistry:
+    """메트릭 등록 및 text exposition format 렌더링"""
+
+    def __init__(self):
+        self._metrics: List = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def gauge(self, name: str, help_text: str, callback: Callable,
+              labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, callback, labelnames))
+
+    def unregister(self, name: str):
+        with self._lock:
+            self._metrics = [m for m in self._metrics if m.name != name]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class TimedLock:
+    """lock 획득 대기 시간을 Histogram에 기록하는 threading.Lock 래퍼"""
+
+    __slots__ = ("_lock", "_histogram")
+
+    def __init__(self, histogram: Histogram, lock=None):
+        self._lock = lock if lock is not None else threading.Lock()
+        self._histogram = histogram
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        start = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        self._histogram.observe(time.perf_counter() - start)
+        return acquired
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self._lock.release()
+
+
+def ratio(numerator: float, denominator: float) -> float:
+    """0 나눗셈을 0으로 처리하는 비율"""
+    return numerator / denominator if denominator else 0.0
+
@@ -12,91 +12,309 @@ Dependencies:
 Usage:
     python3 reveal_server.py
 
+    # 재시작 시 RAW 값 복구 (write-ahead 세그먼트 로그)
+    python3 reveal_server.py --wal-dir ./reveal_wal
+
+    # asyncio 서빙 모드 (keep-alive, pipelining, 고정 워커 수)
+    python3 reveal_server.py --server-mode async --workers 8
+
 API Endpoints:
     POST /api/v1/store-raw   - 센서 클라이언트가 RAW 값을 저장
     POST /api/v1/reveal-raw  - 외부 서버가 RAW 값을 조회
+    POST /api/v1/reveal-raw/batch - 여러 (sensor_id, nonce) 쌍을 한 번에 조회
     GET  /api/v1/buffer/stats - 버퍼 통계 조회
+    GET  /metrics            - Prometheus text exposition format 메트릭
 """
 
 import threading
 import argparse
+import logging
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from collections import OrderedDict
 
 try:
-    from flask import Flask, request, jsonify
+    from flask import Flask, Response, g, request, jsonify
 except ImportError:
     print("Error: 'flask' library not found. Install with: pip3 install flask")
     exit(1)
 
+from reveal_wal import SegmentLog, WALUnavailableError
+from async_wsgi_server import AsyncWSGIServer
+from log_pipeline import configure_logging, add_logging_arguments, get_logger, get_log_stats, log_event
+from metrics import CONTENT_TYPE, MetricsRegistry, TimedLock, ratio
+
+logger = get_logger("reveal")  # Flask app.logger("reveal_server")는 비활성화됨
+
+
+# Prometheus 메트릭 (counter/histogram은 스레드별 shard라 hot path에 lock 없음)
+REGISTRY = MetricsRegistry()
+STORE_REQUESTS = REGISTRY.counter("reveal_store_requests_total", "store-raw requests by result status", ["status"])
+STORE_LATENCY = REGISTRY.histogram("reveal_store_latency_seconds", "store-raw handler latency")
+REVEAL_REQUESTS = REGISTRY.counter("reveal_reveal_requests_total", "reveal requests by endpoint", ["endpoint"])
+REVEAL_LATENCY = REGISTRY.histogram("reveal_reveal_latency_seconds", "reveal handler latency by endpoint", ["endpoint"])
+REVEAL_LOOKUPS = REGISTRY.counter("reveal_lookups_total", "reveal key lookups by result", ["result"])
+LOCK_WAIT = REGISTRY.histogram("reveal_buffer_lock_wait_seconds", "time spent waiting for the buffer lock",
+                               buckets=(1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1))
+CLEANUP_DURATION = REGISTRY.histogram("reveal_cleanup_duration_seconds", "expired-entry cleanup pass duration")
+
+LOOKUP_RESULTS = {result: REVEAL_LOOKUPS.labels(result=result) for result in ("found", "expired", "not_found")}
+ENDPOINT_METRICS = {
+    # Flask endpoint 이름 -> (요청 counter, latency histogram)
+    "store_raw": (None, STORE_LATENCY),
+    "reveal_raw": (REVEAL_REQUESTS.labels(endpoint="single"), REVEAL_LATENCY.labels(endpoint="single")),
+    "reveal_raw_batch": (REVEAL_REQUESTS.labels(endpoint="batch"), REVEAL_LATENCY.labels(endpoint="batch")),
+}
+
+# 항목당 메모리 사용량 추정치 (dict, ISO 문자열, 키 tuple, OrderedDict 노드 등)
+ENTRY_BASE_BYTES = 512
+
+EVICTION_POLICIES = ("oldest", "fair-share")
+
 
 class RAWValueBuffer:
     """로컬 메모리에 RAW 값을 TTL과 함께 저장하는 버퍼"""
 
-    def __init__(self, ttl_seconds: int = 600):  # 기본 10분
+    def __init__(self, ttl_seconds: int = 600, wal: Optional[SegmentLog] = None,
+                 wal_wait: bool = True, wal_timeout: float = 5.0,
+                 max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 max_entries_per_sensor: Optional[int] = None,
+                 max_bytes_per_sensor: Optional[int] = None,
+                 eviction_policy: str = "oldest"):  # 기본 10분
         """
         Args:
             ttl_seconds: Time-To-Live in seconds (default: 600 = 10 minutes)
+            wal: 선택적 write-ahead 세그먼트 로그 (None이면 메모리 전용)
+            wal_wait: True면 store()가 group commit(fsync) 완료까지 대기
+            wal_timeout: group commit 대기 상한 (초, 넘으면 WALUnavailableError)
+            max_entries: 전체 항목 수 상한 (None이면 무제한)
+            max_bytes: 전체 추정 메모리 상한 (bytes, None이면 무제한)
+            max_entries_per_sensor: 센서별 항목 수 상한
+            max_bytes_per_sensor: 센서별 추정 메모리 상한 (bytes)
+            eviction_policy: 전체 상한 초과 시 정책
+                'oldest' (가장 오래된 항목) or 'fair-share' (가장 많이 쓰는 센서의 가장 오래된 항목)
         """
+        if eviction_policy not in EVICTION_POLICIES:
+            raise ValueError(f"Invalid eviction policy: {eviction_policy}. Must be one of {EVICTION_POLICIES}")
+
         self.ttl_seconds = ttl_seconds
         self.buffer = OrderedDict()  # {(sensor_id, nonce): {event_ts, raw_value, stored_at, expires_at}}
-        self.lock = threading.Lock()
+        self.lock = TimedLock(LOCK_WAIT)
+        self.wal = wal
+        self.wal_wait = wal_wait
+        self.wal_timeout = wal_timeout
+
+        # 용량 상한
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entries_per_sensor = max_entries_per_sensor
+        self.max_bytes_per_sensor = max_bytes_per_sensor
+        self.eviction_policy = eviction_policy
+
+        # 용량 회계 (lock 보호)
+        self.total_bytes = 0
+        self.sensor_keys: Dict[str, OrderedDict] = {}  # {sensor_id: OrderedDict(nonce -> None)} 삽입 순서
+        self.sensor_bytes: Dict[str, int] = {}
+        self.evictions = {"global": 0, "per_sensor": 0}
+        self.high_water_entries = 0
+        self.high_water_bytes = 0
+
+        self.recovered_entries = 0
+        if self.wal is not None:
+            self.recovered_entries = self._recover()
         self._start_cleanup_thread()
 
-    def store(self, sensor_id: str, event_ts: int, nonce: str, raw_value: float):
-        """RAW 값을 버퍼에 저장"""
+    @staticmethod
+    def _entry_size(sensor_id: str, nonce: str) -> int:
+        """항목당 추정 메모리 사용량 (bytes)"""
+        return ENTRY_BASE_BYTES + len(sensor_id) + len(nonce)
+
+    def _remove_locked(self, key: Tuple[str, str]):
+        """lock을 보유한 상태에서 항목 삭제 및 회계 갱신"""
+        entry = self.buffer.pop(key)
+        sensor_id, nonce = key
+        size = entry["size_bytes"]
+        self.total_bytes -= size
+
+        nonces = self.sensor_keys[sensor_id]
+        del nonces[nonce]
+        if nonces:
+            self.sensor_bytes[sensor_id] -= size
+        else:
+            del self.sensor_keys[sensor_id]
+            del self.sensor_bytes[sensor_id]
+
+    def _sensor_over_limit(self, sensor_id: str, extra_bytes: int) -> bool:
+        count = len(self.sensor_keys.get(sensor_id, ()))
+        if self.max_entries_per_sensor is not None and count + 1 > self.max_entries_per_sensor:
+            return count > 0
+        if self.max_bytes_per_sensor is not None and self.sensor_bytes.get(sensor_id, 0) + extra_bytes > self.max_bytes_per_sensor:
+            return count > 0
+        return False
+
+    def _global_over_limit(self, extra_bytes: int) -> bool:
+        if not self.buffer:
+            return False
+        if self.max_entries is not None and len(self.buffer) + 1 > self.max_entries:
+            return True
+        if self.max_bytes is not None and self.total_bytes + extra_bytes > self.max_bytes:
+            return True
+        return False
+
+    def _eviction_victim_locked(self) -> Tuple[str, str]:
+        """전체 상한 초과 시 삭제할 키 선택"""
+        if self.eviction_policy == "fair-share":
+            # 가장 많은 메모리를 쓰는 센서에서 가장 오래된 항목
+            sensor_id = max(self.sensor_bytes, key=self.sensor_bytes.get)
+            return (sensor_id, next(iter(self.sensor_keys[sensor_id])))
+        return next(iter(self.buffer))
+
+    def _insert_locked(self, key: Tuple[str, str], entry: Dict) -> int:
+        """
+        lock을 보유한 상태에서 항목 삽입 (필요 시 상한에 맞춰 eviction)
+
+        Returns:
+            eviction된 항목 수
+        """
+        sensor_id, nonce = key
+        if key in self.buffer:
+            self._remove_locked(key)
+
+        size = self._entry_size(sensor_id, nonce)
+        evicted = 0
+
+        # 1. 센서별 상한: 같은 센서의 가장 오래된 항목부터 삭제
+        while self._sensor_over_limit(sensor_id, size):
+            self._remove_locked((sensor_id, next(iter(self.sensor_keys[sensor_id]))))
+            self.evictions["per_sensor"] += 1
+            evicted += 1
+
+        # 2. 전체 상한: eviction 정책에 따라 삭제
+        while self._global_over_limit(size):
+            self._remove_locked(self._eviction_victim_locked())
+            self.evictions["global"] += 1
+            evicted += 1
+
+        entry["size_bytes"] = size
+        self.buffer[key] = entry
+        self.sensor_keys.setdefault(sensor_id, OrderedDict())[nonce] = None
+        self.sensor_bytes[sensor_id] = self.sensor_bytes.get(sensor_id, 0) + size
+        self.total_bytes += size
+
+        if len(self.buffer) > self.high_water_entries:
+            self.high_water_entries = len(self.buffer)
+        if self.total_bytes > self.high_water_bytes:
+            self.high_water_bytes = self.total_bytes
+
+        return evicted
+
+    def _recover(self) -> int:
+        """WAL에서 만료되지 않은 항목 복구"""
+        count = 0
+        with self.lock:
+            for sensor_id, event_ts, nonce, raw_value, stored_ts, expires_ts in self.wal.replay():
+                self._insert_locked((sensor_id, nonce), {
+                    "event_ts": event_ts,
+                    "raw_value": raw_value,
+                    "stored_at": datetime.fromtimestamp(stored_ts).isoformat(),
+                    "expires_at": datetime.fromtimestamp(expires_ts).isoformat(),
+                    "expires_timestamp": expires_ts
+                })
+                count += 1
+        return count
+
+    def store(self, sensor_id: str, event_ts: int, nonce: str, raw_value: float) -> int:
+        """
+        RAW 값을 버퍼에 저장
+
+        Returns:
+            용량 상한 때문에 eviction된 항목 수 (0이면 eviction 없음)
+
+        Raises:
+            WALUnavailableError: WAL writer가 디스크 오류로 종료됐거나 group commit이 wal_timeout을 넘김
+        """
         key = (sensor_id, nonce)
         now = datetime.now()
         expires_at = now + timedelta(seconds=self.ttl_seconds)
 
+        # Write-ahead: 로그에 먼저 기록 (lock 밖에서 group commit 대기)
+        if self.wal is not None:
+            seq = self.wal.append(sensor_id, event_ts, nonce, raw_value, now.timestamp(), expires_at.timestamp())
+            if self.wal_wait and not self.wal.wait_durable(seq, timeout=self.wal_timeout):
+                raise WALUnavailableError(f"WAL group commit did not complete within {self.wal_timeout}s")
+
         with self.lock:
-            self.buffer[key] = {
+            evicted = self._insert_locked(key, {
                 "event_ts": event_ts,
                 "raw_value": raw_value,
                 "stored_at": now.isoformat(),
                 "expires_at": expires_at.isoformat(),
                 "expires_timestamp": expires_at.timestamp()
-            }
-
-        print(f"[STORE] sensor={sensor_id}, ts={event_ts}, nonce={nonce[:16]}..., value={raw_value:.6f}")
+            })
+
+        log_event(logger, logging.INFO, "store", sensor=sensor_id, ts=event_ts, nonce=nonce[:16],
+                  value=raw_value, evicted=evicted)
+        return evicted
+
+    def _lookup_locked(self, key: Tuple[str, str], now_ts: float) -> Optional[Dict]:
+        """lock을 보유한 상태에서 단일 키 조회 (만료 항목은 삭제)"""
+        entry = self.buffer.get(key)
+        if entry is None:
+            return None
+
+        # 만료 확인
+        if now_ts > entry["expires_timestamp"]:
+            self._remove_locked(key)
+            return {"error": "expired"}
+
+        return {
+            "event_ts": entry["event_ts"],
+            "raw_value": entry["raw_value"],
+            "stored_at": entry["stored_at"],
+            "expires_at": entry["expires_at"]
+        }
 
     def retrieve(self, sensor_id: str, nonce: str) -> Optional[Dict]:
         """버퍼에서 RAW 값을 검색"""
         key = (sensor_id, nonce)
 
         with self.lock:
-            if key not in self.buffer:
-                return None
-
-            entry = self.buffer[key]
+            return self._lookup_locked(key, datetime.now().timestamp())
 
-            # 만료 확인
-            if datetime.now().timestamp() > entry["expires_timestamp"]:
-                del self.buffer[key]
-                return {"error": "expired"}
+    def retrieve_many(self, keys: List[Tuple[str, str]]) -> List[Optional[Dict]]:
+        """
+        여러 (sensor_id, nonce) 쌍을 한 번의 lock 구간에서 검색
 
-            return {
-                "event_ts": entry["event_ts"],
-                "raw_value": entry["raw_value"],
-                "stored_at": entry["stored_at"],
-                "expires_at": entry["expires_at"]
-            }
+        Returns:
+            keys와 같은 순서의 결과 리스트 (retrieve()와 동일한 형식)
+        """
+        now_ts = datetime.now().timestamp()
+        with self.lock:
+            return [self._lookup_locked(key, now_ts) for key in keys]
 
     def cleanup_expired(self):
         """만료된 항목 제거"""
+        start = time.perf_counter()
         now = datetime.now().timestamp()
         with self.lock:
             expired_keys = [k for k, v in self.buffer.items() if now > v["expires_timestamp"]]
             for key in expired_keys:
-                del self.buffer[key]
+                self._remove_locked(key)
 
             if expired_keys:
-                print(f"[CLEANUP] {len(expired_keys)}개 만료 항목 삭제")
+                log_event(logger, logging.INFO, "cleanup", expired_entries=len(expired_keys))
+
+        CLEANUP_DURATION.observe(time.perf_counter() - start)
+
+        # 세그먼트 단위로 만료된 WAL 파일 삭제
+        if self.wal is not None:
+            dropped = self.wal.drop_expired(now)
+            if dropped:
+                log_event(logger, logging.INFO, "cleanup", expired_wal_segments=dropped)
 
     def _cleanup_worker(self):
         """백그라운드 정리 스레드"""
-        import time
         while True:
             time.sleep(60)  # 1분마다 실행
             self.cleanup_expired()
@@ -109,16 +327,57 @@ class RAWValueBuffer:
     def get_stats(self) -> Dict:
         """버퍼 통계"""
         with self.lock:
-            return {
+            stats = {
                 "total_entries": len(self.buffer),
-                "ttl_seconds": self.ttl_seconds
+                "ttl_seconds": self.ttl_seconds,
+                "total_bytes": self.total_bytes,
+                "sensors": len(self.sensor_keys),
+                "high_water_entries": self.high_water_entries,
+                "high_water_bytes": self.high_water_bytes,
+                "evictions": self.evictions["global"] + self.evictions["per_sensor"],
+                "evictions_global": self.evictions["global"],
+                "evictions_per_sensor": self.evictions["per_sensor"],
+                "limits": {
+                    "max_entries": self.max_entries,
+                    "max_bytes": self.max_bytes,
+                    "max_entries_per_sensor": self.max_entries_per_sensor,
+                    "max_bytes_per_sensor": self.max_bytes_per_sensor,
+                    "eviction_policy": self.eviction_policy
+                }
             }
+        if self.wal is not None:
+            stats["wal"] = self.wal.get_stats()
+            stats["wal"]["recovered_entries"] = self.recovered_entries
+        return stats
+
 
+def create_app(buffer: RAWValueBuffer, max_batch_size: int = 1000):
+    """
+    Flask 앱 생성
 
-def create_app(buffer: RAWValueBuffer):
-    """Flask 앱 생성"""
+    Args:
+        buffer: RAW 값 버퍼
+        max_batch_size: /reveal-raw/batch 요청당 최대 항목 수
+    """
     app = Flask(__name__)
     app.logger.disabled = True  # Flask 기본 로그 비활성화
+    _register_buffer_gauges(buffer)
+
+    @app.before_request
+    def _start_timer():
+        g.start_time = time.perf_counter()
+
+    @app.after_request
+    def _record_metrics(response):
+        endpoint_metrics = ENDPOINT_METRICS.get(request.endpoint)
+        if endpoint_metrics is not None:
+            counter, histogram = endpoint_metrics
+            histogram.observe(time.perf_counter() - g.start_time)
+            if counter is None:
+                STORE_REQUESTS.labels(status=g.get("store_status", "invalid")).inc()
+            else:
+                counter.inc()
+        return response
 
     @app.route('/api/v1/store-raw', methods=['POST'])
     def store_raw():
@@ -140,9 +399,21 @@ def create_app(buffer: RAWValueBuffer):
             }), 400
 
         # 버퍼에 저장
-        buffer.store(sensor_id, event_ts, nonce, raw_value)
-
-        return jsonify({"ok": True, "message": "Stored"}), 200
+        try:
+            evicted = buffer.store(sensor_id, event_ts, nonce, raw_value)
+        except WALUnavailableError as e:
+            # 기록을 보장할 수 없으면 ack하지 않음 (클라이언트가 재시도/spool)
+            g.store_status = "wal-unavailable"
+            log_event(logger, logging.ERROR, "store-wal-failed", sensor=sensor_id, nonce=nonce[:16], error=str(e))
+            return jsonify({"ok": False, "error": "wal-unavailable", "message": str(e)}), 503
+        g.store_status = "stored-evicted" if evicted else "stored"
+
+        if evicted:
+            # 저장은 성공했지만 용량 상한 때문에 기존 항목이 삭제됨
+            return jsonify({"ok": True, "status": "stored-evicted", "evicted": evicted,
+                            "message": f"Stored; evicted {evicted} older entries (capacity limit)"}), 200
+
+        return jsonify({"ok": True, "status": "stored", "message": "Stored"}), 200
 
     @app.route('/api/v1/reveal-raw', methods=['POST'])
     def reveal_raw():
@@ -161,20 +432,22 @@ def create_app(buffer: RAWValueBuffer):
                 "message": "Required: sensor_id, nonce"
             }), 400
 
-        print(f"[REVEAL] 요청: sensor={sensor_id}, nonce={nonce[:16]}...")
-
         # 버퍼에서 검색
         result = buffer.retrieve(sensor_id, nonce)
 
         if result is None:
-            print(f"[REVEAL] 결과: not-found")
+            LOOKUP_RESULTS["not_found"].inc()
+            log_event(logger, logging.INFO, "reveal", sensor=sensor_id, nonce=nonce[:16], result="not-found")
             return jsonify({"ok": False, "reason": "not-found"}), 404
 
         if "error" in result:
-            print(f"[REVEAL] 결과: expired")
+            LOOKUP_RESULTS["expired"].inc()
+            log_event(logger, logging.INFO, "reveal", sensor=sensor_id, nonce=nonce[:16], result="expired")
             return jsonify({"ok": False, "reason": "expired"}), 410  # 410 Gone (expired)
 
-        print(f"[REVEAL] 결과: 성공, value={result['raw_value']:.6f}")
+        LOOKUP_RESULTS["found"].inc()
+        log_event(logger, logging.INFO, "reveal", sensor=sensor_id, nonce=nonce[:16], result="found",
+                  value=result["raw_value"])
         return jsonify({
             "ok": True,
             "sensor_id": sensor_id,
@@ -185,41 +458,219 @@ def create_app(buffer: RAWValueBuffer):
             "expires_at": result["expires_at"]
         }), 200
 
+    @app.route('/api/v1/reveal-raw/batch', methods=['POST'])
+    def reveal_raw_batch():
+        """여러 (sensor_id, nonce) 쌍의 RAW 값을 한 번에 공개"""
+        start_time = time.time()
+        data = request.json
+
+        if not data:
+            return jsonify({"error": "invalid-request", "message": "No JSON body"}), 400
+
+        items = data.get("items")
+        if not isinstance(items, list) or not items:
+            return jsonify({
+                "error": "missing-fields",
+                "message": "Required: items (list of {sensor_id, nonce})"
+            }), 400
+
+        if len(items) > max_batch_size:
+            return jsonify({
+                "error": "batch-too-large",
+                "message": f"At most {max_batch_size} items per request (got {len(items)})"
+            }), 413
+
+        keys = []
+        for item in items:
+            if not isinstance(item, dict) or not item.get("sensor_id") or not item.get("nonce"):
+                return jsonify({
+                    "error": "missing-fields",
+                    "message": "Each item requires: sensor_id, nonce"
+                }), 400
+            keys.append((item["sensor_id"], item["nonce"]))
+
+        # 한 번의 lock 구간에서 전부 조회
+        lookups = buffer.retrieve_many(keys)
+
+        results = []
+        counts = {"found": 0, "expired": 0, "not-found": 0}
+        for (sensor_id, nonce), result in zip(keys, lookups):
+            if result is None:
+                status = "not-found"
+                results.append({"sensor_id": sensor_id, "nonce": nonce, "ok": False, "reason": status})
+            elif "error" in result:
+                status = "expired"
+                results.append({"sensor_id": sensor_id, "nonce": nonce, "ok": False, "reason": status})
+            else:
+                status = "found"
+                results.append({
+                    "sensor_id": sensor_id,
+                    "nonce": nonce,
+                    "ok": True,
+                    "event_ts": result["event_ts"],
+                    "raw_value": result["raw_value"],
+                    "stored_at": result["stored_at"],
+                    "expires_at": result["expires_at"]
+                })
+            counts[status] += 1
+
+        LOOKUP_RESULTS["found"].inc(counts["found"])
+        LOOKUP_RESULTS["expired"].inc(counts["expired"])
+        LOOKUP_RESULTS["not_found"].inc(counts["not-found"])
+
+        processing_time_ms = (time.time() - start_time) * 1000
+        log_event(logger, logging.INFO, "reveal-batch", items=len(keys), found=counts["found"],
+                  expired=counts["expired"], not_found=counts["not-found"], time_ms=processing_time_ms)
+
+        return jsonify({
+            "ok": True,
+            "count": len(keys),
+            "found": counts["found"],
+            "expired": counts["expired"],
+            "not_found": counts["not-found"],
+            "results": results,
+            "processing_time_ms": processing_time_ms
+        }), 200
+
     @app.route('/api/v1/buffer/stats', methods=['GET'])
     def buffer_stats():
         """버퍼 통계"""
-        return jsonify(buffer.get_stats()), 200
+        stats = buffer.get_stats()
+        stats["logging"] = get_log_stats()
+        return jsonify(stats), 200
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """Prometheus text exposition format"""
+        return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
 
     return app
 
 
+def _register_buffer_gauges(buffer: RAWValueBuffer):
+    """수집 시점에 버퍼 상태를 읽는 gauge 등록 (create_app 재호출 시 교체)"""
+
+    def sensor_entries():
+        with buffer.lock:
+            return {(sensor_id,): len(nonces) for sensor_id, nonces in buffer.sensor_keys.items()}
+
+    def lookup_ratio(result):
+        def compute():
+            total = sum(child.value() for child in LOOKUP_RESULTS.values())
+            return ratio(LOOKUP_RESULTS[result].value(), total)
+        return compute
+
+    gauges = [
+        ("reveal_buffer_entries", "entries currently buffered", lambda: len(buffer.buffer), ()),
+        ("reveal_buffer_bytes", "estimated bytes currently buffered", lambda: buffer.total_bytes, ()),
+        ("reveal_buffer_high_water_entries", "maximum entries buffered since start", lambda: buffer.high_water_entries, ()),
+        ("reveal_buffer_high_water_bytes", "maximum estimated bytes since start", lambda: buffer.high_water_bytes, ()),
+        ("reveal_buffer_evictions", "entries evicted by capacity limits",
+         lambda: {(scope,): count for scope, count in buffer.evictions.items()}, ("scope",)),
+        ("reveal_buffer_sensor_entries", "entries currently buffered per sensor", sensor_entries, ("sensor",)),
+        ("reveal_lookup_hit_ratio", "fraction of reveal lookups found", lookup_ratio("found"), ()),
+        ("reveal_lookup_miss_ratio", "fraction of reveal lookups not found", lookup_ratio("not_found"), ()),
+        ("reveal_lookup_expired_ratio", "fraction of reveal lookups expired", lookup_ratio("expired"), ()),
+        ("reveal_log_records", "log records enqueued", lambda: get_log_stats()["enqueued_total"], ()),
+        ("reveal_log_dropped", "log records dropped (queue full)", lambda: get_log_stats()["dropped_queue_full"], ()),
+        ("reveal_log_sampled_out", "log records removed by sampling or rate limit",
+         lambda: get_log_stats()["sampled_out"] + get_log_stats()["rate_limited"], ()),
+    ]
+    for name, help_text, callback, labelnames in gauges:
+        REGISTRY.unregister(name)
+        REGISTRY.gauge(name, help_text, callback, labelnames)
+
+
 def main():
     parser = argparse.ArgumentParser(description="RAW Value Reveal Server")
     parser.add_argument("--port", type=int, default=9000, help="Server port (default: 9000)")
     parser.add_argument("--host", default="127.0.0.1", help="Server host (default: 127.0.0.1)")
     parser.add_argument("--ttl", type=int, default=600, help="RAW value TTL in seconds (default: 600 = 10 min)")
+    parser.add_argument("--server-mode", choices=["dev", "async"], default="dev",
+                        help="Serving mode: 'dev' (Flask dev server, thread per connection) or 'async' (asyncio, bounded workers)")
+    parser.add_argument("--workers", type=int, default=8, help="Worker threads in async mode (default: 8)")
+    parser.add_argument("--max-connections", type=int, default=1024, help="Max concurrent connections in async mode (default: 1024)")
+    parser.add_argument("--keepalive-timeout", type=float, default=15.0, help="Idle keep-alive timeout in async mode (default: 15.0s)")
+    parser.add_argument("--wal-dir", default=None, help="Enable write-ahead segment log in this directory (default: memory only)")
+    parser.add_argument("--wal-commit-ms", type=float, default=5.0, help="WAL group commit window in ms (default: 5.0)")
+    parser.add_argument("--wal-segment-seconds", type=int, default=60, help="WAL segment rotation period in seconds (default: 60)")
+    parser.add_argument("--wal-async", action="store_true", help="Acknowledge store-raw before the WAL fsync completes")
+    parser.add_argument("--wal-timeout", type=float, default=5.0,
+                        help="Max wait for the WAL group commit before store-raw returns 503 (default: 5.0s)")
+    parser.add_argument("--max-entries", type=int, default=None, help="Global cap on buffered entries (default: unlimited)")
+    parser.add_argument("--max-bytes", type=int, default=None, help="Global cap on estimated buffer bytes (default: unlimited)")
+    parser.add_argument("--max-entries-per-sensor", type=int, default=None, help="Per-sensor cap on entries (default: unlimited)")
+    parser.add_argument("--max-bytes-per-sensor", type=int, default=None, help="Per-sensor cap on estimated bytes (default: unlimited)")
+    parser.add_argument("--eviction", choices=list(EVICTION_POLICIES), default="oldest",
+                        help="Eviction policy when the global cap is hit (default: oldest)")
+    parser.add_argument("--max-batch", type=int, default=1000, help="Max items per batch reveal request (default: 1000)")
+    add_logging_arguments(parser)
 
     args = parser.parse_args()
 
+    configure_logging(level=args.log_level, fmt=args.log_format,
+                      sample_rate=args.log_sample, rate_limit=args.log_rate_limit)
+
     print("=" * 70)
     print("  RAW Value Reveal Server (Selective Disclosure)")
     print("=" * 70)
     print(f"[INIT] Host: {args.host}")
     print(f"[INIT] Port: {args.port}")
     print(f"[INIT] TTL: {args.ttl} seconds ({args.ttl/60:.1f} minutes)")
+    if args.server_mode == "async":
+        print(f"[INIT] Server mode: async (workers={args.workers}, max_connections={args.max_connections}, "
+              f"keepalive={args.keepalive_timeout}s)")
+    else:
+        print("[INIT] Server mode: dev (Flask threaded)")
+    if args.wal_dir:
+        print(f"[INIT] WAL: {args.wal_dir} (commit={args.wal_commit_ms}ms, segment={args.wal_segment_seconds}s, "
+              f"{'async' if args.wal_async else 'sync'})")
+    else:
+        print("[INIT] WAL: disabled (memory only)")
+    print(f"[INIT] Capacity: entries={args.max_entries or 'unlimited'}, bytes={args.max_bytes or 'unlimited'}, "
+          f"per-sensor entries={args.max_entries_per_sensor or 'unlimited'}, "
+          f"per-sensor bytes={args.max_bytes_per_sensor or 'unlimited'}, eviction={args.eviction}")
+    print(f"[INIT] Max batch reveal: {args.max_batch} items")
+    print(f"[INIT] Logging: level={args.log_level}, format={args.log_format}, "
+          f"sample={args.log_sample}, rate_limit={args.log_rate_limit or 'unlimited'}/s")
     print("=" * 70)
     print(f"[INFO] Store API:  POST http://{args.host}:{args.port}/api/v1/store-raw")
     print(f"[INFO] Reveal API: POST http://{args.host}:{args.port}/api/v1/reveal-raw")
+    print(f"[INFO] Batch Reveal API: POST http://{args.host}:{args.port}/api/v1/reveal-raw/batch")
     print(f"[INFO] Stats API:  GET  http://{args.host}:{args.port}/api/v1/buffer/stats")
+    print(f"[INFO] Metrics:    GET  http://{args.host}:{args.port}/metrics")
     print("=" * 70)
     print()
 
     # 버퍼 생성
-    buffer = RAWValueBuffer(ttl_seconds=args.ttl)
+    wal = None
+    if args.wal_dir:
+        wal = SegmentLog(args.wal_dir, ttl_seconds=args.ttl,
+                         segment_seconds=args.wal_segment_seconds,
+                         commit_interval_ms=args.wal_commit_ms)
+    buffer = RAWValueBuffer(ttl_seconds=args.ttl, wal=wal, wal_wait=not args.wal_async, wal_timeout=args.wal_timeout,
+                            max_entries=args.max_entries, max_bytes=args.max_bytes,
+                            max_entries_per_sensor=args.max_entries_per_sensor,
+                            max_bytes_per_sensor=args.max_bytes_per_sensor,
+                            eviction_policy=args.eviction)
+    if wal is not None:
+        log_event(logger, logging.INFO, "wal-recovered", entries=buffer.recovered_entries)
 
     # Flask 앱 생성 및 실행
-    app = create_app(buffer)
-    app.run(host=args.host, port=args.port, debug=False, threaded=True)
+    app = create_app(buffer, max_batch_size=args.max_batch)
+    try:
+        if args.server_mode == "async":
+            server = AsyncWSGIServer(app, host=args.host, port=args.port, workers=args.workers,
+                                     max_connections=args.max_connections,
+                                     keepalive_timeout=args.keepalive_timeout)
+            server.run()
+        else:
+            app.run(host=args.host, port=args.port, debug=False, threaded=True)
+    finally:
+        # --wal-async에서 아직 기록되지 않은 마지막 commit window까지 flush
+        if wal is not None:
+            wal.close()
+            log_event(logger, logging.INFO, "wal-closed", **wal.get_stats())
 
 
 if __name__ == "__main__":
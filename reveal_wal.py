@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Write-Ahead Segment Log for the Reveal Server
+
+RAWValueBuffer의 store() 앞단에 붙는 선택적 append-only 로그입니다.
+서버가 재시작되어도 TTL 안에 있는 RAW 값을 복구할 수 있습니다.
+
+설계:
+- 레코드는 고정 헤더 + (sensor_id, nonce) 바이트로 구성된 바이너리 포맷
+- 세그먼트는 segment_seconds마다 교체되며, 파일 이름에 세그먼트의
+  만료 기한(deadline = 시작 시각 + segment_seconds + TTL)을 기록
+- TTL 정리는 레코드를 다시 쓰지 않고 기한이 지난 세그먼트 파일을 통째로 삭제
+- Group commit: 백그라운드 writer가 commit_interval 동안 모인 레코드를
+  한 번의 write() + fsync()로 기록
+- 복구: 만료되지 않은 세그먼트만 mmap으로 읽고, CRC가 맞지 않는
+  꼬리(torn write)에서 해당 세그먼트 읽기를 중단
+
+Record layout (little-endian):
+    u32 body_len | u32 crc32(body) | body
+    body = i64 event_ts | f64 raw_value | f64 stored_ts | f64 expires_ts
+           | u16 len(sensor_id) | u16 len(nonce) | sensor_id | nonce
+"""
+
+import os
+import mmap
+import time
+import struct
+import zlib
+import threading
+from typing import Iterator, List, Optional, Tuple
+
+
+RECORD_PREFIX = struct.Struct('<II')
+RECORD_BODY = struct.Struct('<qdddHH')
+SEGMENT_SUFFIX = ".seg"
+
+# (sensor_id, event_ts, nonce, raw_value, stored_ts, expires_ts)
+WALRecord = Tuple[str, int, str, float, float, float]
+
+
+class WALUnavailableError(RuntimeError):
+    """writer가 디스크 오류로 종료되었거나 group commit이 제한 시간 안에 끝나지 않음"""
+
+
+def encode_record(sensor_id: str, event_ts: int, nonce: str, raw_value: float,
+                  stored_ts: float, expires_ts: float) -> bytes:
+    """레코드를 바이너리로 인코딩"""
+    sid = sensor_id.encode('utf-8')
+    nb = nonce.encode('utf-8')
+    body = RECORD_BODY.pack(int(event_ts), float(raw_value), stored_ts, expires_ts, len(sid), len(nb)) + sid + nb
+    return RECORD_PREFIX.pack(len(body), zlib.crc32(body)) + body
+
+
+def decode_records(data) -> Iterator[WALRecord]:
+    """
+    바이트 버퍼(mmap 포함)에서 레코드를 순서대로 디코딩
+
+    CRC 불일치 또는 잘린 레코드를 만나면 그 지점에서 중단합니다.
+    """
+    offset = 0
+    size = len(data)
+    prefix_size = RECORD_PREFIX.size
+    body_size = RECORD_BODY.size
+
+    while offset + prefix_size <= size:
+        body_len, crc = RECORD_PREFIX.unpack_from(data, offset)
+        start = offset + prefix_size
+        end = start + body_len
+        if body_len < body_size or end > size:
+            return
+        body = data[start:end]
+        if zlib.crc32(body) != crc:
+            return
+
+        event_ts, raw_value, stored_ts, expires_ts, sid_len, nonce_len = RECORD_BODY.unpack_from(body, 0)
+        sid_end = body_size + sid_len
+        sensor_id = body[body_size:sid_end].decode('utf-8')
+        nonce = body[sid_end:sid_end + nonce_len].decode('utf-8')
+        yield (sensor_id, event_ts, nonce, raw_value, stored_ts, expires_ts)
+
+        offset = end
+
+
+class SegmentLog:
+    """TTL 기반 세그먼트 교체와 group commit을 지원하는 append-only 로그"""
+
+    def __init__(self, directory: str, ttl_seconds: int = 600,
+                 segment_seconds: int = 60, commit_interval_ms: float = 5.0,
+                 fsync: bool = True):
+        """
+        Args:
+            directory: 세그먼트 파일 디렉터리
+            ttl_seconds: RAW 값 TTL (세그먼트 만료 기한 계산용)
+            segment_seconds: 세그먼트 교체 주기 (초)
+            commit_interval_ms: group commit 대기 시간 (ms)
+            fsync: False면 write()만 하고 fsync 생략 (OS 크래시 시 유실 가능)
+        """
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.segment_seconds = segment_seconds
+        self.commit_interval = commit_interval_ms / 1000.0
+        self.fsync = fsync
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._pending: List[bytes] = []
+        self._appended_seq = 0
+        self._durable_seq = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self.error: Optional[OSError] = None   # writer를 종료시킨 디스크 오류 (ENOSPC, EIO 등)
+
+        self._file = None
+        self._segment_start = 0.0
+
+        self.commits = 0
+        self.records_written = 0
+        self.segments_dropped = 0
+
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+
+    # ------------------------------------------------------------------
+    # 세그먼트 관리
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, deadline_ts: float) -> str:
+        return os.path.join(self.directory, f"{int(deadline_ts * 1000):016d}{SEGMENT_SUFFIX}")
+
+    def _list_segments(self) -> List[Tuple[float, str]]:
+        """(deadline_ts, path) 목록을 오래된 순으로 반환"""
+        segments = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(SEGMENT_SUFFIX):
+                continue
+            try:
+                deadline_ts = int(name[:-len(SEGMENT_SUFFIX)]) / 1000.0
+            except ValueError:
+                continue
+            segments.append((deadline_ts, os.path.join(self.directory, name)))
+        segments.sort()
+        return segments
+
+    def _rotate_if_needed(self, now_ts: float):
+        """writer 스레드 전용: 현재 세그먼트가 교체 주기를 넘으면 새 세그먼트 생성"""
+        if self._file is not None and now_ts < self._segment_start + self.segment_seconds:
+            return
+        if self._file is not None:
+            self._file.close()
+        self._segment_start = now_ts
+        deadline_ts = now_ts + self.segment_seconds + self.ttl_seconds
+        self._file = open(self._segment_path(deadline_ts), 'ab', buffering=0)
+
+    def drop_expired(self, now_ts: Optional[float] = None) -> int:
+        """만료 기한이 지난 세그먼트 파일 삭제 (레코드 재작성 없음)"""
+        now_ts = time.time() if now_ts is None else now_ts
+        dropped = 0
+        for deadline_ts, path in self._list_segments():
+            if deadline_ts >= now_ts:
+                break
+            try:
+                os.remove(path)
+                dropped += 1
+            except FileNotFoundError:
+                pass
+        self.segments_dropped += dropped
+        return dropped
+
+    # ------------------------------------------------------------------
+    # 쓰기 경로 (group commit)
+    # ------------------------------------------------------------------
+
+    def append(self, sensor_id: str, event_ts: int, nonce: str, raw_value: float,
+               stored_ts: float, expires_ts: float) -> int:
+        """
+        레코드를 commit 대기열에 추가
+
+        Returns:
+            wait_durable()에 넘길 시퀀스 번호
+        """
+        record = encode_record(sensor_id, event_ts, nonce, raw_value, stored_ts, expires_ts)
+        with self._cond:
+            if self.error is not None:
+                raise WALUnavailableError(f"WAL writer failed: {self.error}")
+            if self._closed:
+                raise RuntimeError("SegmentLog is closed")
+            self._pending.append(record)
+            self._appended_seq += 1
+            return self._appended_seq
+
+    def wait_durable(self, seq: int, timeout: Optional[float] = None) -> bool:
+        """
+        seq까지의 레코드가 디스크에 기록될 때까지 대기
+
+        Returns:
+            기록 완료면 True, timeout이 지나면 False
+
+        Raises:
+            WALUnavailableError: writer가 디스크 오류로 종료됨 (기록될 수 없음)
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._durable_seq >= seq or self.error is not None, timeout=timeout)
+            if self._durable_seq >= seq:
+                return True
+            if self.error is not None:
+                raise WALUnavailableError(f"WAL writer failed: {self.error}")
+            return False
+
+    def _writer_loop(self):
+        """백그라운드 writer: commit_interval마다 대기열을 한 번에 기록"""
+        while True:
+            time.sleep(self.commit_interval)
+            with self._cond:
+                batch = self._pending
+                self._pending = []
+                batch_seq = self._appended_seq
+                closed = self._closed
+
+            if batch:
+                try:
+                    self._rotate_if_needed(time.time())
+                    self._file.write(b''.join(batch))
+                    if self.fsync:
+                        os.fsync(self._file.fileno())
+                except OSError as e:
+                    # 대기 중인 store()가 무한정 막히지 않도록 오류를 기록하고 깨운 뒤 종료
+                    self._fail(e)
+                    return
+                self.commits += 1
+                self.records_written += len(batch)
+
+            with self._cond:
+                self._durable_seq = batch_seq
+                self._cond.notify_all()
+
+            if closed and not batch:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _fail(self, error: OSError):
+        """writer 스레드 전용: 디스크 오류 기록 후 대기자를 모두 깨움"""
+        with self._cond:
+            self.error = error
+            self._cond.notify_all()
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def close(self):
+        """대기 중인 레코드를 모두 기록하고 writer 종료"""
+        with self._cond:
+            self._closed = True
+        self._writer.join()
+
+    # ------------------------------------------------------------------
+    # 복구 경로
+    # ------------------------------------------------------------------
+
+    def replay(self, now_ts: Optional[float] = None) -> Iterator[WALRecord]:
+        """
+        만료되지 않은 세그먼트의 레코드를 mmap으로 읽어 순서대로 반환
+
+        세그먼트 단위로 만료된 파일은 열지 않으며, 세그먼트 안의
+        개별 만료 레코드도 건너뜁니다.
+        """
+        now_ts = time.time() if now_ts is None else now_ts
+        for deadline_ts, path in self._list_segments():
+            if deadline_ts < now_ts:
+                continue
+            with open(path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for record in decode_records(mm):
+                        if record[5] >= now_ts:
+                            yield record
+
+    def get_stats(self) -> dict:
+        """로그 통계"""
+        segments = self._list_segments()
+        return {
+            "directory": self.directory,
+            "segments": len(segments),
+            "bytes": sum(os.path.getsize(path) for _, path in segments),
+            "commits": self.commits,
+            "records_written": self.records_written,
+            "segments_dropped": self.segments_dropped,
+            "fsync": self.fsync,
+            "error": str(self.error) if self.error is not None else None
+        }
@@ -7,7 +7,8 @@ Sends sensor values to the server in either RAW or ZK_ONLY mode.
 Supports CSV data source or simulated random values.
 
 Dependencies:
-    pip3 install requests pandas
+    pip3 install requests
+    pip3 install pandas  # optional: faster CSV parsing (stdlib csv is used otherwise)
 
 Usage:
     # RAW mode
@@ -21,6 +22,18 @@ Usage:
 
     # Single transmission
     python sensor_client.py --server http://localhost:8085 --sensor P1_PIT01 --mode RAW --once
+
+    # Coalesce readings: one batch POST per 16 readings or 200 ms, whichever comes first
+    python sensor_client.py --server http://localhost:8085 --sensor P1_PIT01 --interval 0.01 --batch-size 16 --batch-delay-ms 200
+
+    # Keep readings the server could not receive in ./spool and resend them when it is back
+    python sensor_client.py --server http://localhost:8085 --sensor P1_PIT01 --spool-dir ./spool
+
+    # Back off (fewer concurrent requests, batching, then slower sampling) when the verifier slows down
+    python sensor_client.py --server http://localhost:8085 --sensor P1_PIT01 --interval 0.1 --adaptive --adaptive-latency-ms 300
+
+    # Per-phase startup timing (imports, init, first transmission)
+    python sensor_client.py --server http://localhost:8085 --sensor P1_PIT01 --once --import-profile
 """
 
 import sys
@@ -29,9 +42,17 @@ import json
 import argparse
 import random
 import os
-import hashlib
+import logging
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+from startup_profile import STARTUP
+from log_pipeline import configure_logging, add_logging_arguments, get_logger, get_log_stats, log_event
+from data_source import CSV_ENGINES, DEFAULT_CHUNK_ROWS, open_sensor_source
+from spool import Spool
+from adaptive_controller import AdaptiveController, add_adaptive_arguments, controller_from_args
+from verify_coalescer import VerifyCoalescer, replay_verify
+from crypto.transcript import Transcript, proof_challenges
 
 try:
     import requests
@@ -39,12 +60,12 @@ except ImportError:
     print("Error: 'requests' library not found. Install with: pip3 install requests")
     sys.exit(1)
 
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
-    print("Warning: 'pandas' not installed. CSV mode disabled. Install with: pip3 install pandas")
+logger = get_logger("sensor_client")
+
+# Fiat-Shamir transcript with the domain || n prefix absorbed once (forked per challenge set)
+FS_TRANSCRIPT = Transcript("ICS_BULLETPROOF_VERIFIER_v1", 32)
+
+STARTUP.mark("module imports")
 
 
 # Built-in sample proof (valid structure, can be used when --proof-file is not provided)
@@ -90,7 +111,13 @@ class SensorClient:
 
     def __init__(self, server_url: str, sensor_name: str, mode: str,
                  proof_data: Optional[Dict] = None, csv_path: Optional[str] = None,
-                 compute_challenges: bool = False):
+                 compute_challenges: bool = False, csv_engine: str = "auto",
+                 csv_chunk_rows: int = DEFAULT_CHUNK_ROWS, csv_cache: bool = True,
+                 csv_cache_dir: Optional[str] = None, csv_preload: bool = False,
+                 batch_size: int = 1, batch_delay_ms: float = 50.0,
+                 spool_dir: Optional[str] = None, spool_max_mb: float = 64.0,
+                 controller: Optional[AdaptiveController] = None, metrics_file: Optional[str] = None,
+                 import_profile: bool = False):
         """
         Initialize sensor client
 
@@ -101,6 +128,18 @@ class SensorClient:
             proof_data: Proof template (if None, uses builtin sample)
             csv_path: Path to CSV file (if None, simulates random values)
             compute_challenges: If True, compute and include FS challenges in request
+            csv_engine: CSV reader: 'pandas', 'csv' (stdlib) or 'auto'
+            csv_chunk_rows: Rows per streamed CSV chunk
+            csv_cache: If True, memory-map a per-column .npy cache of the CSV
+            csv_cache_dir: Cache directory (default: .hai_cache/ next to the CSV)
+            csv_preload: Without the cache, extract the column into one in-memory array
+            batch_size: If > 1, coalesce readings into batch verify requests of up to this many items
+            batch_delay_ms: Max time a reading waits for its batch to fill before it is sent
+            spool_dir: If set, requests that fail to reach the server are kept here and resent later
+            spool_max_mb: Spool size cap; the oldest spooled requests are dropped beyond it
+            controller: Adaptive backpressure controller (sets concurrency, batch size and sampling rate)
+            metrics_file: Write the controller's metrics here (Prometheus text format) once per window
+            import_profile: If True, print per-phase startup timing after the first transmission
         """
         self.server_url = server_url.rstrip('/')
         self.sensor_name = sensor_name
@@ -108,18 +147,50 @@ class SensorClient:
         self.proof_template = proof_data if proof_data else BUILTIN_SAMPLE_PROOF
         self.csv_path = csv_path
         self.compute_challenges = compute_challenges
+        self.import_profile = import_profile
 
-        # CSV data
-        self.csv_data = None
-        self.csv_index = 0
+        # CSV data (mmap'd column cache, or streamed sensor column)
+        self.csv_engine = csv_engine
+        self.csv_chunk_rows = csv_chunk_rows
+        self.csv_cache = csv_cache
+        self.csv_cache_dir = csv_cache_dir
+        self.csv_preload = csv_preload
+        self.data_source = None
 
         if self.mode not in ["ZK_ONLY", "RAW"]:
             raise ValueError(f"Invalid mode: {mode}. Must be 'ZK_ONLY' or 'RAW'")
 
+        # Offline spool: unreachable-server failures are replayed in the background with backoff
+        self.spool = None
+        if spool_dir:
+            self.replay_session = requests.Session()
+            self.spool = Spool(spool_dir, handlers={"verify": self._replay_verify},
+                               max_bytes=int(spool_max_mb * 1024 * 1024))
+            spool_stats = self.spool.get_stats()
+            print(f"[INIT] Spool: {spool_dir} (max {spool_max_mb} MB, {spool_stats['pending_bytes']} bytes pending)")
+
+        # Request coalescing (batch endpoint); results arrive via _on_verify_result.
+        # With a controller, sends always go through the coalescer, which then takes its
+        # batch size and concurrency from the controller.
+        self.controller = controller
+        self.metrics_file = metrics_file
+        self._metrics_written_at = 0.0
+        self.coalescer = None
+        if batch_size > 1 or controller is not None:
+            max_pending = controller.max_batch * controller.max_in_flight * 4 if controller else 0
+            self.coalescer = VerifyCoalescer(self.server_url, max_batch=batch_size,
+                                             max_delay_ms=batch_delay_ms, on_result=self._on_verify_result,
+                                             on_unreachable=self._spool_verify if self.spool else None,
+                                             controller=controller, max_pending=max_pending)
+            if controller is not None:
+                print(f"[INIT] Adaptive: p90 target={controller.latency_target_ms}ms, "
+                      f"error rate<={controller.error_threshold}, in_flight<={controller.max_in_flight}, "
+                      f"batch<={controller.max_batch}, slowdown<={controller.max_slowdown}x")
+            else:
+                print(f"[INIT] Coalescing: max_batch={batch_size}, max_delay={batch_delay_ms}ms")
+
         # Load CSV if provided
         if csv_path:
-            if not PANDAS_AVAILABLE:
-                raise RuntimeError("CSV mode requires pandas. Install with: pip3 install pandas")
             self._load_csv()
 
         print(f"[INIT] Sensor Client")
@@ -132,14 +203,13 @@ class SensorClient:
             print(f"  Compute FS challenges: {'Yes' if compute_challenges else 'No (server-side)'}")
 
     def _load_csv(self):
-        """Load CSV data"""
+        """Open the sensor column (cached .npy mmap, or streamed CSV)"""
         try:
-            self.csv_data = pd.read_csv(self.csv_path)
-            if self.sensor_name not in self.csv_data.columns:
-                available = [col for col in self.csv_data.columns if col.startswith('P')][:5]
-                raise ValueError(f"Sensor '{self.sensor_name}' not in CSV. Available: {available}")
-            print(f"  CSV rows: {len(self.csv_data)}")
-            print(f"  Value range: [{self.csv_data[self.sensor_name].min():.3f}, {self.csv_data[self.sensor_name].max():.3f}]")
+            self.data_source = open_sensor_source(self.csv_path, self.sensor_name,
+                                                  engine=self.csv_engine, chunk_rows=self.csv_chunk_rows,
+                                                  use_cache=self.csv_cache, cache_dir=self.csv_cache_dir,
+                                                  preload=self.csv_preload)
+            print(f"  CSV: {self.data_source.describe()}")
         except Exception as e:
             raise RuntimeError(f"Failed to load CSV: {e}")
 
@@ -150,13 +220,9 @@ class SensorClient:
         Returns:
             Sensor value (float)
         """
-        if self.csv_data is not None:
-            # Read from CSV
-            if self.csv_index >= len(self.csv_data):
-                self.csv_index = 0  # Loop
-            value = float(self.csv_data[self.sensor_name].iloc[self.csv_index])
-            self.csv_index += 1
-            return value
+        if self.data_source is not None:
+            # Read from CSV (loops at EOF)
+            return self.data_source.next_value()
         else:
             # Simulate: normal distribution (mean=5, std=2)
             return max(0.0, random.gauss(5.0, 2.0))
@@ -177,46 +243,8 @@ class SensorClient:
         Returns:
             Dictionary with y, z, x challenges (64 hex chars each)
         """
-        domain = "ICS_BULLETPROOF_VERIFIER_v1"
-        n = 32
-
         proof = self.proof_template.get("proof", {})
-        A = proof.get("A", "")
-        S = proof.get("S", "")
-        T1 = proof.get("T1", "")
-        T2 = proof.get("T2", "")
-
-        # y = H(domain||n||A||S)
-        h_y = hashlib.sha256()
-        h_y.update(domain.encode('utf-8'))
-        h_y.update(n.to_bytes(4, 'big'))
-        h_y.update(bytes.fromhex(A))
-        h_y.update(bytes.fromhex(S))
-        y = h_y.hexdigest().upper()
-
-        # z = H(domain||n||A||S||y)
-        h_z = hashlib.sha256()
-        h_z.update(domain.encode('utf-8'))
-        h_z.update(n.to_bytes(4, 'big'))
-        h_z.update(bytes.fromhex(A))
-        h_z.update(bytes.fromhex(S))
-        h_z.update(bytes.fromhex(y))
-        z = h_z.hexdigest().upper()
-
-        # x = H(domain||n||T1||T2||z)
-        h_x = hashlib.sha256()
-        h_x.update(domain.encode('utf-8'))
-        h_x.update(n.to_bytes(4, 'big'))
-        h_x.update(bytes.fromhex(T1))
-        h_x.update(bytes.fromhex(T2))
-        h_x.update(bytes.fromhex(z))
-        x = h_x.hexdigest().upper()
-
-        return {
-            "y": y,
-            "z": z,
-            "x": x
-        }
+        return proof_challenges(FS_TRANSCRIPT, proof)
 
     def _build_request(self, sensor_value: float) -> Dict[str, Any]:
         """
@@ -285,39 +313,101 @@ class SensorClient:
             True if successful, False otherwise
         """
         request_data = self._build_request(sensor_value)
+        if self.coalescer is not None:
+            # Queued for the next batch; the result is logged by _on_verify_result
+            if self.coalescer.submit(request_data):
+                return True
+            # Send queue full (adaptive backpressure): keep the reading in the spool or shed it
+            self.controller.shed.inc()
+            if self.spool is not None:
+                self._spool_verify(request_data)
+            log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name, value=round(sensor_value, 3),
+                      result="SPOOLED" if self.spool is not None else "SHED", reason="send queue full")
+            return False
+
         endpoint = f"{self.server_url}/api/v1/verify/bulletproof"
 
         try:
             response = requests.post(endpoint, json=request_data, timeout=10)
             status_code = response.status_code
 
+            if status_code >= 500 and self.spool is not None:
+                self._spool_verify(request_data)
+                log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name,
+                          value=round(sensor_value, 3), result="SPOOLED", code=status_code)
+                return False
+
             # Check for success
             if status_code == 200:
+                if self.spool is not None:
+                    self.spool.kick()
                 try:
                     result = response.json()
                     if result.get("ok") == True or result.get("verified") == True:
-                        print(f"[✅ OK] sensor={self.sensor_name} value={sensor_value:.3f}")
+                        log_event(logger, logging.INFO, "verify", sensor=self.sensor_name,
+                                  value=round(sensor_value, 3), result="OK")
                         return True
                     else:
-                        body_preview = json.dumps(result)[:180]
-                        print(f"[⚠️ FAIL] sensor={self.sensor_name} value={sensor_value:.3f} body={body_preview}")
+                        log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name,
+                                  value=round(sensor_value, 3), result="FAIL", body=json.dumps(result)[:180])
                         return False
                 except json.JSONDecodeError:
-                    body_preview = response.text[:180]
-                    print(f"[⚠️ FAIL] sensor={self.sensor_name} value={sensor_value:.3f} body={body_preview}")
+                    log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name,
+                              value=round(sensor_value, 3), result="FAIL", body=response.text[:180])
                     return False
             else:
-                body_preview = response.text[:180]
-                print(f"[⚠️ FAIL] sensor={self.sensor_name} value={sensor_value:.3f} code={status_code} body={body_preview}")
+                log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name,
+                          value=round(sensor_value, 3), result="FAIL", code=status_code, body=response.text[:180])
                 return False
 
         except requests.exceptions.RequestException as e:
-            print(f"[⚠️ FAIL] sensor={self.sensor_name} value={sensor_value:.3f} error={str(e)[:180]}")
+            if self.spool is not None:
+                self._spool_verify(request_data)
+            log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name, value=round(sensor_value, 3),
+                      result="SPOOLED" if self.spool is not None else "FAIL", error=str(e)[:180])
             return False
         except Exception as e:
-            print(f"[⚠️ FAIL] sensor={self.sensor_name} value={sensor_value:.3f} exception={str(e)[:180]}")
+            log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name,
+                      value=round(sensor_value, 3), result="FAIL", exception=str(e)[:180])
             return False
 
+    def _write_metrics(self, force: bool = False):
+        """Refresh the controller metrics file at most once per controller window"""
+        now = time.monotonic()
+        if not self.metrics_file or (not force and now - self._metrics_written_at < self.controller.window_s):
+            return
+        self._metrics_written_at = now
+        try:
+            self.controller.write_metrics(self.metrics_file)
+        except OSError as e:
+            log_event(logger, logging.WARNING, "metrics-write-error", path=self.metrics_file, error=str(e)[:180])
+
+    def _spool_verify(self, request_data: Dict):
+        try:
+            self.spool.append("verify", request_data)
+        except OSError as e:
+            log_event(logger, logging.WARNING, "spool-error", sensor=self.sensor_name, error=str(e)[:180])
+
+    def _replay_verify(self, requests_data: List[Dict]) -> int:
+        """Spool handler: resend spooled verify requests; returns how many reached the server"""
+        return replay_verify(self.replay_session, self.server_url, requests_data)
+
+    def _on_verify_result(self, request_data: Dict, result: Optional[Dict], error: Optional[str],
+                          latency_ms: float):
+        """Log one coalesced reading's verification result (called from the coalescer thread)"""
+        sensor_value = int(request_data["opening"]["x"], 16) / 1000
+        if error is None and self.spool is not None:
+            self.spool.kick()
+        if error is not None:
+            log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name,
+                      value=round(sensor_value, 3), result="FAIL", error=error)
+        elif result.get("ok") == True or result.get("verified") == True:
+            log_event(logger, logging.INFO, "verify", sensor=self.sensor_name,
+                      value=round(sensor_value, 3), result="OK", latency_ms=round(latency_ms, 1))
+        else:
+            log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name,
+                      value=round(sensor_value, 3), result="FAIL", body=json.dumps(result)[:180])
+
     def run(self, interval: float = 1.0, once: bool = False):
         """
         Run sensor transmission loop
@@ -336,18 +426,45 @@ class SensorClient:
                 sensor_value = self._get_sensor_value()
                 self.send_value(sensor_value)
 
+                if self.import_profile and iteration == 1:
+                    STARTUP.mark("first transmission")
+                    print(STARTUP.report())
+
                 if once:
                     print(f"\n[DONE] Single transmission completed")
                     break
 
-                time.sleep(interval)
+                if self.controller is not None:
+                    self.controller.tick()
+                    self._write_metrics()
+                    time.sleep(interval * self.controller.interval_factor)
+                else:
+                    time.sleep(interval)
 
         except KeyboardInterrupt:
             print(f"\n\n[STOP] User interrupted after {iteration} transmissions")
         except Exception as e:
-            print(f"\n[ERROR] Unexpected error: {e}")
-            import traceback
-            traceback.print_exc()
+            log_event(logger, logging.ERROR, "unexpected-error", error=str(e), exc_info=True)
+        finally:
+            if self.coalescer is not None:
+                self.coalescer.close()
+                batch_stats = self.coalescer.get_stats()
+                print(f"[BATCH] requests={batch_stats['requests']} batches={batch_stats['batches']} items={batch_stats['items']} "
+                      f"avg_batch_size={batch_stats['avg_batch_size']} batch_supported={batch_stats['batch_supported']}")
+            if self.controller is not None:
+                self._write_metrics(force=True)
+                adaptive = self.controller.get_stats()
+                print(f"[ADAPT] level={adaptive['level']}/{adaptive['max_level']} "
+                      f"escalations={adaptive['escalations']} recoveries={adaptive['recoveries']} "
+                      f"shed={adaptive['shed']} last_p90={adaptive['last_p90_ms']}ms")
+            if self.spool is not None:
+                self.spool.close()
+                spool_stats = self.spool.get_stats()
+                print(f"[SPOOL] appended={spool_stats['appended']} replayed={spool_stats['replayed']} "
+                      f"dropped={spool_stats['dropped_records']} pending_bytes={spool_stats['pending_bytes']}")
+            stats = get_log_stats()
+            print(f"[LOG] records={stats['enqueued_total']} sampled_out={stats['sampled_out']} "
+                  f"rate_limited={stats['rate_limited']} dropped={stats['dropped_queue_full']}")
 
 
 def load_proof_file(filepath: str) -> Dict:
@@ -392,6 +509,18 @@ Examples:
 
   # Single transmission
   python sensor_client.py --server http://192.168.0.11:8085 --sensor P1_PIT01 --mode RAW --once
+
+  # Coalesce readings into batch verify requests
+  python sensor_client.py --server http://192.168.0.11:8085 --sensor P1_PIT01 --interval 0.01 --batch-size 16 --batch-delay-ms 200
+
+  # Spool requests while the server is unreachable and resend them later
+  python sensor_client.py --server http://192.168.0.11:8085 --sensor P1_PIT01 --spool-dir ./spool
+
+  # Adapt to a slow verifier within operator-set bounds
+  python sensor_client.py --server http://192.168.0.11:8085 --sensor P1_PIT01 --interval 0.1 --adaptive --adaptive-max-slowdown 4
+
+  # Report startup time per phase (imports, init, first transmission)
+  python sensor_client.py --server http://192.168.0.11:8085 --sensor P1_PIT01 --once --import-profile
         """
     )
 
@@ -405,15 +534,41 @@ Examples:
                         help="Path to proof JSON file (ZK_ONLY mode). Uses built-in sample if not provided.")
     parser.add_argument("--csv", default=None,
                         help="Path to CSV file with sensor data. If not provided, simulates random values.")
+    parser.add_argument("--csv-engine", choices=list(CSV_ENGINES), default="auto",
+                        help="CSV reader: pandas, csv (stdlib) or auto (default: auto)")
+    parser.add_argument("--csv-chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"Rows per streamed CSV chunk (default: {DEFAULT_CHUNK_ROWS})")
+    parser.add_argument("--csv-cache-dir", default=None,
+                        help="Directory for the binary column cache (default: .hai_cache/ next to the CSV)")
+    parser.add_argument("--no-csv-cache", action="store_true",
+                        help="Stream the CSV on every start instead of memory-mapping the column cache")
+    parser.add_argument("--csv-preload", action="store_true",
+                        help="With --no-csv-cache, extract the column into one in-memory array instead of streaming")
     parser.add_argument("--interval", type=float, default=1.0,
                         help="Time interval between transmissions in seconds (default: 1.0)")
     parser.add_argument("--once", action="store_true",
                         help="Send only one transmission and exit")
     parser.add_argument("--compute-challenges", action="store_true",
                         help="Compute and include Fiat-Shamir challenges for cross-verification (ZK_ONLY mode only)")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="Coalesce up to N readings into one batch verify request; 1 sends each reading on its own (default: 1)")
+    parser.add_argument("--batch-delay-ms", type=float, default=50.0,
+                        help="Max time a reading waits for its batch to fill (default: 50ms)")
+    parser.add_argument("--spool-dir", default=None,
+                        help="Keep requests that cannot reach the server in this directory and resend them later")
+    parser.add_argument("--spool-max-mb", type=float, default=64.0,
+                        help="Spool size cap in MB; the oldest requests are dropped beyond it (default: 64)")
+    parser.add_argument("--import-profile", action="store_true",
+                        help="Print per-phase startup timing (imports, init, first transmission) after the first send")
+    add_adaptive_arguments(parser)
+    add_logging_arguments(parser)
 
     args = parser.parse_args()
 
+    configure_logging(level=args.log_level, fmt=args.log_format,
+                      sample_rate=args.log_sample, rate_limit=args.log_rate_limit)
+    STARTUP.mark("argument parsing + logging setup")
+
     print("=" * 60)
     print("HAI Sensor Client")
     print("=" * 60)
@@ -428,12 +583,6 @@ Examples:
             print(f"[INFO] Using built-in sample proof instead")
             proof_data = None
 
-    # Check CSV availability
-    if args.csv and not PANDAS_AVAILABLE:
-        print(f"[ERROR] CSV mode requires pandas library")
-        print(f"[INFO] Install with: pip3 install pandas")
-        return 1
-
     # Create client
     try:
         client = SensorClient(
@@ -442,11 +591,24 @@ Examples:
             mode=args.mode,
             proof_data=proof_data,
             csv_path=args.csv,
-            compute_challenges=args.compute_challenges
+            compute_challenges=args.compute_challenges,
+            csv_engine=args.csv_engine,
+            csv_chunk_rows=args.csv_chunk_rows,
+            csv_cache=not args.no_csv_cache,
+            csv_cache_dir=args.csv_cache_dir,
+            csv_preload=args.csv_preload,
+            batch_size=args.batch_size,
+            batch_delay_ms=args.batch_delay_ms,
+            spool_dir=args.spool_dir,
+            spool_max_mb=args.spool_max_mb,
+            controller=controller_from_args(args),
+            metrics_file=args.adaptive_metrics_file,
+            import_profile=args.import_profile
         )
     except Exception as e:
         print(f"[ERROR] Failed to initialize client: {e}")
         return 1
+    STARTUP.mark("client init")
 
     # Run transmission loop
     try:
@@ -9,7 +9,8 @@ Sensor Client with Selective Disclosure (Policy + Privacy) - Production Ready
 - 서버가 /api/v1/reveal-raw로 요청하면 Reveal 서버가 RAW 값 제공
 
 Dependencies:
-    pip3 install requests pandas
+    pip3 install requests
+    pip3 install pandas  # optional: faster CSV parsing (stdlib csv is used otherwise)
 
 Usage:
     # Production Mode (간결한 로그)
@@ -17,6 +18,27 @@ Usage:
 
     # Test Mode (상세 로그)
     python3 sensor_client_selective_disclosure.py --server http://192.168.0.11:8085 --sensor DM-PIT01 --csv ./data/hai.csv --mode test
+
+    # 요청 묶음 전송 (최대 16개 또는 500ms마다 batch POST 1회)
+    python3 sensor_client_selective_disclosure.py --server http://192.168.0.11:8085 --sensor DM-PIT01 --interval 0.05 --batch-size 16 --batch-delay-ms 500
+
+    # 서버 연결 실패 시 증명/RAW 저장 요청을 ./spool에 보관했다가 재전송
+    python3 sensor_client_selective_disclosure.py --server http://192.168.0.11:8085 --sensor DM-PIT01 --spool-dir ./spool
+
+    # 검증 서버가 느려지면 동시 요청 축소 -> batch 전송 -> 샘플링 간격 증가 (운영자 상한 안에서)
+    python3 sensor_client_selective_disclosure.py --server http://192.168.0.11:8085 --sensor DM-PIT01 --interval 0.2 --adaptive
+
+    # 천천히 변하는 센서: 측정값마다 commitment만, 30개마다 합계 Bulletproof 하나
+    python3 sensor_client_selective_disclosure.py --server http://192.168.0.11:8085 --sensor LIT301 --window 30
+
+    # 거의 일정한 센서: 값이 0.05 넘게 바뀌거나 60초가 지났을 때만 증명, 그 사이에는 서명된 heartbeat
+    ICS_HEARTBEAT_KEY=secret python3 sensor_client_selective_disclosure.py --server http://192.168.0.11:8085 --sensor DM-PIT01 --deadband-abs 0.05 --max-staleness 60
+
+    # 샘플링 주기가 증명 시간보다 짧을 때: commitment는 즉시, 증명은 나중에 16개씩 batch로
+    python3 sensor_client_selective_disclosure.py --server http://192.168.0.11:8085 --sensor DM-PIT01 --interval 0.2 --deferred --deferred-batch 16
+
+    # 시작 단계별 소요 시간 (import, 초기화, 첫 증명) 출력
+    python3 sensor_client_selective_disclosure.py --server http://192.168.0.11:8085 --sensor DM-PIT01 --once --import-profile
 """
 
 import sys
@@ -24,9 +46,19 @@ import time
 import json
 import argparse
 import random
-import hashlib
-from datetime import datetime
-from typing import Dict, Any, Optional
+import logging
+from importlib.util import find_spec
+from typing import Dict, Any, List, Optional, Tuple
+
+from startup_profile import STARTUP
+from log_pipeline import configure_logging, add_logging_arguments, get_logger, get_log_stats, log_event
+from data_source import CSV_ENGINES, DEFAULT_CHUNK_ROWS, open_sensor_source
+from spool import Spool
+from adaptive_controller import AdaptiveController, add_adaptive_arguments, controller_from_args
+from verify_coalescer import VerifyCoalescer, replay_verify
+from commit_window import ClosedWindow, CommitWindow
+from deadband import DeadbandPolicy, add_deadband_arguments, deadband_from_args, heartbeat_key_from
+from deferred_prover import DeferredProver, add_deferred_arguments
 
 try:
     import requests
@@ -34,23 +66,13 @@ except ImportError:
     print("Error: 'requests' library not found. Install with: pip3 install requests")
     sys.exit(1)
 
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
-    print("Warning: 'pandas' not installed. CSV mode disabled. Install with: pip3 install pandas")
+# Bulletproof prover(petlib)는 첫 증명 시점에 import (import만 ~0.1초, generator 생성 ~70ms)
+PROVER_MODULE = "crypto.bulletproof_prover_production"
+PROVER_AVAILABLE = find_spec("petlib") is not None
 
-try:
-    from crypto.bulletproof_prover_production import generate_range_proof
-    PROVER_AVAILABLE = True
-    print("[INIT] Using Production Mode Bulletproof prover (server-compatible)")
-except ImportError as e:
-    PROVER_AVAILABLE = False
-    print(f"Error: Bulletproof prover not available: {e}")
-    print("Make sure crypto/bulletproof_prover_production.py exists and petlib is installed")
-    print("Install petlib with: pip3 install petlib")
-    sys.exit(1)
+logger = get_logger("sensor_client_selective_disclosure")
+
+STARTUP.mark("module imports")
 
 
 class SelectiveDisclosureClient:
@@ -60,7 +82,18 @@ class SelectiveDisclosureClient:
                  reveal_url: str = "http://127.0.0.1:9000",
                  csv_path: Optional[str] = None,
                  range_min: float = 0.0, range_max: float = 4294967.295,
-                 mode: str = "production"):
+                 mode: str = "production", csv_engine: str = "auto",
+                 csv_chunk_rows: int = DEFAULT_CHUNK_ROWS, csv_cache: bool = True,
+                 csv_cache_dir: Optional[str] = None, csv_preload: bool = False,
+                 batch_size: int = 1, batch_delay_ms: float = 50.0,
+                 spool_dir: Optional[str] = None, spool_max_mb: float = 64.0,
+                 controller: Optional[AdaptiveController] = None, metrics_file: Optional[str] = None,
+                 import_profile: bool = False, window_size: int = 0,
+                 deadband: Optional[DeadbandPolicy] = None, heartbeat_key: Optional[bytes] = None,
+                 deadband_metrics_file: Optional[str] = None, deferred: bool = False,
+                 deferred_batch: int = 16, deferred_delay_ms: float = 1000.0,
+                 deferred_metrics_file: Optional[str] = None, deferred_max_backlog: int = 32,
+                 ipa_cutoff: int = 1):
         """
         Args:
             server_url: 검증 서버 URL (Bulletproof 서버)
@@ -70,6 +103,32 @@ class SelectiveDisclosureClient:
             range_min: 센서 값 최소 범위 (기본: 0.0)
             range_max: 센서 값 최대 범위 (기본: 4294967.295)
             mode: 'production' (간결한 로그) or 'test' (상세 로그)
+            csv_engine: CSV reader ('pandas', 'csv' 또는 'auto')
+            csv_chunk_rows: 스트리밍 chunk당 행 수
+            csv_cache: True면 컬럼별 .npy 캐시를 mmap으로 사용
+            csv_cache_dir: 캐시 디렉터리 (기본: CSV 옆 .hai_cache/)
+            csv_preload: 캐시 미사용 시 컬럼을 메모리 연속 배열로 미리 추출
+            batch_size: 1보다 크면 검증 요청을 최대 이 개수까지 묶어 batch endpoint로 전송
+            batch_delay_ms: batch가 찰 때까지 요청이 기다리는 최대 시간
+            spool_dir: 지정하면 서버에 전달하지 못한 검증/RAW 저장 요청을 보관했다가 재전송
+            spool_max_mb: spool 크기 상한 (넘으면 가장 오래된 요청부터 버림)
+            controller: adaptive backpressure controller (동시 요청 수, batch 크기, 샘플링 간격 결정)
+            metrics_file: controller 메트릭(Prometheus text format)을 window마다 기록할 파일
+            import_profile: True면 첫 전송 후 시작 단계별 소요 시간 출력
+            window_size: 1보다 크면 측정값마다 commitment만 보내고 K개마다 합계 증명 하나 전송
+                         (slow-moving 센서용, commit_window.py)
+            deadband: 지정하면 값이 마지막 증명 값의 band를 벗어나거나 오래됐을 때만 증명하고
+                      그 사이에는 서명된 heartbeat 전송 (deadband.py)
+            heartbeat_key: heartbeat HMAC key (deadband 사용 시 필수)
+            deadband_metrics_file: deadband 메트릭(Prometheus text format)을 기록할 파일
+            deferred: True면 commitment만 즉시 게시하고 range proof는 백그라운드에서 생성해
+                      나중에 batch로 제출 (deferred_prover.py)
+            deferred_batch: deferred 증명 제출 batch당 최대 증명 수
+            deferred_delay_ms: 증명 완성 후 제출까지 최대 대기 시간
+            deferred_metrics_file: deferred 메트릭(Prometheus text format)을 기록할 파일
+            deferred_max_backlog: 증명을 기다리는 commitment 상한 (넘으면 그 측정값은 바로 증명)
+            ipa_cutoff: 1보다 크면 IPA를 길이 k에서 멈추고 a, b 벡터를 그대로 전송
+                        (wire version 2, 지원하는 검증기 전용 - crypto/range_proof.py)
         """
         self.server_url = server_url
         self.sensor_name = sensor_name
@@ -82,34 +141,107 @@ class SelectiveDisclosureClient:
         self.n_bits = 32
         self.mode = mode  # production or test
         self.verbose = (mode == "test")  # test 모드에서만 상세 로그
-
-        # CSV 데이터 로드
-        self.csv_data = None
-        self.csv_index = 0
-        if csv_path and PANDAS_AVAILABLE:
+        self.import_profile = import_profile
+        self._prover = None  # 첫 증명 시 생성 (_get_prover)
+        self.ipa_cutoff = ipa_cutoff
+        self.window_size = window_size
+        self._window: Optional[CommitWindow] = None  # 첫 측정값에서 생성 (_get_window)
+        if deadband is not None and not heartbeat_key:
+            raise ValueError("deadband mode requires a heartbeat key")
+        self.deadband = deadband
+        self.heartbeat_key = heartbeat_key
+        self.deadband_metrics_file = deadband_metrics_file
+        if deferred and window_size > 1:
+            raise ValueError("deferred proofs and window mode cannot be combined")
+        self.deferred = deferred
+        self.deferred_batch = deferred_batch
+        self.deferred_delay_ms = deferred_delay_ms
+        self.deferred_metrics_file = deferred_metrics_file
+        self.deferred_max_backlog = deferred_max_backlog
+        self._deferred: Optional[DeferredProver] = None  # 첫 측정값에서 생성 (_get_deferred)
+        self._extra_metrics_written_at = 0.0
+
+        # CSV 데이터 소스 (.npy 캐시 mmap 또는 센서 컬럼 스트리밍)
+        self.csv_engine = csv_engine
+        self.csv_chunk_rows = csv_chunk_rows
+        self.csv_cache = csv_cache
+        self.csv_cache_dir = csv_cache_dir
+        self.csv_preload = csv_preload
+        self.data_source = None
+        if csv_path:
             self._load_csv(csv_path)
 
+        # 오프라인 spool: 연결 실패한 요청을 디스크에 보관, drainer가 backoff로 재전송
+        self.spool = None
+        if spool_dir:
+            self.replay_session = requests.Session()
+            self.spool = Spool(spool_dir, handlers={"verify": self._replay_verify, "store": self._replay_store},
+                               max_bytes=int(spool_max_mb * 1024 * 1024))
+            spool_stats = self.spool.get_stats()
+            print(f"[INIT] Spool: {spool_dir} (max {spool_max_mb} MB, {spool_stats['pending_bytes']} bytes pending)")
+
+        # 요청 묶음 전송 (결과는 coalescer 스레드에서 _on_verify_result로 전달)
+        # controller가 있으면 항상 coalescer로 보내고, batch 크기와 동시 요청 수는 controller가 결정
+        self.controller = controller
+        self.metrics_file = metrics_file
+        self._metrics_written_at = 0.0
+        self.coalescer = None
+        self._pending_values: Dict[str, float] = {}
+        if batch_size > 1 or controller is not None:
+            max_pending = controller.max_batch * controller.max_in_flight * 4 if controller else 0
+            self.coalescer = VerifyCoalescer(server_url, max_batch=batch_size, max_delay_ms=batch_delay_ms,
+                                             on_result=self._on_verify_result,
+                                             on_unreachable=self._spool_append_verify if self.spool else None,
+                                             controller=controller, max_pending=max_pending)
+            if controller is not None:
+                print(f"[INIT] Adaptive: p90 target={controller.latency_target_ms}ms, "
+                      f"error rate<={controller.error_threshold}, in_flight<={controller.max_in_flight}, "
+                      f"batch<={controller.max_batch}, slowdown<={controller.max_slowdown}x")
+            else:
+                print(f"[INIT] Coalescing: max_batch={batch_size}, max_delay={batch_delay_ms}ms")
+
     def _load_csv(self, csv_path: str):
-        """CSV 파일 로드"""
+        """센서 컬럼 소스 열기 (.npy 캐시 mmap, 실패 시 스트리밍)"""
         try:
-            df = pd.read_csv(csv_path)
-            if self.sensor_name not in df.columns:
-                available = list(df.columns[:10])
-                print(f"Error: Sensor '{self.sensor_name}' not in CSV. Available: {available}")
-                sys.exit(1)
-
-            self.csv_data = df[self.sensor_name].dropna().values
-            print(f"[INIT] CSV 로드: {len(self.csv_data)} rows, range=[{self.csv_data.min():.3f}, {self.csv_data.max():.3f}]")
+            self.data_source = open_sensor_source(csv_path, self.sensor_name,
+                                                  engine=self.csv_engine, chunk_rows=self.csv_chunk_rows,
+                                                  use_cache=self.csv_cache, cache_dir=self.csv_cache_dir,
+                                                  preload=self.csv_preload)
+            print(f"[INIT] CSV: {self.data_source.describe()}")
         except Exception as e:
             print(f"Error loading CSV: {e}")
             sys.exit(1)
 
+    def _get_prover(self):
+        """prover 모듈 import + generator 생성을 첫 증명 시점에 한 번만 수행"""
+        if self._prover is None:
+            prover_module = STARTUP.lazy_import(PROVER_MODULE)
+            start = time.perf_counter()
+            prover = prover_module.get_prover(self.n_bits, self.domain)
+            prover.h, prover.g_vec, prover.h_vec  # cached_property: 여기서 로드/생성
+            source = prover.generator_store.last_status if prover.generator_store else "computed"
+            STARTUP.detail(f"generators (H, G_vec, H_vec: {source})", time.perf_counter() - start)
+            self._prover = prover
+        return self._prover
+
+    def _get_window(self) -> CommitWindow:
+        if self._window is None:
+            self._window = CommitWindow(self._get_prover(), self.window_size, ipa_cutoff=self.ipa_cutoff)
+        return self._window
+
+    def _get_deferred(self) -> DeferredProver:
+        if self._deferred is None:
+            self._deferred = DeferredProver(self._get_prover(), self.server_url, self._deferred_proof_request,
+                                            max_batch=self.deferred_batch, max_delay_ms=self.deferred_delay_ms,
+                                            on_result=self._on_deferred_result,
+                                            on_unreachable=self._spool_append_verify if self.spool else None,
+                                            ipa_cutoff=self.ipa_cutoff, max_backlog=self.deferred_max_backlog)
+        return self._deferred
+
     def _get_next_value(self) -> float:
         """다음 센서 값 가져오기"""
-        if self.csv_data is not None:
-            value = float(self.csv_data[self.csv_index % len(self.csv_data)])
-            self.csv_index += 1
-            return value
+        if self.data_source is not None:
+            return self.data_source.next_value()
         else:
             # 시뮬레이션: 정규분포 (평균=5, 표준편차=2)
             return max(0, random.gauss(5.0, 2.0))
@@ -118,41 +250,6 @@ class SelectiveDisclosureClient:
         """24자리 랜덤 hex nonce 생성"""
         return ''.join(random.choices('0123456789ABCDEF', k=24))
 
-    def _compute_fiat_shamir_challenges(self, proof: Dict[str, Any]) -> Dict[str, str]:
-        """Fiat-Shamir 챌린지 계산"""
-        A = proof.get("A", "")
-        S = proof.get("S", "")
-        T1 = proof.get("T1", "")
-        T2 = proof.get("T2", "")
-
-        # y = H(domain||n||A||S)
-        h_y = hashlib.sha256()
-        h_y.update(self.domain.encode('utf-8'))
-        h_y.update(self.n_bits.to_bytes(4, 'big'))
-        h_y.update(bytes.fromhex(A))
-        h_y.update(bytes.fromhex(S))
-        y = h_y.hexdigest().upper()
-
-        # z = H(domain||n||A||S||y)
-        h_z = hashlib.sha256()
-        h_z.update(self.domain.encode('utf-8'))
-        h_z.update(self.n_bits.to_bytes(4, 'big'))
-        h_z.update(bytes.fromhex(A))
-        h_z.update(bytes.fromhex(S))
-        h_z.update(bytes.fromhex(y))
-        z = h_z.hexdigest().upper()
-
-        # x = H(domain||n||T1||T2||z)
-        h_x = hashlib.sha256()
-        h_x.update(self.domain.encode('utf-8'))
-        h_x.update(self.n_bits.to_bytes(4, 'big'))
-        h_x.update(bytes.fromhex(T1))
-        h_x.update(bytes.fromhex(T2))
-        h_x.update(bytes.fromhex(z))
-        x = h_x.hexdigest().upper()
-
-        return {"y": y, "z": z, "x": x}
-
     def _build_zk_request(self, sensor_value: float, event_ts: int, nonce: str) -> Optional[Dict[str, Any]]:
         """ZK_ONLY 요청 생성 (실제 Bulletproof 증명 생성)"""
         # Scale value: convert float to integer (value * 1000)
@@ -160,88 +257,259 @@ class SelectiveDisclosureClient:
 
         # Validate range: must fit in 32 bits (0 to 2^32-1)
         if scaled_value < 0 or scaled_value >= 2**self.n_bits:
-            print(f"[⚠️ RANGE-ERROR] Scaled value {scaled_value} out of range [0, {2**self.n_bits-1}]")
+            log_event(logger, logging.WARNING, "range-error", sensor=self.sensor_name,
+                      scaled=scaled_value, max=2**self.n_bits - 1)
             return None
 
         try:
             # Generate fresh Bulletproof for this value (Production Mode)
-            proof_data = generate_range_proof(scaled_value, nonce, n=self.n_bits, domain=self.domain, mode="production")
-
-            # Extract commitment, proof, and blinding factor
-            commitment = proof_data["commitment"]
-            proof = proof_data["proof"]
-            blinding_factor = proof_data["blinding_factor"]
-
-            # Prepare value in hex format
-            value_hex = format(scaled_value, '064x')
-
-            # Convert range to scaled integers (value * 1000)
-            scaled_range_min = int(self.range_min * 1000)
-            scaled_range_max = int(self.range_max * 1000)
-
-            # ZK_ONLY 모드: opening 필드 제외 (RAW 값은 Reveal 서버로만 전송)
-            request = {
-                "mode": "ZK_ONLY",
-                "sensor": self.sensor_name,
-                "ts": event_ts,
-                "nonce": nonce,
-                "type": "sensor_value",
-                "range_min": scaled_range_min,
-                "range_max": scaled_range_max,
-                "commitment": commitment,
-                "proof": proof,
-                "metadata": {
-                    "domain": self.domain,
-                    "n": self.n_bits,
-                    "encoding": "secp256k1-compressed-hex",
-                    "client": "sensor_client_selective_disclosure.py",
-                    "policy": "selective_disclosure",
-                    "raw_value_available": True,
-                    "proof_generation": "real_bulletproof",
-                    "client_mode": self.mode
-                }
+            prover = self._get_prover()
+            result = prover.prove(scaled_value, nonce, ipa_cutoff=self.ipa_cutoff)
+            return self._proof_request(result, event_ts, nonce)
+
+        except Exception as e:
+            log_event(logger, logging.ERROR, "proof-error", sensor=self.sensor_name, error=str(e),
+                      exc_info=self.verbose)
+            return None
+
+    def _proof_request(self, result, event_ts: int, nonce: str, mode: str = "ZK_ONLY",
+                       proof_generation: str = "real_bulletproof") -> Dict[str, Any]:
+        """RangeProof -> 검증 요청 (ZK_ONLY, deferred 모드에서는 ZK_DEFERRED)"""
+        proof_data = result.to_json_dict()
+
+        # Convert range to scaled integers (value * 1000)
+        scaled_range_min = int(self.range_min * 1000)
+        scaled_range_max = int(self.range_max * 1000)
+
+        # ZK_ONLY 모드: opening 필드 제외 (RAW 값은 Reveal 서버로만 전송)
+        request = {
+            "mode": mode,
+            "sensor": self.sensor_name,
+            "ts": event_ts,
+            "nonce": nonce,
+            "type": "sensor_value",
+            "range_min": scaled_range_min,
+            "range_max": scaled_range_max,
+            "commitment": proof_data["commitment"],
+            "proof": proof_data["proof"],
+            "metadata": {
+                "domain": self.domain,
+                "n": self.n_bits,
+                "encoding": "secp256k1-compressed-hex",
+                "client": "sensor_client_selective_disclosure.py",
+                "policy": "selective_disclosure",
+                "raw_value_available": True,
+                "proof_generation": proof_generation,
+                "client_mode": self.mode
             }
+        }
+
+        # Compute Fiat-Shamir challenges for cross-verification (인코딩된 포인트에서 직접 계산)
+        request["challenges"] = result.challenges()
+        return request
+
+    def _commitment_request(self, mode: str, event_ts: int, nonce: str, commitment: str,
+                            range_min: int, range_max: int,
+                            proof_generation: str = "window_aggregate") -> Dict[str, Any]:
+        return {
+            "mode": mode,
+            "sensor": self.sensor_name,
+            "ts": event_ts,
+            "nonce": nonce,
+            "type": "sensor_value",
+            "range_min": range_min,
+            "range_max": range_max,
+            "commitment": commitment,
+            "metadata": {
+                "domain": self.domain,
+                "n": self.n_bits,
+                "encoding": "secp256k1-compressed-hex",
+                "client": "sensor_client_selective_disclosure.py",
+                "policy": "selective_disclosure",
+                "raw_value_available": True,
+                "proof_generation": proof_generation,
+                "client_mode": self.mode
+            }
+        }
+
+    def _build_aggregate_request(self, closed: ClosedWindow, event_ts: int) -> Tuple[Dict[str, Any], float]:
+        """닫힌 window -> (ZK_AGGREGATE 요청, 로그용 합계 값)"""
+        scaled_min = int(self.range_min * 1000)
+        scaled_max = int(self.range_max * 1000)
+        proof = closed.proof
+        request = self._commitment_request("ZK_AGGREGATE", event_ts, self._generate_nonce(),
+                                           proof.to_json_dict()["commitment"], closed.count * scaled_min,
+                                           min(closed.count * scaled_max, 2 ** self.n_bits - 1))
+        request["proof"] = proof.to_json_dict()["proof"]
+        request["challenges"] = proof.challenges()
+        request["window"] = {"id": closed.window_id, "count": closed.count,
+                             "nonces": closed.nonces, "commitments": closed.commitments}
+        log_event(logger, logging.DEBUG, "window-close", sensor=self.sensor_name, window=closed.window_id,
+                  count=closed.count, prove_ms=round(closed.prove_ms, 1))
+        return request, closed.value_sum / 1000.0
+
+    def _build_window_requests(self, sensor_value: float, event_ts: int,
+                               nonce: str) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        window 모드: COMMIT_ONLY 요청 (+ window가 닫히면 ZK_AGGREGATE 요청) -> 전송 순서대로
+
+        합계가 2^n을 넘게 되면 이 값을 더하기 전에 현재 window를 먼저 닫습니다.
+        """
+        scaled_value = int(sensor_value * 1000)
+        if scaled_value < 0 or scaled_value >= 2**self.n_bits:
+            log_event(logger, logging.WARNING, "range-error", sensor=self.sensor_name,
+                      scaled=scaled_value, max=2**self.n_bits - 1)
+            return []
+
+        try:
+            window = self._get_window()
+            outgoing = []
+            if not window.fits(scaled_value):
+                outgoing.append(self._build_aggregate_request(window.close(), event_ts))
+
+            commitment, index = window.add(scaled_value, nonce)
+            request = self._commitment_request("COMMIT_ONLY", event_ts, nonce, commitment,
+                                               int(self.range_min * 1000), int(self.range_max * 1000))
+            request["window"] = {"id": window.window_id, "index": index}
+            outgoing.append((request, sensor_value))
 
-            # Compute Fiat-Shamir challenges for cross-verification
-            request["challenges"] = self._compute_fiat_shamir_challenges(proof)
+            if window.full:
+                outgoing.append(self._build_aggregate_request(window.close(), event_ts))
+            return outgoing
 
-            return request
+        except Exception as e:
+            log_event(logger, logging.ERROR, "proof-error", sensor=self.sensor_name, error=str(e),
+                      exc_info=self.verbose)
+            return []
+
+    def _flush_window(self):
+        """종료 시 남은 측정값을 부분 window 합계 증명으로 전송"""
+        if self._window is None or not self._window.pending:
+            return
+        try:
+            request, value = self._build_aggregate_request(self._window.close(), int(time.time()))
+        except Exception as e:
+            log_event(logger, logging.ERROR, "proof-error", sensor=self.sensor_name, error=str(e))
+            return
+        self._send_request(request, value, time.time(), "OK")
+
+    def _build_deferred_request(self, sensor_value: float, event_ts: int, nonce: str) -> Optional[Dict[str, Any]]:
+        """deferred 모드: commitment만 담은 COMMIT_ONLY 요청 (증명은 백그라운드에서 생성)"""
+        scaled_value = int(sensor_value * 1000)
+        if scaled_value < 0 or scaled_value >= 2**self.n_bits:
+            log_event(logger, logging.WARNING, "range-error", sensor=self.sensor_name,
+                      scaled=scaled_value, max=2**self.n_bits - 1)
+            return None
 
+        try:
+            commitment = self._get_deferred().commit(scaled_value, nonce, (event_ts, nonce, sensor_value))
         except Exception as e:
-            print(f"[⚠️ PROOF-ERROR] Failed to generate proof: {e}")
-            if self.verbose:
-                import traceback
-                traceback.print_exc()
+            log_event(logger, logging.ERROR, "proof-error", sensor=self.sensor_name, error=str(e),
+                      exc_info=self.verbose)
             return None
+        request = self._commitment_request("COMMIT_ONLY", event_ts, nonce, commitment,
+                                           int(self.range_min * 1000), int(self.range_max * 1000),
+                                           proof_generation="deferred")
+        request["deferred"] = True
+        return request
+
+    @staticmethod
+    def _is_deferred_commit(request: Dict[str, Any]) -> bool:
+        return request.get("mode") == "COMMIT_ONLY" and bool(request.get("deferred"))
+
+    def _deferred_commit_result(self, request: Dict[str, Any], success: bool, latency_ms: float):
+        """deferred COMMIT_ONLY 응답: 성공해야 그 증명을 제출 (증명이 commitment보다 먼저 도착하지 않게)"""
+        if success:
+            self._deferred.published(request["nonce"], latency_ms)
+        else:
+            self._deferred.unpublished(request["nonce"])
+
+    def _deferred_proof_request(self, result, context) -> Dict[str, Any]:
+        """DeferredProver 콜백: 완성된 증명 -> ZK_DEFERRED 요청 (측정 시점 ts/nonce 유지)"""
+        event_ts, nonce, _ = context
+        return self._proof_request(result, event_ts, nonce, mode="ZK_DEFERRED", proof_generation="deferred")
+
+    def _on_deferred_result(self, request: Dict[str, Any], result: Optional[Dict], error: Optional[str],
+                            lag_ms: float, context):
+        """deferred 증명 하나의 검증 결과 로그 (lag: commitment 게시 -> 결과 수신)"""
+        _, nonce, sensor_value = context
+        if error is not None:
+            log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name, result="HTTP_ERROR",
+                      error=error, nonce=nonce, mode="ZK_DEFERRED")
+            return
+
+        success = result.get("success", result.get("verified", result.get("ok", False)))
+        self._deadband_result(request, success)
+        if success:
+            log_event(logger, logging.DEBUG if self.verbose else logging.INFO, "verify", sensor=self.sensor_name,
+                      value=round(sensor_value, 3), scaled=int(sensor_value * 1000), result="SUCCESS",
+                      proof_lag_ms=round(lag_ms, 1), mode="ZK_DEFERRED")
+        else:
+            reason = result.get("error_message") or result.get("reason") or "unknown"
+            log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name, value=round(sensor_value, 3),
+                      scaled=int(sensor_value * 1000), result="FAIL", proof_lag_ms=round(lag_ms, 1),
+                      reason=reason, mode="ZK_DEFERRED")
+
+    def _spool_append(self, kind: str, payload: Dict[str, Any]):
+        try:
+            self.spool.append(kind, payload)
+        except OSError as e:
+            log_event(logger, logging.WARNING, "spool-error", sensor=self.sensor_name, kind=kind, error=str(e)[:180])
+            return
+        if kind == "verify" and self._is_deferred_commit(payload):
+            # 증명도 spool로 보내 재전송 시 commitment 뒤에 오도록 함
+            self._deferred.unpublished(payload["nonce"], spooled=True)
+
+    def _spool_append_verify(self, request: Dict[str, Any]):
+        self._spool_append("verify", request)
+
+    def _replay_verify(self, requests_data: List[Dict]) -> int:
+        """spool handler: 보관된 검증 요청 재전송 -> 서버에 전달된 개수"""
+        return replay_verify(self.replay_session, self.server_url, requests_data)
+
+    def _replay_store(self, payloads: List[Dict]) -> int:
+        """spool handler: 보관된 RAW 저장 요청 재전송 -> Reveal 서버에 전달된 개수"""
+        delivered = 0
+        for payload in payloads:
+            try:
+                response = self.replay_session.post(self.reveal_store_endpoint, json=payload, timeout=2)
+            except requests.exceptions.RequestException:
+                break
+            if response.status_code >= 500:
+                break
+            delivered += 1
+        if delivered:
+            log_event(logger, logging.INFO, "spool-replay", kind="store", items=delivered)
+        return delivered
 
     def _store_raw_value(self, sensor_id: str, event_ts: int, nonce: str, raw_value: float) -> bool:
-        """RAW 값을 Reveal 서버에 저장"""
+        """RAW 값을 Reveal 서버에 저장 (연결 실패 시 spool에 보관)"""
+        payload = {
+            "sensor_id": sensor_id,
+            "event_ts": event_ts,
+            "nonce": nonce,
+            "raw_value": raw_value
+        }
         try:
-            response = requests.post(
-                self.reveal_store_endpoint,
-                json={
-                    "sensor_id": sensor_id,
-                    "event_ts": event_ts,
-                    "nonce": nonce,
-                    "raw_value": raw_value
-                },
-                timeout=2
-            )
+            response = requests.post(self.reveal_store_endpoint, json=payload, timeout=2)
 
             if response.status_code == 200:
                 return True
             else:
-                if self.verbose:
-                    print(f"[⚠️ STORE-FAIL] Reveal 서버 응답: {response.status_code}")
+                if response.status_code >= 500 and self.spool is not None:
+                    self._spool_append("store", payload)
+                log_event(logger, logging.DEBUG, "store-fail", sensor=sensor_id, status=response.status_code)
                 return False
 
-        except requests.exceptions.ConnectionError:
-            if self.verbose:
-                print(f"[⚠️ STORE-FAIL] Reveal 서버 연결 실패 ({self.reveal_url})")
+        except requests.exceptions.RequestException as e:
+            if self.spool is not None:
+                self._spool_append("store", payload)
+            error = "connection" if isinstance(e, requests.exceptions.ConnectionError) else str(e)[:180]
+            log_event(logger, logging.DEBUG, "store-fail", sensor=sensor_id, error=error, reveal_url=self.reveal_url,
+                      spooled=self.spool is not None)
             return False
         except Exception as e:
-            if self.verbose:
-                print(f"[⚠️ STORE-FAIL] {e}")
+            log_event(logger, logging.DEBUG, "store-fail", sensor=sensor_id, error=str(e))
             return False
 
     def send_value(self) -> bool:
@@ -261,87 +529,273 @@ class SelectiveDisclosureClient:
         # 1. RAW 값을 Reveal 서버에 저장
         self._store_raw_value(self.sensor_name, event_ts, nonce, sensor_value)
 
-        # 2. ZK 요청 생성 (실제 Bulletproof 증명 생성)
-        request = self._build_zk_request(sensor_value, event_ts, nonce)
+        # 2. deadband: 마지막으로 증명한 값의 band 안이면 서명된 heartbeat만 전송
+        proof_reason = None
+        if self.deadband is not None:
+            proof_reason = self.deadband.check(sensor_value)
+            if proof_reason is None:
+                request = self.deadband.heartbeat(self.sensor_name, event_ts, nonce, self.heartbeat_key)
+                self.deadband.heartbeat_sent(len(json.dumps(request)))
+                return self._send_request(request, sensor_value, start_time, range_status)
+
+        # 3. ZK 요청 생성 (실제 Bulletproof 증명 생성)
+        #    window 모드: commitment만 보내고 window가 닫히면 합계 증명 요청을 이어서 전송
+        #    deferred 모드: commitment만 보내고 증명은 백그라운드에서 생성 후 batch로 제출
+        if self.window_size > 1:
+            outgoing = self._build_window_requests(sensor_value, event_ts, nonce)
+        elif self.deferred and self._get_deferred().accepts():
+            request = self._build_deferred_request(sensor_value, event_ts, nonce)
+            outgoing = [(request, sensor_value)] if request is not None else []
+        else:
+            request = self._build_zk_request(sensor_value, event_ts, nonce)
+            outgoing = [(request, sensor_value)] if request is not None else []
 
         # 증명 생성 실패 시 종료
-        if request is None:
-            if self.verbose:
-                print(f"[⚠️ SKIP] sensor={self.sensor_name}, ts={event_ts}, nonce={nonce}, value={sensor_value:.6f} (proof generation failed)")
+        if not outgoing:
+            log_event(logger, logging.DEBUG, "skip", sensor=self.sensor_name, ts=event_ts, nonce=nonce,
+                      value=sensor_value, reason="proof generation failed")
+            return False
+
+        if self.deadband is not None:
+            # heartbeat 기준은 검증 성공 응답을 받은 뒤에 갱신 (_deadband_result)
+            reading = next(r for r, _ in outgoing if r["nonce"] == nonce)
+            self.deadband.proof_sent(sensor_value, nonce, reading["commitment"], proof_reason,
+                                     sum(len(json.dumps(r)) for r, _ in outgoing))
+
+        ok = True
+        for request, value in outgoing:
+            sent = self._send_request(request, value, start_time, range_status)
+            # coalescer로 보낸 COMMIT_ONLY는 응답이 _on_verify_result로 옴
+            if self._is_deferred_commit(request) and (self.coalescer is None or not sent):
+                self._deferred_commit_result(request, sent, (time.time() - start_time) * 1000)
+            ok = sent and ok
+        return ok
+
+    def _send_request(self, request: Dict[str, Any], sensor_value: float, start_time: float,
+                      range_status: str) -> bool:
+        """검증 요청 하나 전송 (coalescer 또는 단건 POST) 후 결과 로그"""
+        event_ts = request["ts"]
+        nonce = request["nonce"]
+        # ZK_ONLY 외 요청(window 모드)은 로그에 mode 표시
+        extra = {"mode": request["mode"]} if request["mode"] != "ZK_ONLY" else {}
+
+        if self.coalescer is not None:
+            # 다음 batch에 포함 (결과 로그는 _on_verify_result)
+            self._pending_values[nonce] = sensor_value
+            if self.coalescer.submit(request):
+                return True
+            # 전송 대기열 가득 참 (adaptive backpressure): spool에 보관하거나 버림
+            self._pending_values.pop(nonce, None)
+            self.controller.shed.inc()
+            if self.spool is not None:
+                self._spool_append("verify", request)
+            log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name, value=round(sensor_value, 3),
+                      result="SPOOLED" if self.spool is not None else "SHED", reason="send queue full")
             return False
 
         try:
             response = requests.post(self.endpoint, json=request, timeout=10)
             latency_ms = (time.time() - start_time) * 1000
 
+            if response.status_code >= 500 and self.spool is not None:
+                self._spool_append("verify", request)
+                log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name, result="SPOOLED",
+                          status=response.status_code)
+                return False
+
             if response.status_code == 200:
+                if self.spool is not None:
+                    self.spool.kick()
                 result = response.json()
 
                 # ✅ FIX: 서버 응답 스펙에 맞춰서 파싱
                 # 우선순위: success > verified > ok
                 success = result.get("success", result.get("verified", result.get("ok", False)))
+                self._deadband_result(request, success)
 
                 if success:
-                    # Production Mode: 간결한 헬스체크 로그
-                    timestamp = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+                    # Production 모드: 한 줄 헬스체크 로그 / Test 모드: 상세 필드 추가
                     scaled_value = int(sensor_value * 1000)
 
                     if not self.verbose:
-                        # Production 모드: 한 줄 헬스체크 로그
-                        print(f"[{timestamp}] sensor={self.sensor_name} value={sensor_value:.3f} scaled={scaled_value} result=SUCCESS latency_ms={latency_ms:.1f}")
+                        log_event(logger, logging.INFO, "verify", sensor=self.sensor_name, value=round(sensor_value, 3),
+                                  scaled=scaled_value, result="SUCCESS", latency_ms=round(latency_ms, 1), **extra)
                     else:
-                        # Test 모드: 상세 로그
-                        print(f"[OK] Bulletproof verified (sensor={self.sensor_name}, value={sensor_value:.6f}, scaled={scaled_value}, ts={event_ts}, nonce={nonce}, latency_ms={latency_ms:.1f}, range_status={range_status})")
-                        if result.get("verified") is not None:
-                            print(f"     └─ Server: verified={result.get('verified')}, algorithm={result.get('algorithm')}, processing_time_ms={result.get('processing_time_ms', 0):.1f}")
+                        log_event(logger, logging.DEBUG, "verify", sensor=self.sensor_name, value=sensor_value,
+                                  scaled=scaled_value, ts=event_ts, nonce=nonce, result="SUCCESS",
+                                  latency_ms=round(latency_ms, 1), range_status=range_status,
+                                  server_verified=result.get("verified"), algorithm=result.get("algorithm"),
+                                  processing_time_ms=result.get("processing_time_ms", 0), **extra)
 
                     return True
                 else:
                     # 검증 실패
-                    timestamp = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
                     scaled_value = int(sensor_value * 1000)
                     reason = result.get("error_message") or result.get("reason") or "unknown"
 
-                    if not self.verbose:
-                        # Production 모드: 간결한 에러 로그
-                        print(f"[{timestamp}] sensor={self.sensor_name} value={sensor_value:.3f} scaled={scaled_value} result=FAIL latency_ms={latency_ms:.1f} reason={reason}")
-                    else:
-                        # Test 모드: 상세 에러 로그
-                        print(f"[FAIL] Bulletproof verification failed (sensor={self.sensor_name}, value={sensor_value:.6f}, ts={event_ts}, reason={reason})")
-                        print(f"       Server response: {json.dumps(result, indent=2)}")
+                    log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name, value=round(sensor_value, 3),
+                              scaled=scaled_value, result="FAIL", latency_ms=round(latency_ms, 1), reason=reason,
+                              **extra)
+                    log_event(logger, logging.DEBUG, "verify-response", sensor=self.sensor_name, ts=event_ts,
+                              response=json.dumps(result))
 
                     return False
             else:
-                timestamp = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
-                print(f"[{timestamp}] sensor={self.sensor_name} result=HTTP_ERROR status={response.status_code}")
-                if self.verbose:
-                    print(f"       Response: {response.text}")
+                log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name, result="HTTP_ERROR",
+                          status=response.status_code)
+                log_event(logger, logging.DEBUG, "verify-response", sensor=self.sensor_name, response=response.text)
                 return False
 
+        except requests.exceptions.RequestException as e:
+            if self.spool is None:
+                log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name, result="EXCEPTION", error=str(e),
+                          exc_info=self.verbose)
+                return False
+            self._spool_append("verify", request)
+            log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name, result="SPOOLED", error=str(e)[:180])
+            return False
         except Exception as e:
-            timestamp = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
-            print(f"[{timestamp}] sensor={self.sensor_name} result=EXCEPTION error={str(e)}")
-            if self.verbose:
-                import traceback
-                traceback.print_exc()
+            log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name, result="EXCEPTION", error=str(e),
+                      exc_info=self.verbose)
             return False
 
+    def _write_metrics(self, force: bool = False):
+        """controller 메트릭 파일 갱신 (window당 최대 1회)"""
+        now = time.monotonic()
+        if not self.metrics_file or (not force and now - self._metrics_written_at < self.controller.window_s):
+            return
+        self._metrics_written_at = now
+        try:
+            self.controller.write_metrics(self.metrics_file)
+        except OSError as e:
+            log_event(logger, logging.WARNING, "metrics-write-error", path=self.metrics_file, error=str(e)[:180])
+
+    def _write_extra_metrics(self, force: bool = False):
+        """deadband/deferred 메트릭 파일 갱신 (최대 5초에 1회)"""
+        now = time.monotonic()
+        if not force and now - self._extra_metrics_written_at < 5.0:
+            return
+        self._extra_metrics_written_at = now
+        for source, path in ((self.deadband, self.deadband_metrics_file),
+                             (self._deferred, self.deferred_metrics_file)):
+            if source is None or not path:
+                continue
+            try:
+                source.write_metrics(path)
+            except OSError as e:
+                log_event(logger, logging.WARNING, "metrics-write-error", path=path, error=str(e)[:180])
+
+    def _deadband_result(self, request: Dict[str, Any], success: bool):
+        """검증 응답을 deadband 기준에 반영 (heartbeat는 검증된 증명의 측정값만 참조)"""
+        if self.deadband is None:
+            return
+        mode = request.get("mode", "ZK_ONLY")
+        if mode == "ZK_AGGREGATE":
+            nonces = request["window"]["nonces"]
+        elif mode in ("ZK_ONLY", "ZK_DEFERRED"):
+            nonces = [request["nonce"]]
+        else:
+            return  # COMMIT_ONLY/HEARTBEAT 응답은 증명 검증이 아님
+        if success:
+            self.deadband.proven(nonces)
+        else:
+            self.deadband.rejected(nonces)
+
+    def _on_verify_result(self, request: Dict[str, Any], result: Optional[Dict], error: Optional[str],
+                          latency_ms: float):
+        """묶음 전송된 요청 하나의 검증 결과 로그 (latency는 batch 대기 + 전송 시간)"""
+        sensor_value = self._pending_values.pop(request["nonce"], 0.0)
+        if error is None and self.spool is not None:
+            self.spool.kick()
+        if self._is_deferred_commit(request):
+            self._deferred_commit_result(request, error is None and bool(
+                result.get("success", result.get("verified", result.get("ok", False)))), latency_ms)
+        if error is not None:
+            log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name, result="HTTP_ERROR",
+                      error=error, nonce=request["nonce"])
+            return
+
+        success = result.get("success", result.get("verified", result.get("ok", False)))
+        self._deadband_result(request, success)
+        if success:
+            log_event(logger, logging.DEBUG if self.verbose else logging.INFO, "verify", sensor=self.sensor_name,
+                      value=round(sensor_value, 3), scaled=int(sensor_value * 1000), ts=request["ts"],
+                      result="SUCCESS", latency_ms=round(latency_ms, 1))
+        else:
+            reason = result.get("error_message") or result.get("reason") or "unknown"
+            log_event(logger, logging.WARNING, "verify", sensor=self.sensor_name, value=round(sensor_value, 3),
+                      scaled=int(sensor_value * 1000), result="FAIL", latency_ms=round(latency_ms, 1), reason=reason)
+
     def run(self, interval: float = 1.0, once: bool = False):
         """센서 전송 루프 실행"""
         mode_display = "PRODUCTION" if self.mode == "production" else "TEST"
         print(f"[START] Mode={mode_display}, Interval={interval}s, Once={once}")
 
+        profile_pending = self.import_profile
         try:
             while True:
                 self.send_value()
 
+                if profile_pending:
+                    profile_pending = False
+                    STARTUP.mark("first send (store-raw + proof + verify)")
+                    print(STARTUP.report())
+
                 if once:
                     print("[DONE] Single transmission completed")
                     break
 
-                time.sleep(interval)
+                self._write_extra_metrics()
+
+                if self.controller is not None:
+                    self.controller.tick()
+                    self._write_metrics()
+                    time.sleep(interval * self.controller.interval_factor)
+                else:
+                    time.sleep(interval)
         except KeyboardInterrupt:
             print("\n[STOP] Stopped by user")
+        finally:
+            if self._window is not None:
+                self._flush_window()
+                window_stats = self._window.get_stats()
+                print(f"[WINDOW] readings={window_stats['readings']} windows={window_stats['windows']} "
+                      f"proofs_saved={window_stats['proofs_saved']} avg_commit_ms={window_stats['avg_commit_ms']} "
+                      f"avg_prove_ms={window_stats['avg_prove_ms']}")
+            # COMMIT_ONLY 응답을 모두 받은 뒤에 deferred 증명을 마저 제출
+            if self.coalescer is not None:
+                self.coalescer.close()
+                batch_stats = self.coalescer.get_stats()
+                print(f"[BATCH] requests={batch_stats['requests']} batches={batch_stats['batches']} items={batch_stats['items']} "
+                      f"avg_batch_size={batch_stats['avg_batch_size']} batch_supported={batch_stats['batch_supported']}")
+            if self._deferred is not None:
+                self._deferred.close()
+                deferred_stats = self._deferred.get_stats()
+                print(f"[DEFERRED] proofs={deferred_stats['proofs']} inline={deferred_stats['inline']} "
+                      f"backlog={deferred_stats['backlog']} "
+                      f"batches={deferred_stats['batches']} publish_ms avg={deferred_stats['avg_publish_ms']} "
+                      f"p90={deferred_stats['p90_publish_ms']} proof_lag_ms avg={deferred_stats['avg_proof_lag_ms']} "
+                      f"p90={deferred_stats['p90_proof_lag_ms']} max={deferred_stats['max_proof_lag_ms']}")
+            self._write_extra_metrics(force=True)
+            if self.deadband is not None:
+                deadband_stats = self.deadband.get_stats()
+                print(f"[DEADBAND] proofs={deadband_stats['proofs']} heartbeats={deadband_stats['heartbeats']} "
+                      f"proofs_saved={deadband_stats['proofs_saved']} bytes_saved={deadband_stats['bytes_saved']} "
+                      f"triggers={deadband_stats['triggers']}")
+            if self.controller is not None:
+                self._write_metrics(force=True)
+                adaptive = self.controller.get_stats()
+                print(f"[ADAPT] level={adaptive['level']}/{adaptive['max_level']} "
+                      f"escalations={adaptive['escalations']} recoveries={adaptive['recoveries']} "
+                      f"shed={adaptive['shed']} last_p90={adaptive['last_p90_ms']}ms")
+            if self.spool is not None:
+                self.spool.close()
+                spool_stats = self.spool.get_stats()
+                print(f"[SPOOL] appended={spool_stats['appended']} replayed={spool_stats['replayed']} "
+                      f"dropped={spool_stats['dropped_records']} pending_bytes={spool_stats['pending_bytes']}")
+            stats = get_log_stats()
+            print(f"[LOG] records={stats['enqueued_total']} sampled_out={stats['sampled_out']} "
+                  f"rate_limited={stats['rate_limited']} dropped={stats['dropped_queue_full']}")
 
 
 def main():
@@ -350,14 +804,61 @@ def main():
     parser.add_argument("--sensor", required=True, help="Sensor name (e.g., DM-PIT01)")
     parser.add_argument("--reveal-url", default="http://127.0.0.1:9000", help="Reveal server URL (default: http://127.0.0.1:9000)")
     parser.add_argument("--csv", help="CSV file path (optional)")
+    parser.add_argument("--csv-engine", choices=list(CSV_ENGINES), default="auto",
+                        help="CSV reader: pandas, csv (stdlib) or auto (default: auto)")
+    parser.add_argument("--csv-chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"Rows per streamed CSV chunk (default: {DEFAULT_CHUNK_ROWS})")
+    parser.add_argument("--csv-cache-dir", default=None,
+                        help="Directory for the binary column cache (default: .hai_cache/ next to the CSV)")
+    parser.add_argument("--no-csv-cache", action="store_true",
+                        help="Stream the CSV on every start instead of memory-mapping the column cache")
+    parser.add_argument("--csv-preload", action="store_true",
+                        help="With --no-csv-cache, extract the column into one in-memory array instead of streaming")
     parser.add_argument("--interval", type=float, default=2.0, help="Transmission interval in seconds (default: 2.0)")
     parser.add_argument("--once", action="store_true", help="Send once and exit")
     parser.add_argument("--range-min", type=float, default=0.0, help="Minimum valid sensor value (default: 0.0)")
     parser.add_argument("--range-max", type=float, default=4294967.295, help="Maximum valid sensor value (default: 4294967.295)")
     parser.add_argument("--mode", choices=["production", "test"], default="production",
                        help="Operation mode: 'production' (간결한 로그) or 'test' (상세 로그, 기본값: production)")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="검증 요청을 최대 N개씩 묶어 batch endpoint로 전송; 1이면 요청마다 전송 (default: 1)")
+    parser.add_argument("--batch-delay-ms", type=float, default=50.0,
+                        help="batch가 찰 때까지 기다리는 최대 시간 (default: 50ms)")
+    parser.add_argument("--spool-dir", default=None,
+                        help="서버에 전달하지 못한 검증/RAW 저장 요청을 보관했다가 재전송할 디렉터리")
+    parser.add_argument("--spool-max-mb", type=float, default=64.0,
+                        help="spool 크기 상한 MB, 넘으면 가장 오래된 요청부터 버림 (default: 64)")
+    parser.add_argument("--window", type=int, default=0,
+                        help="slow-moving 센서: 측정값마다 commitment만 보내고 K개마다 합계 증명 하나 전송 (default: 0=off)")
+    parser.add_argument("--ipa-cutoff", type=int, choices=[1, 2, 4, 8, 16, 32], default=1,
+                        help="Stop the inner product argument at length k and send a, b in the clear; "
+                             "k > 1 uses proof wire version 2 (local verifier only) (default: 1)")
+    add_deadband_arguments(parser)
+    add_deferred_arguments(parser)
+    add_adaptive_arguments(parser)
+    parser.add_argument("--import-profile", action="store_true",
+                        help="첫 전송 후 시작 단계별 소요 시간 출력 (import, 초기화, 첫 증명)")
+    add_logging_arguments(parser)
 
     args = parser.parse_args()
+    deadband = deadband_from_args(args)
+    heartbeat_key = heartbeat_key_from(args.heartbeat_key)
+    if deadband is not None and heartbeat_key is None:
+        parser.error("--deadband-abs/--deadband-rel need --heartbeat-key (or ICS_HEARTBEAT_KEY) to sign heartbeats")
+    if args.deferred and args.window > 1:
+        parser.error("--deferred cannot be combined with --window")
+
+    # test 모드는 상세(DEBUG) 로그까지 출력
+    log_level = "DEBUG" if args.mode == "test" and args.log_level == "INFO" else args.log_level
+    configure_logging(level=log_level, fmt=args.log_format,
+                      sample_rate=args.log_sample, rate_limit=args.log_rate_limit)
+    STARTUP.mark("argument parsing + logging setup")
+
+    if not PROVER_AVAILABLE:
+        print("Error: Bulletproof prover not available: petlib is not installed")
+        print("Install petlib with: pip3 install petlib")
+        sys.exit(1)
+    print("[INIT] Using Production Mode Bulletproof prover (server-compatible)")
 
     print("=" * 70)
     print("  HAI Sensor Client - Selective Disclosure (Production Ready)")
@@ -367,6 +868,16 @@ def main():
     print(f"[INIT] Reveal Server: {args.reveal_url}")
     print(f"[INIT] Sensor: {args.sensor}")
     print(f"[INIT] ZK Mode: ZK_ONLY (RAW 값은 Reveal 서버로 전송)")
+    if args.window > 1:
+        print(f"[INIT] Window: {args.window} readings per aggregate proof (COMMIT_ONLY + ZK_AGGREGATE)")
+    if args.ipa_cutoff > 1:
+        print(f"[INIT] IPA cutoff: k={args.ipa_cutoff} (proof wire version 2)")
+    if args.deferred:
+        print(f"[INIT] Deferred proofs: commitment now, proofs in batches of <={args.deferred_batch} "
+              f"(max delay {args.deferred_delay_ms}ms, max backlog {args.deferred_max_backlog})")
+    if deadband is not None:
+        print(f"[INIT] Deadband: abs={deadband.absolute} rel={deadband.relative} "
+              f"max_staleness={deadband.max_staleness_s}s (signed heartbeats in between)")
     print(f"[INIT] Proof Generation: REAL Bulletproof (secp256k1, n=32)")
     print(f"[INIT] Valid Range: [{args.range_min:.3f}, {args.range_max:.3f}]")
     print(f"[INIT] Scaled Range: [0, {2**32-1}] (after *1000 scaling)")
@@ -381,8 +892,31 @@ def main():
         csv_path=args.csv,
         range_min=args.range_min,
         range_max=args.range_max,
-        mode=args.mode
+        mode=args.mode,
+        csv_engine=args.csv_engine,
+        csv_chunk_rows=args.csv_chunk_rows,
+        csv_cache=not args.no_csv_cache,
+        csv_cache_dir=args.csv_cache_dir,
+        csv_preload=args.csv_preload,
+        batch_size=args.batch_size,
+        batch_delay_ms=args.batch_delay_ms,
+        spool_dir=args.spool_dir,
+        spool_max_mb=args.spool_max_mb,
+        controller=controller_from_args(args),
+        metrics_file=args.adaptive_metrics_file,
+        import_profile=args.import_profile,
+        window_size=args.window,
+        deadband=deadband,
+        heartbeat_key=heartbeat_key,
+        deadband_metrics_file=args.deadband_metrics_file,
+        deferred=args.deferred,
+        deferred_batch=args.deferred_batch,
+        deferred_delay_ms=args.deferred_delay_ms,
+        deferred_metrics_file=args.deferred_metrics_file,
+        deferred_max_backlog=args.deferred_max_backlog,
+        ipa_cutoff=args.ipa_cutoff
     )
+    STARTUP.mark("client init")
 
     # 전송 시작
     client.run(interval=args.interval, once=args.once)
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Offline Spool for Sensor Clients
+
+검증 서버나 Reveal 서버에 연결할 수 없을 때 전송하지 못한 요청(이미 생성한
+증명 포함)을 로컬 append-only 파일에 보관하고, 연결이 돌아오면 백그라운드
+drainer가 지수 backoff로 순서대로 재전송합니다.
+
+설계:
+- 레코드는 reveal_wal.py와 같은 u32 길이 | u32 CRC | body 프레이밍,
+  body = u8 len(kind) | kind | JSON 요청 본문
+- 세그먼트 파일(<seq>.spool)은 segment_bytes마다 교체
+- 전체 크기 상한(max_bytes)을 넘으면 가장 오래된 세그먼트를 삭제하고
+  dropped_records로 집계 (최신 측정값 우선)
+- 재전송 위치는 cursor.json(세그먼트, offset)에 batch마다 기록.
+  batch 전송 후 cursor 기록 전에 죽으면 그 batch는 다시 전송됨 (at-least-once,
+  nonce로 중복 식별 가능)
+- kind별 handler(payloads) -> 앞에서부터 전달된 개수. 전부 전달하지 못하면
+  backoff 후 남은 레코드부터 재시도
+
+Usage:
+    spool = Spool("./spool", handlers={"verify": replay_verify, "store": replay_store})
+    spool.append("verify", request_dict)   # 전송 실패 시
+    spool.kick()                           # 실시간 전송이 성공하면 backoff 대기 해제
+    spool.close()
+"""
+
+import os
+import json
+import zlib
+import random
+import struct
+import logging
+import tempfile
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from log_pipeline import get_logger, log_event
+
+logger = get_logger("spool")
+
+RECORD_PREFIX = struct.Struct('<II')
+SEGMENT_SUFFIX = ".spool"
+CURSOR_NAME = "cursor.json"
+
+# handler(payloads) -> 앞에서부터 전달에 성공한 개수
+SpoolHandler = Callable[[List[Dict]], int]
+
+
+def encode_record(kind: str, payload: Dict) -> bytes:
+    """spool 레코드 인코딩"""
+    kb = kind.encode('utf-8')
+    body = bytes([len(kb)]) + kb + json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return RECORD_PREFIX.pack(len(body), zlib.crc32(body)) + body
+
+
+def decode_records(data: bytes, offset: int = 0, limit: Optional[int] = None) -> List[Tuple[int, str, Dict]]:
+    """
+    offset부터 레코드를 디코딩 -> (다음 offset, kind, payload) 목록
+
+    CRC 불일치 또는 잘린 레코드(기록 중인 꼬리)에서 중단합니다.
+    """
+    records = []
+    size = len(data)
+    prefix_size = RECORD_PREFIX.size
+    while offset + prefix_size <= size and (limit is None or len(records) < limit):
+        body_len, crc = RECORD_PREFIX.unpack_from(data, offset)
+        start = offset + prefix_size
+        end = start + body_len
+        if body_len < 1 or end > size:
+            break
+        body = data[start:end]
+        if zlib.crc32(body) != crc:
+            break
+        kind_len = body[0]
+        kind = body[1:1 + kind_len].decode('utf-8')
+        records.append((end, kind, json.loads(body[1 + kind_len:])))
+        offset = end
+    return records
+
+
+class Spool:
+    """크기 상한이 있는 디스크 spool + backoff 재전송 drainer"""
+
+    def __init__(self, directory: str, handlers: Dict[str, SpoolHandler],
+                 max_bytes: int = 64 * 1024 * 1024, segment_bytes: int = 1024 * 1024,
+                 batch_size: int = 32, backoff_initial: float = 1.0, backoff_max: float = 60.0,
+                 fsync: bool = True):
+        """
+        Args:
+            directory: spool 디렉터리
+            handlers: kind -> 재전송 함수
+            max_bytes: spool 전체 크기 상한
+            segment_bytes: 세그먼트 교체 크기
+            batch_size: 재전송 batch당 최대 레코드 수
+            backoff_initial: 첫 재시도 대기 시간 (초)
+            backoff_max: 최대 재시도 대기 시간 (초)
+            fsync: append마다 fsync (전원 장애에도 보존)
+        """
+        self.directory = directory
+        self.handlers = handlers
+        self.max_bytes = max_bytes
+        self.segment_bytes = min(segment_bytes, max_bytes)
+        self.batch_size = max(1, batch_size)
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.fsync = fsync
+
+        os.makedirs(directory, exist_ok=True)
+
+        self.appended = 0
+        self.replayed = 0
+        self.dropped_records = 0
+        self.failures = 0
+        self.backoff = 0.0
+
+        self._cond = threading.Condition()
+        self._closed = False
+        self._kicked = False
+        self._file = None
+        self._active: Optional[str] = None
+        self._cursor_segment, self._cursor_offset = self._load_cursor()
+        self._segments = self._list_segments()
+        self._next_seq = (int(self._segments[-1][:-len(SEGMENT_SUFFIX)]) + 1) if self._segments else 0
+        self._bytes = sum(self._size(name) for name in self._segments)
+
+        self._drainer = threading.Thread(target=self._drain_loop, name="spool-drainer", daemon=True)
+        self._drainer.start()
+
+    # ------------------------------------------------------------------
+    # 세그먼트 / cursor
+    # ------------------------------------------------------------------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _size(self, name: str) -> int:
+        try:
+            return os.path.getsize(self._path(name))
+        except FileNotFoundError:
+            return 0
+
+    def _list_segments(self) -> List[str]:
+        names = []
+        for name in os.listdir(self.directory):
+            if name.endswith(SEGMENT_SUFFIX) and name[:-len(SEGMENT_SUFFIX)].isdigit():
+                names.append(name)
+        names.sort()
+        return names
+
+    def _load_cursor(self) -> Tuple[Optional[str], int]:
+        try:
+            with open(self._path(CURSOR_NAME)) as f:
+                cursor = json.load(f)
+            return cursor["segment"], int(cursor["offset"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None, 0
+
+    def _save_cursor(self):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".cursor-")
+        with os.fdopen(fd, 'w') as f:
+            json.dump({"segment": self._cursor_segment, "offset": self._cursor_offset}, f)
+        os.replace(tmp, self._path(CURSOR_NAME))
+
+    def _remove_segment(self, name: str):
+        """lock 보유 상태에서 호출"""
+        if name == self._active:
+            self._file.close()
+            self._file = None
+            self._active = None
+        self._bytes -= self._size(name)
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
+        self._segments.remove(name)
+        if name == self._cursor_segment:
+            self._cursor_segment, self._cursor_offset = None, 0
+
+    def _drop_oldest(self):
+        """크기 상한 초과: 가장 오래된 세그먼트의 미전송 레코드를 버림"""
+        name = self._segments[0]
+        with open(self._path(name), 'rb') as f:
+            data = f.read()
+        offset = self._cursor_offset if name == self._cursor_segment else 0
+        dropped = len(decode_records(data, offset))
+        self._remove_segment(name)
+        self.dropped_records += dropped
+        log_event(logger, logging.WARNING, "spool-full", segment=name, dropped_records=dropped,
+                  max_bytes=self.max_bytes)
+
+    # ------------------------------------------------------------------
+    # 쓰기 경로
+    # ------------------------------------------------------------------
+
+    def append(self, kind: str, payload: Dict):
+        """전송 실패한 요청 하나를 spool에 기록"""
+        if kind not in self.handlers:
+            raise ValueError(f"No spool handler for kind: {kind}")
+        record = encode_record(kind, payload)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Spool is closed")
+            while self._segments and self._bytes + len(record) > self.max_bytes:
+                self._drop_oldest()
+            if self._file is None or self._size(self._active) + len(record) > self.segment_bytes:
+                if self._file is not None:
+                    self._file.close()
+                self._active = f"{self._next_seq:012d}{SEGMENT_SUFFIX}"
+                self._next_seq += 1
+                self._segments.append(self._active)
+                self._file = open(self._path(self._active), 'ab', buffering=0)
+            self._file.write(record)
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._bytes += len(record)
+            self.appended += 1
+            self._cond.notify_all()
+
+    def kick(self):
+        """연결 복구 신호: backoff 대기 중이면 바로 재전송 시도"""
+        with self._cond:
+            if self.backoff > 0:
+                self._kicked = True
+                self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # 재전송 (drainer)
+    # ------------------------------------------------------------------
+
+    def _next_batch(self) -> Optional[Tuple[str, List[Tuple[int, str, Dict]]]]:
+        """lock 보유 상태에서 호출: 가장 오래된 세그먼트에서 다음 batch 읽기"""
+        while self._segments:
+            name = self._segments[0]
+            if name != self._cursor_segment:
+                self._cursor_segment, self._cursor_offset = name, 0
+            with open(self._path(name), 'rb') as f:
+                data = f.read()
+            records = decode_records(data, self._cursor_offset, self.batch_size)
+            if records:
+                return name, records
+            if name == self._active and self._cursor_offset < len(data):
+                return None  # 기록 중인 꼬리
+            # 세그먼트를 모두 재전송함 (또는 손상된 꼬리) -> 삭제
+            self._remove_segment(name)
+            self._save_cursor()
+        return None
+
+    def _deliver(self, records: List[Tuple[int, str, Dict]]) -> int:
+        """같은 kind가 연속된 구간별로 handler 호출 -> 전달된 레코드 수"""
+        delivered = 0
+        while delivered < len(records):
+            kind = records[delivered][1]
+            end = delivered
+            while end < len(records) and records[end][1] == kind:
+                end += 1
+            payloads = [payload for _, _, payload in records[delivered:end]]
+            try:
+                sent = max(0, min(self.handlers[kind](payloads), len(payloads)))
+            except Exception as e:
+                log_event(logger, logging.WARNING, "spool-replay-error", kind=kind, error=str(e)[:180])
+                sent = 0
+            delivered += sent
+            if sent < len(payloads):
+                break
+        return delivered
+
+    def _drain_loop(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    batch = self._next_batch()
+                    if batch is not None:
+                        break
+                    self._cond.wait()
+                if self._closed:
+                    return
+            name, records = batch
+
+            delivered = self._deliver(records)
+
+            with self._cond:
+                if delivered and name == self._cursor_segment:
+                    self._cursor_offset = records[delivered - 1][0]
+                    self._save_cursor()
+                self.replayed += delivered
+                if delivered == len(records):
+                    self.backoff = 0.0
+                    continue
+                self.failures += 1
+                self.backoff = min(self.backoff_max, max(self.backoff_initial, self.backoff * 2))
+                wait = self.backoff * random.uniform(0.5, 1.0)
+                log_event(logger, logging.INFO, "spool-backoff", delivered=delivered, pending_bytes=self._bytes,
+                          retry_in_s=round(wait, 1))
+                self._kicked = False
+                self._cond.wait_for(lambda: self._closed or self._kicked, timeout=wait)
+
+    def close(self):
+        """drainer 종료 (남은 레코드는 디스크에 남아 다음 시작 시 재전송)"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._drainer.join()
+        with self._cond:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._active = None
+
+    def get_stats(self) -> Dict:
+        """spool 통계"""
+        with self._cond:
+            return {
+                "directory": self.directory,
+                "segments": len(self._segments),
+                "pending_bytes": self._bytes,
+                "appended": self.appended,
+                "replayed": self.replayed,
+                "dropped_records": self.dropped_records,
+                "failures": self.failures,
+                "backoff_s": self.backoff
+            }
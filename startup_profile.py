@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Startup Profile for Sensor Clients
+
+프로세스 시작부터 첫 증명/첫 전송까지의 시간을 단계별로 기록합니다.
+클라이언트의 --import-profile 옵션이 첫 전송 직후 표로 출력합니다.
+
+- 단계(mark): 이전 mark부터 현재까지를 한 단계로 기록 (모듈 import, 인자 파싱,
+  클라이언트 생성, 첫 증명, 첫 전송 ...)
+- 지연 import(lazy_import): 무거운 의존성을 처음 쓰는 시점에 import하고 그
+  소요 시간을 해당 단계의 세부 항목으로 기록
+- 기준 시각은 /proc/self/stat의 프로세스 시작 시각 (Linux, 10ms 해상도)이며,
+  사용할 수 없으면 이 모듈의 import 시각
+
+모듈 단위 상세 분석은 python3 -X importtime을 사용하세요.
+
+Usage:
+    from startup_profile import STARTUP
+    STARTUP.mark("module imports")
+    prover = STARTUP.lazy_import("crypto.bulletproof_prover_production")
+    STARTUP.mark("first proof")
+    print(STARTUP.report())
+"""
+
+import os
+import time
+import importlib
+from typing import List, Optional, Tuple
+
+
+def _process_age() -> Optional[float]:
+    """프로세스 시작 후 경과 시간 (초), 알 수 없으면 None"""
+    try:
+        with open("/proc/self/stat") as f:
+            # comm 필드에 공백이 있을 수 있으므로 마지막 ')' 뒤부터 분리 (starttime = 22번째 필드)
+            fields = f.read().rsplit(")", 1)[1].split()
+        start_ticks = int(fields[19])
+        return time.clock_gettime(time.CLOCK_BOOTTIME) - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StartupProfile:
+    """단계별 시작 시간 기록기"""
+
+    def __init__(self):
+        now = time.perf_counter()
+        age = _process_age()
+        self.origin = "process start" if age is not None else "profiler import"
+        self.t0 = now - (age or 0.0)
+        self._last = self.t0
+        self.phases: List[Tuple[str, float, float]] = []      # (이름, 소요 시간, 누적 시간)
+        self._details: List[Tuple[int, str, float]] = []      # (단계 index, 이름, 소요 시간)
+
+    def mark(self, phase: str) -> float:
+        """이전 mark 이후를 phase로 기록 -> 소요 시간(초)"""
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self.phases.append((phase, elapsed, now - self.t0))
+        self._last = now
+        return elapsed
+
+    def detail(self, name: str, elapsed: float):
+        """진행 중인 단계의 세부 항목 기록"""
+        self._details.append((len(self.phases), name, elapsed))
+
+    def lazy_import(self, module: str):
+        """모듈 import (처음이면 소요 시간을 세부 항목으로 기록)"""
+        start = time.perf_counter()
+        loaded = importlib.import_module(module)
+        elapsed = time.perf_counter() - start
+        if elapsed >= 0.001:
+            self.detail(f"import {module}", elapsed)
+        return loaded
+
+    def total(self) -> float:
+        return self.phases[-1][2] if self.phases else 0.0
+
+    def report(self) -> str:
+        """단계별 표 (ms)"""
+        lines = [f"[PROFILE] Startup timing (ms since {self.origin})",
+                 f"  {'phase':<44} {'took':>9} {'at':>9}"]
+        for index, (phase, elapsed, at) in enumerate(self.phases):
+            lines.append(f"  {phase:<44} {elapsed * 1000:>9.1f} {at * 1000:>9.1f}")
+            for detail_index, name, detail_elapsed in self._details:
+                if detail_index == index:
+                    lines.append(f"    {name:<42} {detail_elapsed * 1000:>9.1f}")
+        return "\n".join(lines)
+
+
+# 프로세스 전역 profile (클라이언트 모듈이 import 시점부터 사용)
+STARTUP = StartupProfile()
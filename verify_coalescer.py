@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Verify Request Coalescing (batch wire schema + client-side coalescer)
+
+기존 프로토콜은 HTTP 요청 하나에 증명 하나를 보내며 매번 같은 metadata 블록을
+반복합니다. 여기서는 여러 (sensor, ts, nonce, commitment, proof) 항목을 공유
+header 하나 아래에 묶는 batch 스키마와, 측정값을 모아 한 번에 POST하는
+coalescer를 제공합니다.
+
+Batch 스키마 (POST /api/v1/verify/bulletproof/batch):
+    {
+      "mode": "ZK_ONLY", "type": "sensor_value", "range_min": 0, "range_max": 4294967295,
+      "metadata": {...},                      # 공유 header (모든 항목에 적용)
+      "items": [
+        {"sensor": "P1_PIT01", "ts": 1763034728, "nonce": "...", "commitment": "...", "proof": {...}},
+        ...
+      ]
+    }
+    항목에 header 필드가 있으면 그 항목에서는 항목 값이 우선합니다.
+
+응답:
+    {"success": bool (전부 검증 성공), "count": n, "verified": k, "failed": n-k,
+     "results": [{"sensor", "nonce", "success", "verified", "ok", "error_message"?}, ...],
+     "processing_time_ms": float}
+
+Usage:
+    coalescer = VerifyCoalescer("http://127.0.0.1:8085", max_batch=32, max_delay_ms=50,
+                                on_result=handle_result)
+    coalescer.submit(request_dict)   # 단건 요청과 같은 dict
+    coalescer.close()                # 남은 항목 전송
+
+    # AdaptiveController가 batch 크기와 동시 요청 수를 정함 (adaptive_controller.py)
+    coalescer = VerifyCoalescer(url, controller=controller, max_pending=256, on_result=handle_result)
+"""
+
+import json
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import requests
+except ImportError:  # 서버 측(decode_batch만 사용)은 requests 불필요
+    requests = None
+
+from log_pipeline import get_logger, log_event
+
+logger = get_logger("verify_coalescer")
+
+VERIFY_PATH = "/api/v1/verify/bulletproof"
+BATCH_PATH = VERIFY_PATH + "/batch"
+
+# 항목마다 같은 값이면 header로 올리는 필드
+SHARED_FIELDS = ("mode", "type", "range_min", "range_max", "metadata")
+
+# on_result(request, result, error, latency_ms): result는 항목별 응답 dict, 실패 시 error 문자열
+ResultCallback = Callable[[Dict, Optional[Dict], Optional[str], float], None]
+# on_unreachable(request): 연결 실패/5xx로 서버에 전달되지 못한 요청 (예: spool에 보관)
+UnreachableCallback = Callable[[Dict], None]
+
+
+def encode_batch(batch: List[Dict]) -> Dict:
+    """단건 요청 dict 목록 -> 공유 header + items batch 본문"""
+    first = batch[0]
+    header = {k: first[k] for k in SHARED_FIELDS if k in first}
+    items = [{k: v for k, v in req.items() if not (k in header and header[k] == v)} for req in batch]
+    body = dict(header)
+    body["items"] = items
+    return body
+
+
+def decode_batch(body: Dict) -> List[Dict]:
+    """batch 본문 -> 단건 요청 dict 목록 (header를 각 항목에 병합)"""
+    items = body.get("items")
+    if not isinstance(items, list):
+        raise ValueError("'items' must be a list")
+    header = {k: v for k, v in body.items() if k != "items"}
+    decoded = []
+    for item in items:
+        if not isinstance(item, dict):
+            raise ValueError("each item must be an object")
+        merged = dict(header)
+        merged.update(item)
+        decoded.append(merged)
+    return decoded
+
+
+def replay_verify(session, server_url: str, batch: List[Dict], timeout: float = 10.0) -> int:
+    """
+    spool 재전송: batch endpoint로 전송 (404/405면 단건 전송)
+
+    Returns:
+        앞에서부터 서버에 전달된 요청 수 (검증 실패 응답도 전달로 계산)
+    """
+    server_url = server_url.rstrip('/')
+    verified = 0
+    if len(batch) > 1:
+        try:
+            response = session.post(server_url + BATCH_PATH, json=encode_batch(batch), timeout=timeout)
+        except requests.exceptions.RequestException:
+            return 0
+        if response.status_code >= 500:
+            return 0
+        if response.status_code not in (404, 405):
+            if response.status_code == 200:
+                try:
+                    verified = response.json().get("verified", 0)
+                except (json.JSONDecodeError, AttributeError):
+                    pass
+            log_event(logger, logging.INFO, "spool-replay", items=len(batch), verified=verified,
+                      status=response.status_code)
+            return len(batch)
+
+    delivered = 0
+    for request in batch:
+        try:
+            response = session.post(server_url + VERIFY_PATH, json=request, timeout=timeout)
+        except requests.exceptions.RequestException:
+            break
+        if response.status_code >= 500:
+            break
+        delivered += 1
+        if response.status_code == 200:
+            try:
+                result = response.json()
+                verified += bool(result.get("ok") or result.get("verified") or result.get("success"))
+            except (json.JSONDecodeError, AttributeError):
+                pass
+    if delivered:
+        log_event(logger, logging.INFO, "spool-replay", items=delivered, verified=verified)
+    return delivered
+
+
+class VerifyCoalescer:
+    """측정값 요청을 max_batch개 또는 max_delay_ms까지 모아 batch endpoint로 전송"""
+
+    def __init__(self, server_url: str, max_batch: int = 32, max_delay_ms: float = 50.0,
+                 timeout: float = 10.0, on_result: Optional[ResultCallback] = None,
+                 on_unreachable: Optional[UnreachableCallback] = None,
+                 controller=None, max_pending: int = 0):
+        """
+        Args:
+            server_url: 검증 서버 URL
+            max_batch: batch당 최대 항목 수
+            max_delay_ms: 첫 항목이 들어온 뒤 전송까지 최대 대기 시간
+            timeout: HTTP 요청 timeout (초)
+            on_result: 항목별 결과 콜백 (flush 스레드에서 호출)
+            on_unreachable: 연결 실패/5xx 요청 콜백 (on_result보다 먼저 호출)
+            controller: AdaptiveController; 있으면 batch 크기(max_batch 대신)와 동시 요청 수를
+                        controller가 정하고, 요청 결과를 controller에 보고
+            max_pending: 대기 항목 상한; 넘으면 submit()이 False 반환 (0이면 무제한)
+        """
+        if requests is None:
+            raise RuntimeError("'requests' library not found. Install with: pip3 install requests")
+        server_url = server_url.rstrip('/')
+        self.endpoint = server_url + VERIFY_PATH
+        self.batch_endpoint = server_url + BATCH_PATH
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max_delay_ms / 1000.0
+        self.timeout = timeout
+        self.on_result = on_result
+        self.on_unreachable = on_unreachable
+        self.session = requests.Session()
+        self.controller = controller
+        self.max_pending = max_pending
+        self._executor = None
+        self._local = threading.local()
+        if controller is not None:
+            self._executor = ThreadPoolExecutor(max_workers=controller.max_in_flight,
+                                                thread_name_prefix="verify-sender")
+
+        # 서버가 batch endpoint를 모르면(404/405) 단건 전송으로 전환
+        self.batch_supported = True
+        self.batches_sent = 0
+        self.requests_sent = 0
+        self.items_sent = 0
+
+        self._pending: List[Tuple[Dict, float]] = []
+        self._first_at = 0.0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="verify-coalescer", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # 제출 / 종료
+    # ------------------------------------------------------------------
+
+    def submit(self, request: Dict) -> bool:
+        """요청 하나 추가 (블록하지 않음) -> 대기열이 가득 차면 False"""
+        with self._cond:
+            if self.max_pending and len(self._pending) >= self.max_pending:
+                return False
+            if not self._pending:
+                self._first_at = time.monotonic()
+            self._pending.append((request, time.perf_counter()))
+            # 첫 항목: flush 스레드가 deadline 대기 시작 / 가득 참: 즉시 전송
+            if len(self._pending) == 1 or len(self._pending) >= self._batch_limit():
+                self._cond.notify()
+            return True
+
+    def close(self):
+        """남은 항목을 모두 전송하고 flush 스레드 종료"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    # ------------------------------------------------------------------
+    # flush 스레드
+    # ------------------------------------------------------------------
+
+    def _batch_limit(self) -> int:
+        return self.controller.batch_size if self.controller is not None else self.max_batch
+
+    def _take_batch(self) -> Optional[List[Tuple[Dict, float]]]:
+        with self._cond:
+            while True:
+                max_batch = self._batch_limit()
+                if self._pending:
+                    if self._closed or len(self._pending) >= max_batch:
+                        break
+                    remaining = self._first_at + self.max_delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                elif self._closed:
+                    return None
+                else:
+                    self._cond.wait()
+            batch = self._pending[:max_batch]
+            self._pending = self._pending[max_batch:]
+            if self._pending:
+                self._first_at = time.monotonic()
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            if self.controller is None:
+                self._dispatch(batch)
+            else:
+                # 동시 요청 한도에 도달하면 여기서 대기 -> 그동안 submit()된 항목이 batch로 쌓임
+                token = self.controller.acquire()
+                self._executor.submit(self._dispatch_with_slot, batch, token)
+
+    def _dispatch_with_slot(self, batch: List[Tuple[Dict, float]], token: int):
+        try:
+            self._dispatch(batch)
+        finally:
+            self.controller.release(token)
+
+    def _dispatch(self, batch: List[Tuple[Dict, float]]):
+        try:
+            if self.batch_supported and len(batch) > 1:
+                self._send_batch(batch)
+            else:
+                for request, submitted in batch:
+                    self._send_single(request, submitted)
+        except Exception as e:
+            log_event(logger, logging.ERROR, "coalescer-error", error=str(e), exc_info=True)
+
+    def _post(self, url: str, body: Dict):
+        """POST + controller에 지연/성공 여부 보고 (sender 스레드마다 별도 Session)"""
+        if self._executor is None:
+            session = self.session
+        else:
+            session = getattr(self._local, "session", None)
+            if session is None:
+                session = self._local.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            response = session.post(url, json=body, timeout=self.timeout)
+        except requests.exceptions.RequestException:
+            if self.controller is not None:
+                self.controller.observe((time.perf_counter() - start) * 1000, False)
+            raise
+        if self.controller is not None:
+            self.controller.observe((time.perf_counter() - start) * 1000, response.status_code < 500)
+        return response
+
+    def _deliver(self, request: Dict, result: Optional[Dict], error: Optional[str], submitted: float):
+        if self.on_result is not None:
+            self.on_result(request, result, error, (time.perf_counter() - submitted) * 1000)
+
+    def _unreachable(self, request: Dict, error: str, submitted: float):
+        if self.on_unreachable is not None:
+            self.on_unreachable(request)
+        self._deliver(request, None, error, submitted)
+
+    def _send_single(self, request: Dict, submitted: float):
+        try:
+            response = self._post(self.endpoint, request)
+        except requests.exceptions.RequestException as e:
+            self._unreachable(request, str(e)[:180], submitted)
+            return
+        self.requests_sent += 1
+        self.items_sent += 1
+        if response.status_code >= 500:
+            self._unreachable(request, f"HTTP {response.status_code}", submitted)
+            return
+        if response.status_code != 200:
+            self._deliver(request, None, f"HTTP {response.status_code}", submitted)
+            return
+        try:
+            self._deliver(request, response.json(), None, submitted)
+        except json.JSONDecodeError:
+            self._deliver(request, None, f"invalid JSON: {response.text[:120]}", submitted)
+
+    def _send_batch(self, batch: List[Tuple[Dict, float]]):
+        body = encode_batch([request for request, _ in batch])
+        try:
+            response = self._post(self.batch_endpoint, body)
+        except requests.exceptions.RequestException as e:
+            for request, submitted in batch:
+                self._unreachable(request, str(e)[:180], submitted)
+            return
+
+        if response.status_code in (404, 405):
+            self.batch_supported = False
+            log_event(logger, logging.WARNING, "batch-unsupported", endpoint=self.batch_endpoint,
+                      status=response.status_code, fallback="single requests")
+            for request, submitted in batch:
+                self._send_single(request, submitted)
+            return
+
+        self.batches_sent += 1
+        self.requests_sent += 1
+        self.items_sent += len(batch)
+        if response.status_code >= 500:
+            for request, submitted in batch:
+                self._unreachable(request, f"HTTP {response.status_code}", submitted)
+            return
+        if response.status_code != 200:
+            for request, submitted in batch:
+                self._deliver(request, None, f"HTTP {response.status_code}", submitted)
+            return
+
+        try:
+            results = response.json().get("results", [])
+        except (json.JSONDecodeError, AttributeError):
+            results = []
+        for i, (request, submitted) in enumerate(batch):
+            if i < len(results):
+                self._deliver(request, results[i], None, submitted)
+            else:
+                self._deliver(request, None, "missing result in batch response", submitted)
+
+    def get_stats(self) -> Dict:
+        return {
+            "batches": self.batches_sent,
+            "requests": self.requests_sent,
+            "items": self.items_sent,
+            "avg_batch_size": round(self.items_sent / self.requests_sent, 2) if self.requests_sent else 0.0,
+            "batch_supported": self.batch_supported
+        }